@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Synthetic WMO-table corpus generator for benchmarks.
+
+Writes BUFR/GRIB2-like CSV trees in the layout the CLI and literal dictionary
+expect:
+
+    <out>/english/BUFR4/BUFRCREX_TableB_en_00.csv
+    <out>/english/BUFR4/BUFR4_CodeFlag_en_00.csv
+    <out>/english/GRIB2/GRIB2_CodeFlag_en_00.csv
+    <out>/french/BUFR4/BUFRCREX_TableB_fr_00.csv   (reference translations)
+    <out>/spanish/...
+    <out>/glossary_fr.csv, <out>/glossary_es.csv   (GlossaryManager.import_from_csv format)
+
+Text is composed from a small bilingual phrase inventory with Zipf-distributed
+reuse, so - like the real tables - a few labels ("Reserved", "Missing value")
+dominate and most element names recur across files. Reference files only cover
+part of each table's Ids so the pipeline still has new rows to translate.
+
+Usage:
+    python -m benchmarks.generate_corpus --out /tmp/wmo --files 4 --rows 400
+"""
+
+import argparse
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+LANGUAGE_DIRS = {"fr": "french", "es": "spanish"}
+
+# (en, fr, es)
+QUANTITIES = [
+    ("Air temperature", "Température de l'air", "Temperatura del aire"),
+    ("Dew-point temperature", "Température du point de rosée", "Temperatura del punto de rocío"),
+    ("Wind speed", "Vitesse du vent", "Velocidad del viento"),
+    ("Wind direction", "Direction du vent", "Dirección del viento"),
+    ("Pressure", "Pression", "Presión"),
+    ("Pressure reduced to mean sea level", "Pression réduite au niveau moyen de la mer", "Presión reducida al nivel medio del mar"),
+    ("Geopotential height", "Hauteur géopotentielle", "Altura geopotencial"),
+    ("Relative humidity", "Humidité relative", "Humedad relativa"),
+    ("Total precipitation", "Précipitations totales", "Precipitación total"),
+    ("Horizontal visibility", "Visibilité horizontale", "Visibilidad horizontal"),
+    ("Cloud cover", "Nébulosité", "Nubosidad"),
+    ("Height of base of cloud", "Hauteur de la base des nuages", "Altura de la base de las nubes"),
+    ("Sea surface temperature", "Température de la surface de la mer", "Temperatura de la superficie del mar"),
+    ("Total snow depth", "Épaisseur totale de la neige", "Espesor total de la nieve"),
+    ("Global solar radiation", "Rayonnement solaire global", "Radiación solar global"),
+    ("Soil temperature", "Température du sol", "Temperatura del suelo"),
+    ("Wave height", "Hauteur des vagues", "Altura de las olas"),
+    ("Ozone total column", "Colonne totale d'ozone", "Columna total de ozono"),
+    ("Brightness temperature", "Température de luminance", "Temperatura de brillo"),
+    ("Specific humidity", "Humidité spécifique", "Humedad específica"),
+]
+
+QUALIFIERS = [
+    ("", "", ""),
+    ("at 2 m", "à 2 m", "a 2 m"),
+    ("at 10 m", "à 10 m", "a 10 m"),
+    ("(maximum)", "(maximum)", "(máximo)"),
+    ("(minimum)", "(minimum)", "(mínimo)"),
+    ("(mean)", "(moyenne)", "(media)"),
+    ("over past 24 hours", "au cours des 24 dernières heures", "durante las últimas 24 horas"),
+    ("over past hour", "au cours de la dernière heure", "durante la última hora"),
+    ("(high accuracy)", "(haute précision)", "(alta precisión)"),
+]
+
+CODE_ENTRIES = [
+    ("Reserved", "Réservé", "Reservado"),
+    ("Missing value", "Valeur manquante", "Valor faltante"),
+    ("Not used", "Non utilisé", "No se utiliza"),
+    ("Reserved for local use", "Réservé à l'usage local", "Reservado para uso local"),
+    ("Automatic station", "Station automatique", "Estación automática"),
+    ("Manned station", "Station dotée de personnel", "Estación dotada de personal"),
+    ("Land station", "Station terrestre", "Estación terrestre"),
+    ("Sea station", "Station en mer", "Estación marítima"),
+    ("Aircraft", "Aéronef", "Aeronave"),
+    ("Satellite", "Satellite", "Satélite"),
+    ("Radiosonde", "Radiosonde", "Radiosonda"),
+    ("Drifting buoy", "Bouée dérivante", "Boya a la deriva"),
+    ("No cloud", "Pas de nuages", "Sin nubes"),
+    ("Sky obscured by fog", "Ciel obscurci par le brouillard", "Cielo oscurecido por niebla"),
+    ("Quality control passed", "Contrôle de qualité réussi", "Control de calidad superado"),
+    ("Suspect value", "Valeur douteuse", "Valor dudoso"),
+]
+
+NOTES = [
+    ("See Note 1", "Voir la note 1", "Véase la nota 1"),
+    ("For use in satellite data", "À utiliser pour les données satellitaires", "Para uso con datos satelitales"),
+    ("Value in the range 0 to 100", "Valeur comprise entre 0 et 100", "Valor en el rango de 0 a 100"),
+    ("Deprecated; use the high accuracy element instead", "Obsolète ; utiliser plutôt l'élément de haute précision", "Obsoleto; utilizar en su lugar el elemento de alta precisión"),
+]
+
+UNITS = [
+    ("K", "K", "K"),
+    ("m s-1", "m s-1", "m s-1"),
+    ("Pa", "Pa", "Pa"),
+    ("%", "%", "%"),
+    ("m", "m", "m"),
+    ("kg m-2", "kg m-2", "kg m-2"),
+    ("degree true", "degré vrai", "grado verdadero"),
+    ("Code table", "Table de code", "Tabla de cifrado"),
+    ("Flag table", "Table de drapeaux", "Tabla de banderas"),
+    ("Numeric", "Numérique", "Numérico"),
+]
+
+CLASSES = [
+    ("Location (horizontal)", "Localisation (horizontale)", "Localización (horizontal)"),
+    ("Temperature", "Température", "Temperatura"),
+    ("Wind and turbulence", "Vent et turbulence", "Viento y turbulencia"),
+    ("Hydrographic and hydrological elements", "Éléments hydrographiques et hydrologiques", "Elementos hidrográficos e hidrológicos"),
+    ("Physical/chemical constituents", "Constituants physiques/chimiques", "Constituyentes físicos/químicos"),
+]
+
+GRIB2_TITLES = [
+    ("Code table 4.2 - Parameter number by product discipline and parameter category",
+     "Table de code 4.2 - Numéro de paramètre par discipline de produit et catégorie de paramètre",
+     "Tabla de cifrado 4.2 - Número de parámetro por disciplina de producto y categoría de parámetro"),
+    ("Code table 4.5 - Fixed surface types and units",
+     "Table de code 4.5 - Types de surfaces fixes et unités",
+     "Tabla de cifrado 4.5 - Tipos de superficies fijas y unidades"),
+]
+
+LANG_INDEX = {"en": 0, "fr": 1, "es": 2}
+
+
+class PhraseSampler:
+    """Draws phrases with Zipf-like reuse so a few labels dominate"""
+
+    def __init__(self, rng: random.Random, exponent: float = 1.1):
+        self.rng = rng
+        self.exponent = exponent
+
+    def pick(self, inventory: List[Tuple[str, str, str]]) -> Tuple[str, str, str]:
+        weights = [1.0 / (rank + 1) ** self.exponent for rank in range(len(inventory))]
+        return self.rng.choices(inventory, weights=weights, k=1)[0]
+
+    def element_name(self) -> Tuple[str, str, str]:
+        quantity = self.pick(QUANTITIES)
+        qualifier = self.pick(QUALIFIERS)
+        if not qualifier[0]:
+            return quantity
+        return tuple(f"{q} {s}" for q, s in zip(quantity, qualifier))
+
+
+def _row_text(phrase: Tuple[str, str, str], language: str) -> str:
+    return phrase[LANG_INDEX[language]]
+
+
+def _table_b_rows(sampler: PhraseSampler, file_index: int, rows: int) -> List[Dict[str, Tuple]]:
+    """BUFR/CREX Table B: element descriptors with units, scales and widths"""
+    result = []
+    for i in range(rows):
+        cls = sampler.pick(CLASSES)
+        unit = sampler.pick(UNITS)
+        note = sampler.pick(NOTES) if sampler.rng.random() < 0.2 else ("", "", "")
+        result.append({
+            "Id": f"B{file_index:02d}{i:05d}",
+            "ClassNo": f"{CLASSES.index(cls):02d}",
+            "ClassName": cls,
+            "FXY": f"0{CLASSES.index(cls):02d}{i % 1000:03d}",
+            "ElementName": sampler.element_name(),
+            "Note": note,
+            "BUFR_Unit": unit,
+            "BUFR_Scale": str(sampler.rng.choice([-1, 0, 1, 2])),
+            "BUFR_ReferenceValue": str(sampler.rng.choice([0, -1024, -8192])),
+            "BUFR_DataWidth_Bits": str(sampler.rng.choice([7, 10, 12, 14, 16])),
+            "CREX_Unit": unit,
+            "CREX_Scale": str(sampler.rng.choice([0, 1, 2])),
+            "CREX_DataWidth_Char": str(sampler.rng.choice([3, 4, 5])),
+            "Status": "Operational",
+        })
+    return result
+
+
+def _code_flag_rows(sampler: PhraseSampler, file_index: int, rows: int) -> List[Dict[str, Tuple]]:
+    """BUFR code/flag table: one element with many code figures, most of them boilerplate"""
+    result = []
+    element = sampler.element_name()
+    for i in range(rows):
+        if i and i % 32 == 0:
+            element = sampler.element_name()
+        entry = sampler.pick(CODE_ENTRIES)
+        figure = f"{i % 32}" if entry[0] not in ("Reserved", "Not used") else f"{i % 32}-{i % 32 + 5}"
+        result.append({
+            "Id": f"C{file_index:02d}{i:05d}",
+            "FXY": f"020{file_index:03d}",
+            "ElementName": element,
+            "CodeFigure": figure,
+            "EntryName": entry,
+            "Note": sampler.pick(NOTES) if sampler.rng.random() < 0.1 else ("", "", ""),
+            "Status": "Operational",
+        })
+    return result
+
+
+def _grib2_rows(sampler: PhraseSampler, file_index: int, rows: int) -> List[Dict[str, Tuple]]:
+    """GRIB2 code table: titles repeated on every row plus parameter meanings and units"""
+    result = []
+    title = sampler.pick(GRIB2_TITLES)
+    for i in range(rows):
+        meaning = sampler.element_name() if sampler.rng.random() < 0.6 else sampler.pick(CODE_ENTRIES)
+        unit = sampler.pick(UNITS)
+        result.append({
+            "Id": f"G{file_index:02d}{i:05d}",
+            "Title": title,
+            "CodeFlag": str(i),
+            "MeaningParameterDescription": meaning,
+            "UnitComments": unit,
+            "Status": "Operational",
+        })
+    return result
+
+
+TABLES = {
+    # name: (subdirectory, file stem, row builder, translated text columns)
+    "table_b": ("BUFR4", "BUFRCREX_TableB", _table_b_rows, ["ClassName", "ElementName", "Note"]),
+    "code_flag": ("BUFR4", "BUFR4_CodeFlag", _code_flag_rows, ["ElementName", "EntryName", "Note"]),
+    "grib2": ("GRIB2", "GRIB2_CodeFlag", _grib2_rows, ["Title", "MeaningParameterDescription", "UnitComments"]),
+}
+
+
+def _render(row: Dict[str, Tuple], text_columns: List[str], language: str) -> Dict[str, str]:
+    """Turn a generated row into CSV cells for one language"""
+    rendered = {}
+    for column, value in row.items():
+        if column in text_columns:
+            rendered[f"{column}_{language}"] = _row_text(value, language)
+        elif isinstance(value, tuple):
+            # Unit columns keep their name but are localized in reference files
+            rendered[column] = _row_text(value, language)
+        else:
+            rendered[column] = value
+    return rendered
+
+
+def _write(path: Path, rows: List[Dict[str, str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _write_glossary(out: Path, language: str) -> int:
+    """Glossary of quantities, units and class names for one target language"""
+    entries = {}
+    for inventory in (QUANTITIES, UNITS, CLASSES):
+        for phrase in inventory:
+            if phrase[0] != _row_text(phrase, language):
+                entries[phrase[0]] = _row_text(phrase, language)
+    with open(out / f"glossary_{language}.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["term", "preferred_translation", "notes", "domain"])
+        writer.writeheader()
+        for term, translation in entries.items():
+            writer.writerow({"term": term, "preferred_translation": translation, "notes": "", "domain": "meteorology"})
+    return len(entries)
+
+
+def generate_corpus(
+    out: Path,
+    files: int = 4,
+    rows: int = 400,
+    languages: List[str] = None,
+    reference_coverage: float = 0.7,
+    seed: int = 7
+) -> dict:
+    """
+    Generate a synthetic WMO-table corpus.
+
+    Args:
+        out: Root directory (english/ and one directory per target language are created below it)
+        files: Files per table type
+        rows: Rows per file
+        languages: Target languages with reference translations (default: fr, es)
+        reference_coverage: Fraction of each file's Ids present in the reference translations
+        seed: Random seed, the same arguments always produce the same corpus
+
+    Returns:
+        Corpus summary (also written to <out>/corpus.json)
+    """
+    languages = languages or list(LANGUAGE_DIRS)
+    rng = random.Random(seed)
+    sampler = PhraseSampler(rng)
+    summary = {"files": 0, "rows": 0, "cells": 0, "unique_cells": 0, "reference_rows": 0, "glossary_terms": {}}
+    seen_cells = set()
+
+    for table, (subdir, stem, build, text_columns) in TABLES.items():
+        for file_index in range(files):
+            generated = build(sampler, file_index, rows)
+            _write(out / "english" / subdir / f"{stem}_en_{file_index:02d}.csv",
+                   [_render(row, text_columns, "en") for row in generated])
+            summary["files"] += 1
+            summary["rows"] += len(generated)
+            for row in generated:
+                for column in text_columns:
+                    text = row[column][0]
+                    if text:
+                        summary["cells"] += 1
+                        seen_cells.add(text)
+
+            covered = [row for row in generated if rng.random() < reference_coverage]
+            for language in languages:
+                if not covered:
+                    continue
+                lang_dir = LANGUAGE_DIRS.get(language, language)
+                _write(out / lang_dir / subdir / f"{stem}_{language}_{file_index:02d}.csv",
+                       [_render(row, text_columns, language) for row in covered])
+                summary["reference_rows"] += len(covered)
+
+    for language in languages:
+        summary["glossary_terms"][language] = _write_glossary(out, language)
+
+    summary["unique_cells"] = len(seen_cells)
+    summary["repetition"] = 1 - summary["unique_cells"] / max(summary["cells"], 1)
+    summary["config"] = {
+        "files": files, "rows": rows, "languages": languages,
+        "reference_coverage": reference_coverage, "seed": seed
+    }
+    with open(out / "corpus.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic WMO-table CSV corpus")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    parser.add_argument("--files", type=int, default=4, help="Files per table type (default: 4)")
+    parser.add_argument("--rows", type=int, default=400, help="Rows per file (default: 400)")
+    parser.add_argument("--languages", default="fr,es", help="Reference languages (default: fr,es)")
+    parser.add_argument("--reference-coverage", type=float, default=0.7,
+                        help="Fraction of Ids with reference translations (default: 0.7)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    summary = generate_corpus(
+        args.out, args.files, args.rows,
+        [lang.strip() for lang in args.languages.split(",")],
+        args.reference_coverage, args.seed
+    )
+    print(f"📦 {summary['files']} files, {summary['rows']} rows, {summary['cells']} text cells "
+          f"({summary['repetition']:.0%} repeated) written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
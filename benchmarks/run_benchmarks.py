@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite.
+
+Runs the translation stack against a synthetic WMO-table corpus and the fake
+LLM provider, then writes one JSON result file per run so commits can be
+compared:
+
+    python -m benchmarks.run_benchmarks                       # generate corpus, run all stages
+    python -m benchmarks.run_benchmarks --stages literal,glossary --rows 2000
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<old>.json
+
+Stages:
+    literal   LiteralDictionarySearch build + global lookups
+    glossary  GlossaryManager import, recognizer build + term recognition
+    rag       TranslationMemoryManager seeding, RAGSearch index build + similarity search
+    cli       TranslationCLI.translate_file over every English file (CSV pipeline)
+    api       POST /translate through the FastAPI app (in-process ASGI transport)
+
+A stage whose optional dependencies are missing (e.g. faiss or
+sentence-transformers) is recorded as skipped instead of failing the run.
+Paths (database, vector index, extraction cache) point into a scratch
+directory so runs never touch the working databases.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.generate_corpus import LANGUAGE_DIRS, generate_corpus  # noqa: E402
+
+ALL_STAGES = ["literal", "glossary", "rag", "cli", "api"]
+
+# Metric -> True when higher is better; used by --compare
+COMPARED_METRICS = {
+    "cells_per_s": True,
+    "lookups_per_s": True,
+    "requests_per_s": True,
+    "build_s": False,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "llm_calls_per_file": False,
+    "llm_tokens_per_file": False,
+    "peak_rss_mb": False,
+}
+
+# Latency differences below this are timer noise, never regressions
+LATENCY_NOISE_MS = 0.05
+
+
+def _configure_environment(workdir: Path, provider: str) -> None:
+    """Point settings at scratch paths; must run before anything under src is imported"""
+    os.environ.setdefault("LLM_PROVIDER", provider)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'translation.db'}"
+    os.environ["VECTOR_DB_PATH"] = str(workdir / "vector_index.faiss")
+    os.environ["TERM_EXTRACTION_CACHE_PATH"] = str(workdir / "term_extraction_cache.db")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max of latencies in seconds, reported in milliseconds"""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+
+def git_revision() -> Dict[str, Any]:
+    """Current commit and whether the tree has uncommitted changes"""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {"commit": sha, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def source_cells(corpus: Path) -> List[str]:
+    """Every non-empty translatable English cell, in file order (repeats included)"""
+    import csv
+
+    cells = []
+    for path in sorted((corpus / "english").rglob("*_en*.csv")):
+        with open(path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                cells.extend(value for column, value in row.items() if column.endswith("_en") and value)
+    return cells
+
+
+def llm_counters(client) -> Dict[str, int]:
+    """Call and token counters from the dispatcher and (for fake providers) the client"""
+    from src.llm.resilience import get_dispatcher
+
+    counters = {"calls": get_dispatcher().stats["calls"], "tokens": 0}
+    stats = client.get_stats() if client is not None and hasattr(client, "get_stats") else {}
+    if "prompt_tokens" in stats:
+        counters["tokens"] = stats["prompt_tokens"] + stats["completion_tokens"]
+    return counters
+
+
+async def _timed_loop(items: List[Any], fn: Callable[[Any], Awaitable[Any]], concurrency: int) -> List[float]:
+    """Run fn over items with bounded concurrency, returning per-item latencies"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(item):
+        async with semaphore:
+            started = time.perf_counter()
+            await fn(item)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(item) for item in items))
+    return latencies
+
+
+def bench_literal(corpus: Path, languages: List[str], args) -> Dict[str, Any]:
+    from src.memory.literal_search import LiteralDictionarySearch
+
+    cells = source_cells(corpus)
+    source_dirs = sorted({p.parent for p in (corpus / "english").rglob("*_en*.csv")})
+    result = {"languages": {}}
+    for language in languages:
+        search = LiteralDictionarySearch()
+        started = time.perf_counter()
+        for source_dir in source_dirs:
+            # build_from_csv_files starts a fresh dictionary, so merge per directory
+            merged = dict(search.global_dictionary)
+            search.build_from_csv_files(source_dir=source_dir, target_language=language, source_language="en")
+            search.global_dictionary.update({k: v for k, v in merged.items() if k not in search.global_dictionary})
+        build_s = time.perf_counter() - started
+
+        latencies, hits = [], 0
+        started = time.perf_counter()
+        for cell in cells:
+            t0 = time.perf_counter()
+            found = search.search_global_literal(cell, target_language=language, source_language="en")
+            latencies.append(time.perf_counter() - t0)
+            hits += bool(found.matches)
+        elapsed = time.perf_counter() - started
+        result["languages"][language] = {
+            "entries": len(search.global_dictionary),
+            "build_s": round(build_s, 4),
+            "lookups": len(cells),
+            "hit_rate": round(hits / max(len(cells), 1), 4),
+            "lookups_per_s": round(len(cells) / elapsed, 1) if elapsed else None,
+            "latency_ms": percentiles(latencies),
+        }
+    return result
+
+
+def bench_glossary(corpus: Path, languages: List[str], args) -> Dict[str, Any]:
+    from src.glossary.manager import GlossaryManager
+
+    cells = source_cells(corpus)
+    manager = GlossaryManager(db_path=str(args.workdir / "glossary_bench.db"))
+    result = {"languages": {}}
+    for language in languages:
+        glossary_csv = corpus / f"glossary_{language}.csv"
+        started = time.perf_counter()
+        imported = manager.import_from_csv(str(glossary_csv), target_language=language) if glossary_csv.exists() else 0
+        import_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        manager.get_recognizer(language)
+        build_s = time.perf_counter() - started
+
+        latencies, matches = [], 0
+        started = time.perf_counter()
+        for cell in cells:
+            t0 = time.perf_counter()
+            matches += len(manager.recognize_terms(cell, target_language=language).matches)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        result["languages"][language] = {
+            "terms_imported": imported,
+            "import_s": round(import_s, 4),
+            "build_s": round(build_s, 4),
+            "cells": len(cells),
+            "matches_per_cell": round(matches / max(len(cells), 1), 3),
+            "cells_per_s": round(len(cells) / elapsed, 1) if elapsed else None,
+            "latency_ms": percentiles(latencies),
+        }
+    return result
+
+
+def bench_rag(corpus: Path, languages: List[str], args) -> Dict[str, Any]:
+    import csv
+    from src.memory.tm_manager import TranslationMemoryManager
+    from src.memory.models import TranslationMemoryEntry
+    from src.memory.rag_search import RAGSearch
+
+    tm = TranslationMemoryManager()
+    seeded = 0
+    for language in languages:
+        lang_dir = corpus / LANGUAGE_DIRS.get(language, language)
+        for target_path in sorted(lang_dir.rglob(f"*_{language}*.csv")):
+            source_path = corpus / "english" / target_path.relative_to(lang_dir).parent / target_path.name.replace(f"_{language}", "_en")
+            with open(source_path, encoding="utf-8") as f:
+                sources = {row["Id"]: row for row in csv.DictReader(f)}
+            with open(target_path, encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    source_row = sources.get(row["Id"], {})
+                    for column, text in source_row.items():
+                        target = row.get(f"{column[:-3]}_{language}") if column.endswith("_en") else None
+                        if text and target:
+                            tm.add_entry(TranslationMemoryEntry(
+                                source_text=text, target_text=target, target_language=language, domain="benchmark"
+                            ))
+                            seeded += 1
+
+    started = time.perf_counter()
+    rag = RAGSearch(tm_manager=tm)
+    build_s = time.perf_counter() - started
+
+    # Semantic search is far slower than the other lookups, so sample distinct cells
+    queries = sorted(set(source_cells(corpus)))[:args.rag_queries]
+    result = {"tm_entries_seeded": seeded, "build_s": round(build_s, 4), "languages": {}}
+    for language in languages:
+        latencies, hits = [], 0
+        started = time.perf_counter()
+        for query in queries:
+            t0 = time.perf_counter()
+            hits += bool(rag.search_similar(query, target_language=language).matches)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        result["languages"][language] = {
+            "queries": len(queries),
+            "hit_rate": round(hits / max(len(queries), 1), 4),
+            "lookups_per_s": round(len(queries) / elapsed, 1) if elapsed else None,
+            "latency_ms": percentiles(latencies),
+        }
+    return result
+
+
+async def bench_cli(corpus: Path, languages: List[str], args) -> Dict[str, Any]:
+    from src.cli.translator import TranslationCLI
+
+    cli = TranslationCLI()
+    cli.setup_translator(llm_backend=args.llm_backend, memory_mode=args.memory_mode)
+    orchestrator = cli.translator
+
+    # Time every cell translation the pipeline makes
+    latencies: List[float] = []
+    translate = orchestrator.translate
+
+    async def timed_translate(request):
+        started = time.perf_counter()
+        try:
+            return await translate(request)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    orchestrator.translate = timed_translate
+
+    files = []
+    started = time.perf_counter()
+    for source_path in sorted((corpus / "english").rglob("*_en*.csv")):
+        before = llm_counters(orchestrator.llm_client)
+        cells_before = len(latencies)
+        file_started = time.perf_counter()
+        await cli.translate_file(
+            source_path=source_path,
+            target_languages=languages,
+            output_dir=args.workdir / "output",
+            batch_size=args.batch_size,
+            force=True,
+            memory_mode=args.memory_mode,
+            fanout=args.fanout
+        )
+        after = llm_counters(orchestrator.llm_client)
+        files.append({
+            "file": str(source_path.relative_to(corpus)),
+            "elapsed_s": round(time.perf_counter() - file_started, 4),
+            "cells_translated": len(latencies) - cells_before,
+            "llm_calls": after["calls"] - before["calls"],
+            "llm_tokens": after["tokens"] - before["tokens"],
+        })
+    # Throughput includes the background TM writes; per-cell latency does not
+    await orchestrator.flush_writes()
+    elapsed = time.perf_counter() - started
+
+    total_cells = len(source_cells(corpus)) * len(languages)
+    return {
+        "memory_mode": args.memory_mode,
+        "files": files,
+        "cells": total_cells,
+        "elapsed_s": round(elapsed, 4),
+        "cells_per_s": round(total_cells / elapsed, 1) if elapsed else None,
+        "latency_ms": percentiles(latencies),
+        "llm_calls_per_file": round(sum(f["llm_calls"] for f in files) / max(len(files), 1), 2),
+        "llm_tokens_per_file": round(sum(f["llm_tokens"] for f in files) / max(len(files), 1), 1),
+    }
+
+
+async def bench_api(corpus: Path, languages: List[str], args) -> Dict[str, Any]:
+    import httpx
+    from src.api.main import app, translator
+
+    cells = source_cells(corpus)[:args.api_requests]
+    requests = [
+        {"text": cell, "source_language": "en", "target_language": language, "memory_search_mode": args.memory_mode}
+        for language in languages for cell in cells
+    ]
+    before = llm_counters(translator.llm_client)
+    errors = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def post(payload):
+            nonlocal errors
+            response = await client.post("/translate", json=payload)
+            errors += response.status_code != 200
+
+        started = time.perf_counter()
+        latencies = await _timed_loop(requests, post, args.api_concurrency)
+        elapsed = time.perf_counter() - started
+
+    after = llm_counters(translator.llm_client)
+    return {
+        "requests": len(requests),
+        "concurrency": args.api_concurrency,
+        "errors": errors,
+        "requests_per_s": round(len(requests) / elapsed, 1) if elapsed else None,
+        "latency_ms": percentiles(latencies),
+        "llm_calls": after["calls"] - before["calls"],
+        "llm_tokens": after["tokens"] - before["tokens"],
+    }
+
+
+STAGES = {
+    "literal": bench_literal,
+    "glossary": bench_glossary,
+    "rag": bench_rag,
+    "cli": bench_cli,
+    "api": bench_api,
+}
+
+
+async def run_stages(corpus: Path, languages: List[str], stages: List[str], args) -> Dict[str, Any]:
+    """Run each stage, recording skipped stages and failures instead of aborting"""
+    results = {}
+    for name in stages:
+        print(f"⏱️  Running {name} benchmark...")
+        started = time.perf_counter()
+        try:
+            outcome = STAGES[name](corpus, languages, args)
+            if asyncio.iscoroutine(outcome):
+                outcome = await outcome
+            outcome["status"] = "ok"
+        except ImportError as e:
+            outcome = {"status": "skipped", "reason": f"missing dependency: {e.name or e}"}
+        except Exception as e:
+            outcome = {"status": "failed", "reason": f"{type(e).__name__}: {e}"}
+        outcome["wall_s"] = round(time.perf_counter() - started, 4)
+        outcome["peak_rss_mb"] = round(peak_rss_mb(), 1)
+        results[name] = outcome
+        print(f"   {name}: {outcome['status']} in {outcome['wall_s']:.2f}s"
+              + (f" ({outcome['reason']})" if outcome["status"] != "ok" else ""))
+
+    try:
+        from src.llm.registry import get_registry
+        await get_registry().aclose()
+    except ImportError:
+        pass
+    return results
+
+
+def flatten_metrics(stage_result: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Comparable metrics of one stage as {"languages.fr.latency_ms.p95": value}"""
+    flat = {}
+    for key, value in stage_result.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if any(path == m or path.endswith(f".{m}") for m in COMPARED_METRICS):
+                flat[path] = value
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print metric deltas between two result files and return the regressions"""
+    regressions = []
+    print(f"\n📊 {baseline.get('commit')} → {current.get('commit')} (regression threshold {threshold:.0%})")
+    for stage, result in current["stages"].items():
+        old_result = baseline.get("stages", {}).get(stage)
+        if not old_result or result.get("status") != "ok" or old_result.get("status") != "ok":
+            continue
+        old_metrics = flatten_metrics(old_result)
+        for metric, value in flatten_metrics(result).items():
+            old = old_metrics.get(metric)
+            if not old:
+                continue
+            change = (value - old) / old
+            higher_is_better = next(better for m, better in COMPARED_METRICS.items()
+                                    if metric == m or metric.endswith(f".{m}"))
+            worse = change < -threshold if higher_is_better else change > threshold
+            if ".latency_ms." in f".{metric}" and abs(value - old) < LATENCY_NOISE_MS:
+                worse = False
+            marker = "❌" if worse else "  "
+            print(f"{marker} {stage}.{metric}: {old} → {value} ({change:+.1%})")
+            if worse:
+                regressions.append(f"{stage}.{metric}")
+    return regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="End-to-end translation benchmarks against a synthetic WMO corpus")
+    parser.add_argument("--corpus", type=Path, help="Existing corpus directory (default: generate one in the scratch dir)")
+    parser.add_argument("--files", type=int, default=2, help="Generated files per table type (default: 2)")
+    parser.add_argument("--rows", type=int, default=200, help="Generated rows per file (default: 200)")
+    parser.add_argument("--seed", type=int, default=7, help="Corpus seed (default: 7)")
+    parser.add_argument("--languages", default="fr,es", help="Target languages (default: fr,es)")
+    parser.add_argument("--stages", default=",".join(ALL_STAGES), help=f"Stages to run (default: {','.join(ALL_STAGES)})")
+    parser.add_argument("--provider", default="fake", help="LLM_PROVIDER when not already set (default: fake)")
+    parser.add_argument("--llm-backend", default="azure", choices=["azure", "mcp"])
+    parser.add_argument("--memory-mode", default="cascade", choices=["rag", "literal", "cascade"])
+    parser.add_argument("--batch-size", type=int, default=None, help="CLI rows in flight (default: adaptive)")
+    parser.add_argument("--fanout", action="store_true", help="CLI fan-out mode")
+    parser.add_argument("--api-requests", type=int, default=200, help="Cells sent to /translate per language (default: 200)")
+    parser.add_argument("--api-concurrency", type=int, default=16, help="Concurrent API requests (default: 16)")
+    parser.add_argument("--rag-queries", type=int, default=200, help="Distinct cells searched by the rag stage (default: 200)")
+    parser.add_argument("--workdir", type=Path, help="Scratch directory (default: temporary, removed afterwards)")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Baseline result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression (default: 0.10)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    languages = [lang.strip() for lang in args.languages.split(",")]
+    stages = [stage.strip() for stage in args.stages.split(",")]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        sys.exit(f"❌ Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    keep_workdir = args.workdir is not None
+    args.workdir = (args.workdir or Path(tempfile.mkdtemp(prefix="translation-bench-"))).resolve()
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    _configure_environment(args.workdir, args.provider)
+
+    if args.corpus:
+        corpus = args.corpus.resolve()
+        corpus_summary = json.loads((corpus / "corpus.json").read_text()) if (corpus / "corpus.json").exists() else {}
+    else:
+        corpus = args.workdir / "corpus"
+        corpus_summary = generate_corpus(corpus, args.files, args.rows, languages, seed=args.seed)
+    print(f"📦 Corpus: {corpus} ({corpus_summary.get('cells', '?')} text cells)")
+
+    output = args.output.resolve() if args.output else None
+    baseline_path = args.compare.resolve() if args.compare else None
+
+    # Modules write logs/ and debug dumps relative to the working directory
+    cwd = os.getcwd()
+    os.chdir(args.workdir)
+    try:
+        stage_results = asyncio.run(run_stages(corpus, languages, stages, args))
+    finally:
+        os.chdir(cwd)
+        if not keep_workdir:
+            shutil.rmtree(args.workdir, ignore_errors=True)
+
+    revision = git_revision()
+    result = {
+        **revision,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "provider": os.environ["LLM_PROVIDER"],
+            "llm_backend": args.llm_backend,
+            "memory_mode": args.memory_mode,
+            "languages": languages,
+            "batch_size": args.batch_size,
+            "fanout": args.fanout,
+            "api_concurrency": args.api_concurrency,
+        },
+        "corpus": corpus_summary,
+        "stages": stage_results,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = REPO_ROOT / "benchmarks" / "results" / f"{stamp}_{revision['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"💾 Results written to {output}")
+
+    if baseline_path:
+        regressions = compare(json.loads(baseline_path.read_text()), result, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,12 +22,14 @@ from datetime import datetime
 import argparse
 
 # Import existing components
-from src.llm.client import LLMFactory
+from src.llm.registry import get_registry
 from src.glossary.manager import GlossaryManager
 from src.memory.tm_manager import TranslationMemoryManager
 from src.glossary.models import GlossaryEntry
 from src.memory.models import TranslationMemoryEntry
 from src.core.config import settings
+from src.glossary.extraction_cache import get_extraction_cache, describe_model
+from src.llm.client import EXTRACTION_PROMPT_VERSION
 
 # Configure logging
 logging.basicConfig(
@@ -55,13 +57,16 @@ class GlossaryMemoryBuilder:
         
         # Initialize LLM client - required for glossary term extraction
         try:
-            self.llm_client = LLMFactory.create_client()
+            self.llm_client = get_registry().get_client()
             logger.info("✅ LLM client initialized successfully")
         except Exception as e:
             logger.error(f"❌ LLM client initialization failed: {e}")
             logger.error("❌ LLM is required for glossary term extraction. Exiting.")
             raise RuntimeError("LLM client initialization failed. Cannot continue without LLM for glossary extraction.")
             
+        # Shared on-disk cache of term-extraction results
+        self.extraction_cache = get_extraction_cache()
+            
         # Track processed items to avoid duplicates
         self.processed_glossary_terms = set()
         self.processed_translations = set()
@@ -110,93 +115,63 @@ class GlossaryMemoryBuilder:
         
         return tm_manager
 
-    async def extract_glossary_terms(self, text: str, translation: str, 
-                                    target_language: str) -> List[Tuple[str, str]]:
+    async def extract_glossary_terms_batch(self, pairs: List[Tuple[str, str]],
+                                          target_language: str) -> List[List[Tuple[str, str]]]:
         """
-        Extract glossary terms from a text using LLM
+        Extract glossary terms for many sentence pairs using packed LLM requests
         
         Args:
-            text: Source text (English)
-            translation: Translated text
+            pairs: List of (source_text, translation) tuples
             target_language: Target language code (e.g. 'fr', 'es')
             
         Returns:
-            List of tuples containing (term, translation)
+            One list of (term, translation) tuples per input pair, in the same order
         """
-        # LLM client should always be available due to our strict check in __init__
-        # But we'll still check text/translation validity
-        if not text or not translation:
-            return []
-            
+        items = [
+            (str(i), text, translation)
+            for i, (text, translation) in enumerate(pairs)
+            if text and translation
+        ]
+        if not items:
+            return [[] for _ in pairs]
+        
         try:
-            # Create a prompt for the LLM to extract glossary terms with stricter guidelines
-            extraction_prompt = f"""
-            Extract ONLY proper domain-specific technical terminology from these texts as JSON [{{'term': 'example', 'translation': 'exemple'}}].
-            
-            English: '{text}'  
-            {target_language.upper()}: '{translation}'
-            
-            GUIDELINES FOR TERM EXTRACTION:
-            1. Extract ONLY domain-specific technical nouns or noun phrases
-            2. DO NOT include verbs, action phrases, or full instructions like "Add field" or "Change value"
-            3. Focus on terminology that would appear in a technical glossary
-            4. Return 1-3 most important technical terms, or empty array if none exist
-            5. Each term should be a standalone technical concept
-            
-            Example good terms: "database", "flag table", "data element", "neural network"
-            Example bad terms: "add field", "change value", "click button", "select option"
-            
-            Provide ONLY the JSON array with no other text.
-            """
-            
-            # Use LLM to extract terms via the translate method, which all clients implement
-            # We're not actually translating but using the LLM to process text
-            json_response = await self.llm_client.translate(
-                text=extraction_prompt,
-                target_language="en",  # Using English as target since we want JSON output
-                source_language="en"
+            # Parsed results are memoized on disk (shared with the runtime extractor),
+            # so re-running the builder only sends pairs it has not seen before
+            terms_by_id = await self.extraction_cache.get_or_extract_batch(
+                items,
+                target_language,
+                extract_batch=lambda missing: self.llm_client.extract_terms_batch(missing, target_language),
+                prompt_version=EXTRACTION_PROMPT_VERSION,
+                model=describe_model(self.llm_client)
             )
+        except Exception as e:
+            logger.error(f"Failed to extract glossary terms: {e}")
+            return [[] for _ in pairs]
+        
+        return [self._filter_terms(terms_by_id.get(str(i), [])) for i in range(len(pairs))]
+    
+    @staticmethod
+    def _filter_terms(terms_data: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Keep only proper terminology with a translation"""
+        filtered_terms = []
+        for item in terms_data:
+            if not item.get("translation"):
+                continue
+            term = item["term"].lower().strip()
             
-            # Parse JSON response
-            try:
-                # Clean up the response to ensure it's valid JSON
-                json_text = json_response.strip()
-                if json_text.startswith('```json'):
-                    json_text = json_text[7:]
-                if json_text.startswith('```'):
-                    json_text = json_text[3:]
-                if json_text.endswith('```'):
-                    json_text = json_text[:-3]
-                    
-                json_text = json_text.strip()
-                
-                terms_data = json.loads(json_text)
-                
-                # Additional filter to ensure we only get proper terminology
-                filtered_terms = []
-                for item in terms_data:
-                    term = item["term"].lower().strip()
-                    
-                    # Skip action phrases and verbs (typically start with these words)
-                    skip_prefixes = ['add ', 'change ', 'modify ', 'delete ', 'remove ', 'select ', 'click ']
-                    if any(term.startswith(prefix) for prefix in skip_prefixes):
-                        continue
-                        
-                    # Skip terms that are complete sentences or end with punctuation
-                    if term.endswith(('.', '!', '?')) or len(term.split()) > 5:
-                        continue
-                        
-                    filtered_terms.append((item["term"], item["translation"]))
-                
-                return filtered_terms
+            # Skip action phrases and verbs (typically start with these words)
+            skip_prefixes = ['add ', 'change ', 'modify ', 'delete ', 'remove ', 'select ', 'click ']
+            if any(term.startswith(prefix) for prefix in skip_prefixes):
+                continue
                 
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse LLM response: {json_response}")
-                return []
+            # Skip terms that are complete sentences or end with punctuation
+            if term.endswith(('.', '!', '?')) or len(term.split()) > 5:
+                continue
                 
-        except Exception as e:
-            logger.error(f"Failed to extract glossary terms: {e}")
-            return []
+            filtered_terms.append((item["term"], item["translation"]))
+        
+        return filtered_terms
 
     async def select_preferred_translation(self, term: str, existing_translation: str, 
                                       new_translation: str, target_language: str) -> str:
@@ -523,7 +498,8 @@ class GlossaryMemoryBuilder:
                 
             logger.info(f"Found {len(translatable_columns)} translatable column pairs")
             
-            # Process each row and extract translations
+            # Process each row and collect sentence pairs
+            pairs = []
             for _, source_row in source_df.iterrows():
                 if id_column not in source_row:
                     continue
@@ -561,28 +537,30 @@ class GlossaryMemoryBuilder:
                     if tm_added:
                         stats["translations_added"] += 1
                     
-                    # Extract glossary terms using LLM
-                    glossary_terms = await self.extract_glossary_terms(
-                        text=source_text,
-                        translation=target_text,
-                        target_language=target_language
-                    )
-                    
-                    # Add extracted terms to glossary
-                    for term, translation in glossary_terms:
-                        glossary_added = await self.add_to_glossary(
-                            term=term,
-                            translation=translation,
-                            target_language=target_language,
-                            domain=domain
-                        )
-                        
-                        if glossary_added:
-                            stats["glossary_terms_added"] += 1
-                            logger.info(f"Added glossary term: '{term}' -> '{translation}'")
+                    pairs.append((source_text, target_text))
                 
                 stats["rows_processed"] += 1
             
+            # Extract glossary terms for all pairs with packed LLM requests
+            unique_pairs = list(dict.fromkeys(pairs))
+            logger.info(f"Extracting glossary terms from {len(unique_pairs)} unique sentence pairs")
+            extracted = await self.extract_glossary_terms_batch(unique_pairs, target_language)
+            
+            # Add extracted terms to glossary (once per occurrence, to keep occurrence counts)
+            terms_by_pair = dict(zip(unique_pairs, extracted))
+            for pair in pairs:
+                for term, translation in terms_by_pair.get(pair, []):
+                    glossary_added = await self.add_to_glossary(
+                        term=term,
+                        translation=translation,
+                        target_language=target_language,
+                        domain=domain
+                    )
+                    
+                    if glossary_added:
+                        stats["glossary_terms_added"] += 1
+                        logger.info(f"Added glossary term: '{term}' -> '{translation}'")
+            
             return stats
             
         except Exception as e:
@@ -799,6 +777,13 @@ Examples:
     logger.info(f"Glossary entries: {final_stats['total_glossary_entries']}")
     logger.info(f"Translation entries: {final_stats['total_translation_entries']}")
     logger.info(f"Languages: {', '.join(final_stats['languages'])}")
+    
+    cache_stats = builder.extraction_cache.get_stats()
+    logger.info(f"Term extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_ratio']:.0%} hit ratio, {cache_stats['entries']} entries)")
+    
+    # Close shared LLM clients and connection pools
+    await get_registry().aclose()
 
 
 if __name__ == "__main__":
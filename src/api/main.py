@@ -1,12 +1,22 @@
+import json
+import time
 import logging
-from typing import Dict, Any
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Any, Optional
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from ..core.translator import TranslationOrchestrator
-from ..api.models import TranslationRequest, TranslationResponse, FeedbackRequest, HealthResponse
+from ..api.models import (
+    TranslationRequest, TranslationResponse, MultiTranslationRequest, MultiTranslationResponse,
+    FeedbackRequest, HealthResponse
+)
 from ..core.config import settings
+from ..core.metrics import get_metrics
+from ..llm.usage_ledger import get_run_id, get_usage_ledger
 from ..memory.models import TranslationMemoryEntry
+from ..llm.registry import get_registry
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +54,14 @@ async def startup_event():
     logger.info("📚 Vector DB: ./data/vector_index.faiss")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Finish background TM writes, then release shared LLM clients and HTTP connection pools"""
+    await translator.flush_writes()
+    await get_registry().aclose()
+    logger.info("👋 AI Translation System stopped")
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with system info"""
@@ -53,11 +71,15 @@ async def root():
         "health": "/health",
         "test": "/test",
         "stats": "/stats",
+        "metrics": "/metrics",
+        "usage": "/usage",
         "glossary_debug": "/debug/glossary",
         "memory_debug": "/debug/memory",
         "mcp_debug": "/debug/mcp",
         "feedback": "/feedback",
-        "translate": "/translate"
+        "translate": "/translate",
+        "translate_multi": "/translate/multi",
+        "translate_stream": "/translate/stream"
     }
 
 
@@ -94,6 +116,50 @@ async def translate(request: TranslationRequest) -> TranslationResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/translate/stream", tags=["Translation"])
+async def translate_stream(request: TranslationRequest) -> StreamingResponse:
+    """
+    Stream a translation as Server-Sent Events.
+    
+    Emits a 'context' event with memory/glossary matches, 'token' events as the
+    LLM generates the translation, then a 'done' event with the final response
+    (or an 'error' event).
+    """
+    logger.info(f"📥 Streaming translation request: {request.text[:50]}... -> {request.target_language}")
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            # Closed as soon as the client disconnects, which cancels the translation pipeline
+            async with aclosing(translator.translate_stream(request)) as stream:
+                async for event, data in stream:
+                    yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"❌ Streaming translation failed: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/translate/multi", response_model=MultiTranslationResponse, tags=["Translation"])
+async def translate_multi(request: MultiTranslationRequest) -> MultiTranslationResponse:
+    """Translate one text into several target languages with a single LLM request"""
+    try:
+        start_time = time.time()
+        logger.info(f"📥 Multi-target request: {request.text[:50]}... -> {', '.join(request.target_languages)}")
+        translations = await translator.translate_fanout(request, request.target_languages)
+        return MultiTranslationResponse(
+            translations=translations,
+            processing_time=time.time() - start_time
+        )
+    except Exception as e:
+        logger.error(f"❌ Multi-target translation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/feedback", tags=["Feedback"])
 async def submit_feedback(feedback: FeedbackRequest) -> Dict[str, str]:
     """Submit feedback for translations"""
@@ -130,15 +196,38 @@ async def get_stats() -> Dict[str, Any]:
     return translator.get_system_stats()
 
 
+@app.get("/metrics", tags=["System"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus metrics: stage latencies, memory hit rates, LLM calls/tokens/errors, queue depths"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=false)")
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/usage", tags=["System"])
+async def get_usage(run_id: Optional[str] = None, group_by: str = "language,purpose", all_runs: bool = False) -> Dict[str, Any]:
+    """LLM calls, tokens and cost, for this server's run by default"""
+    ledger = get_usage_ledger()
+    if ledger is None:
+        raise HTTPException(status_code=404, detail="Usage ledger is disabled (USAGE_LEDGER_ENABLED=false)")
+    try:
+        return ledger.summary(
+            None if all_runs else run_id or get_run_id(),
+            [column.strip() for column in group_by.split(",") if column.strip()]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/debug/glossary", tags=["Debug"])
 async def debug_glossary(text: str, target_language: str = "fr") -> Dict[str, Any]:
     """Debug glossary extraction"""
     try:
-        result = translator.glossary_manager.extract_terms(text, target_language)
+        result = translator.glossary_manager.recognize_terms(text, target_language=target_language)
         return {
             "text": text,
             "target_language": target_language,
-            "matches": [{"term": m.term, "translation": m.translation, "confidence": m.confidence} for m in result.matches],
+            "matches": [{"term": m.term, "translation": m.prefered_translation, "confidence": m.confidence} for m in result.matches],
             "terms_found": result.terms_found
         }
     except Exception as e:
@@ -174,7 +263,7 @@ async def debug_mcp(text: str, target_language: str = "fr") -> Dict[str, Any]:
     """Debug MCP prompt construction"""
     try:
         # Simulate the MCP prompt building
-        glossary_result = translator.glossary_manager.extract_terms(text, target_language)
+        glossary_result = translator.glossary_manager.recognize_terms(text, target_language=target_language)
         memory_result = translator.rag_search.search_similar(text, target_language)
         
         # Build prompt using internal method
@@ -186,7 +275,7 @@ async def debug_mcp(text: str, target_language: str = "fr") -> Dict[str, Any]:
             prompt_parts.append("\n=== GLOSSARY TERMS ===")
             for match in glossary_result.matches:
                 prompt_parts.append(f"Term: {match.term}")
-                prompt_parts.append(f"Translation: {match.translation}")
+                prompt_parts.append(f"Translation: {match.prefered_translation}")
                 if match.notes:
                     prompt_parts.append(f"Notes: {match.notes}")
                 prompt_parts.append("")
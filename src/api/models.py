@@ -11,7 +11,8 @@ class TranslationRequest(BaseModel):
     use_memory: bool = Field(default=True, description="Whether to use translation memory")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
     cached_translation: Optional[str] = Field(None, description="Pre-existing translation to use for better term extraction")
-    memory_search_mode: Optional[str] = Field(None, description="'rag' or 'literal'")
+    memory_search_mode: Optional[str] = Field(None, description="'rag', 'literal' or 'cascade'")
+    include_stage_timings: bool = Field(default=False, description="Return per-stage timings in the response")
 
 
 class TranslationResponse(BaseModel):
@@ -23,6 +24,17 @@ class TranslationResponse(BaseModel):
     confidence: float = Field(default=1.0, description="Overall translation confidence")
     model_used: str = Field(..., description="LLM model used for translation")
     processing_time: float = Field(..., description="Processing time in seconds")
+    stage_timings: Optional[Dict[str, float]] = Field(None, description="Milliseconds per stage, when requested")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Pipeline decisions, e.g. the enrichment policy applied")
+
+
+class MultiTranslationRequest(TranslationRequest):
+    target_languages: List[str] = Field(..., description="Target language codes (e.g., ['fr', 'es', 'ru'])", min_length=1)
+
+
+class MultiTranslationResponse(BaseModel):
+    translations: Dict[str, TranslationResponse] = Field(..., description="Translation response per target language")
+    processing_time: float = Field(..., description="Processing time in seconds")
 
 
 class FeedbackRequest(BaseModel):
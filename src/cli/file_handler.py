@@ -6,8 +6,11 @@ Handles reading, processing, and writing CSV files with column-based translation
 import csv
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 import asyncio
+from ..llm.concurrency import suggested_batch_size
+from ..core.tracing import span, start_trace
+from ..llm.usage_ledger import usage_scope
 
 logger = logging.getLogger(__name__)
 
@@ -249,7 +252,8 @@ class CSVFileHandler:
         target_language: str,
         translator,
         memory_mode: str = "rag",
-        reference_lookup: Optional[Dict[str, Dict[str, str]]] = None
+        reference_lookup: Optional[Dict[str, Dict[str, str]]] = None,
+        fanout_cache: Optional[Dict[Tuple[str, str], Any]] = None
     ) -> Dict[str, str]:
         """
         Translate a single row of CSV data.
@@ -259,6 +263,7 @@ class CSVFileHandler:
             translatable_columns: Columns to translate
             target_language: Target language code
             translator: TranslationOrchestrator instance
+            fanout_cache: Optional (cell_text, language) -> TranslationResponse from translate_fanout
             
         Returns:
             Translated row dictionary
@@ -397,35 +402,25 @@ class CSVFileHandler:
                     break
             
             # Detect and preserve formatting wrappers (parentheses, brackets, etc.)
-            wrapper_start = ""
-            wrapper_end = ""
-            
-            if cell_value.startswith("(") and cell_value.endswith(")"):
-                wrapper_start = "("
-                wrapper_end = ")"
-                cell_value = cell_value[1:-1].strip()
-            elif cell_value.startswith("[") and cell_value.endswith("]"):
-                wrapper_start = "["
-                wrapper_end = "]"
-                cell_value = cell_value[1:-1].strip()
-            elif cell_value.startswith("{") and cell_value.endswith("}"):
-                wrapper_start = "{"
-                wrapper_end = "}"
-                cell_value = cell_value[1:-1].strip()
-            # Create translation request
-            request = TranslationRequest(
-                text=cell_value,
-                target_language=target_language,
-                source_language="en",
-                use_glossary=True,
-                use_memory=True,
-                memory_search_mode=memory_mode,
-                cached_translation=cached_translation,
-                metadata={}
-            )
-            
-            # Translate using orchestrator
-            response = await translator.translate(request)
+            wrapper_start, cell_value, wrapper_end = self._split_wrapper(cell_value)
+            
+            # Reuse the multi-target fan-out result when this cell was prefetched
+            response = fanout_cache.get((cell_value, target_language)) if fanout_cache else None
+            if response is None:
+                # Create translation request
+                request = TranslationRequest(
+                    text=cell_value,
+                    target_language=target_language,
+                    source_language="en",
+                    use_glossary=True,
+                    use_memory=True,
+                    memory_search_mode=memory_mode,
+                    cached_translation=cached_translation,
+                    metadata={}
+                )
+                
+                # Translate using orchestrator
+                response = await translator.translate(request)
             row_model_used = response.model_used  # Track the model used
 
 
@@ -474,15 +469,102 @@ class CSVFileHandler:
 
         return translated_row
     
+    @staticmethod
+    def _split_wrapper(cell_value: str) -> Tuple[str, str, str]:
+        """
+        Split a formatting wrapper (parentheses, brackets, braces) off a cell value.
+        
+        Returns:
+            Tuple of (wrapper_start, inner_text, wrapper_end); the wrappers are empty when absent
+        """
+        for start, end in (("(", ")"), ("[", "]"), ("{", "}")):
+            if cell_value.startswith(start) and cell_value.endswith(end):
+                return start, cell_value[1:-1].strip(), end
+        return "", cell_value, ""
+    
+    @staticmethod
+    def _batch_size(batch_size: Optional[int]) -> int:
+        """Fixed batch size if given, otherwise re-read from the adaptive LLM concurrency limit"""
+        return batch_size or suggested_batch_size()
+    
+    async def _prefetch_fanout(
+        self,
+        rows: List[Dict[str, str]],
+        translatable_columns: List[Tuple[str, str]],
+        target_languages: List[str],
+        reference_lookups: Dict[str, Dict[str, Dict[str, str]]],
+        translator,
+        memory_mode: str,
+        batch_size: Optional[int]
+    ) -> Dict[Tuple[str, str], Any]:
+        """
+        Translate every cell that needs the LLM into all its target languages at once.
+        
+        Cells covered by a reference translation are left to translate_row.
+        
+        Returns:
+            Dictionary mapping (cell_text, language) -> TranslationResponse
+        """
+        from ..api.models import TranslationRequest
+        
+        # Unique cell text -> languages that will actually translate it
+        cell_languages: Dict[str, List[str]] = {}
+        for row in rows:
+            row_id = row.get('Id') or row.get('ID') or row.get('id')
+            for original_col, _ in translatable_columns:
+                cell_value = row.get(original_col, "").strip()
+                if not cell_value:
+                    continue
+                _, cell_value, _ = self._split_wrapper(cell_value)
+                for target_lang in target_languages:
+                    reference_lookup = reference_lookups.get(target_lang)
+                    if reference_lookup and row_id and reference_lookup.get(row_id):
+                        continue
+                    languages = cell_languages.setdefault(cell_value, [])
+                    if target_lang not in languages:
+                        languages.append(target_lang)
+        
+        if not cell_languages:
+            return {}
+        logger.info(f"🌐 Fan-out: {len(cell_languages)} unique cells -> {', '.join(target_languages)}")
+        
+        fanout_cache = {}
+        cells = list(cell_languages.items())
+        i = 0
+        while i < len(cells):
+            batch = cells[i:i + self._batch_size(batch_size)]
+            i += len(batch)
+            requests = [
+                TranslationRequest(
+                    text=cell_value,
+                    target_language=languages[0],
+                    source_language="en",
+                    use_glossary=True,
+                    use_memory=True,
+                    memory_search_mode=memory_mode,
+                    metadata={}
+                )
+                for cell_value, languages in batch
+            ]
+            batch_results = await asyncio.gather(*[
+                translator.translate_fanout(request, languages)
+                for request, (_, languages) in zip(requests, batch)
+            ])
+            for (cell_value, _), responses in zip(batch, batch_results):
+                for lang, response in responses.items():
+                    fanout_cache[(cell_value, lang)] = response
+        return fanout_cache
+    
     async def translate_csv(
         self,
         source_path: Path,
         target_languages: List[str],
         translator,
         output_dir: Optional[Path] = None,
-        batch_size: int = 5,
+        batch_size: Optional[int] = None,
         force: bool = False,
-        memory_mode: str = "rag"
+        memory_mode: str = "rag",
+        fanout: bool = False
     ) -> Dict[str, Path]:
         """
         Translate entire CSV file to one or more target languages.
@@ -492,17 +574,37 @@ class CSVFileHandler:
             target_languages: List of target language codes
             translator: TranslationOrchestrator instance
             output_dir: Optional custom output directory
-            batch_size: Number of rows to process concurrently
+            batch_size: Number of rows to process concurrently (None: follow the adaptive LLM concurrency limit)
             force: Force re-translation even if target file already exists
             memory_mode: 'rag' or 'literal'
+            fanout: Translate each cell into all target languages with one LLM request
             
         Returns:
             Dictionary mapping language -> output file path
         """
+        with start_trace("csv_file", file=source_path.name, languages=list(target_languages)), \
+                usage_scope(file=f"{source_path.parent.name}/{source_path.name}"):
+            return await self._translate_csv(
+                source_path, target_languages, translator, output_dir, batch_size, force, memory_mode, fanout
+            )
+    
+    async def _translate_csv(
+        self,
+        source_path: Path,
+        target_languages: List[str],
+        translator,
+        output_dir: Optional[Path],
+        batch_size: Optional[int],
+        force: bool,
+        memory_mode: str,
+        fanout: bool
+    ) -> Dict[str, Path]:
+        """translate_csv body, run inside the file's trace"""
         logger.info(f"🔄 Translating {source_path.name} to: {', '.join(target_languages)}")
         
         # Read source file
-        original_headers, rows = self.read_csv(source_path)
+        with span("csv_read"):
+            original_headers, rows = self.read_csv(source_path)
         
         # Detect translatable columns
         translatable_columns = self.detect_translatable_columns(original_headers)
@@ -513,23 +615,52 @@ class CSVFileHandler:
         
         output_files = {}
         
+        # Languages whose output already exists are skipped unless forced
+        pending_languages = []
         for target_lang in target_languages:
-            logger.info(f"🌍 Processing for: {target_lang.upper()}")
-            
-            # Load reference translation to preserve empty columns
-            reference_lookup = self._load_reference_translation(source_path, target_lang)
-            if reference_lookup:
-                logger.info(f"📖 Loaded {len(reference_lookup)} reference rows for column preservation")
-            
-            # Generate output path to check if it already exists
             output_path = self.generate_output_path(source_path, target_lang, output_dir)
-            
-            # Check if target file already exists
             if output_path.exists() and not force:
                 logger.info(f"⏩ Target file already exists: {output_path}. Skipping translation.")
                 logger.info(f"   Use --force flag to override existing translations.")
                 output_files[target_lang] = output_path
-                continue
+            else:
+                pending_languages.append(target_lang)
+        
+        # Warm the term-extraction cache for every source cell once, in packed requests,
+        # instead of one extraction call per cell per language (spend is split across the languages)
+        glossary_manager = getattr(translator, "glossary_manager", None)
+        if glossary_manager is not None and pending_languages:
+            # Same unwrapped text translate_row extracts terms from, so the cache keys match
+            source_texts = [
+                self._split_wrapper(row[original_col].strip())[1]
+                for row in rows
+                for original_col, _ in translatable_columns
+                if row.get(original_col) and row[original_col].strip()
+            ]
+            with span("csv_prefetch_terms", cells=len(source_texts)), usage_scope(language=",".join(pending_languages)):
+                prefetched = await glossary_manager.prefetch_term_extractions(source_texts, pending_languages[0])
+            if prefetched:
+                logger.info(f"🔎 Prefetched term extraction for {prefetched} unique source texts")
+        
+        # Load reference translations to preserve empty columns
+        reference_lookups = {}
+        for target_lang in pending_languages:
+            with span("csv_load_reference", language=target_lang):
+                reference_lookups[target_lang] = self._load_reference_translation(source_path, target_lang)
+            if reference_lookups[target_lang]:
+                logger.info(f"📖 Loaded {len(reference_lookups[target_lang])} reference rows for column preservation ({target_lang})")
+        
+        fanout_cache = None
+        if fanout and len(pending_languages) > 1:
+            with span("csv_fanout_prefetch"):
+                fanout_cache = await self._prefetch_fanout(
+                    rows, translatable_columns, pending_languages, reference_lookups,
+                    translator, memory_mode, batch_size
+                )
+        
+        for target_lang in pending_languages:
+            logger.info(f"🌍 Processing for: {target_lang.upper()}")
+            reference_lookup = reference_lookups[target_lang]
             
             # Create new headers
             new_headers = self.create_translated_headers(original_headers, target_lang)
@@ -538,22 +669,25 @@ class CSVFileHandler:
             translated_rows = []
             total_rows = len(rows)
             
-            for i in range(0, total_rows, batch_size):
-                batch = rows[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (total_rows + batch_size - 1) // batch_size
+            i = 0
+            batch_num = 0
+            while i < total_rows:
+                batch = rows[i:i + self._batch_size(batch_size)]
+                i += len(batch)
+                batch_num += 1
                 
-                logger.debug(f"📦 Batch {batch_num}/{total_batches} ({len(batch)} rows)")
+                logger.debug(f"📦 Batch {batch_num} ({len(batch)} rows, {i}/{total_rows})")
                 
                 # Translate batch concurrently
                 tasks = [
-                    self.translate_row(row, translatable_columns, target_lang, translator, memory_mode, reference_lookup)
+                    self.translate_row(row, translatable_columns, target_lang, translator, memory_mode, reference_lookup, fanout_cache)
                     for row in batch
                 ]
-                batch_results = await asyncio.gather(*tasks)
+                with span("csv_batch", language=target_lang, batch=batch_num, rows=len(batch)):
+                    batch_results = await asyncio.gather(*tasks)
                 translated_rows.extend(batch_results)
                 
-                logger.debug(f"✅ Batch {batch_num}/{total_batches} completed")
+                logger.debug(f"✅ Batch {batch_num} completed")
             
             # Generate output path
             output_path = self.generate_output_path(source_path, target_lang, output_dir)
@@ -568,7 +702,8 @@ class CSVFileHandler:
             # Also update the headers list
             new_headers = [h if not h.startswith('CodeFigure_') else 'CodeFigure' for h in new_headers]
             # Write translated file
-            self.write_csv(output_path, new_headers, translated_rows)
+            with span("csv_write", language=target_lang):
+                self.write_csv(output_path, new_headers, translated_rows)
             
             output_files[target_lang] = output_path
             logger.info(f"✅ Translation to {target_lang.upper()} completed: {output_path}")
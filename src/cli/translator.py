@@ -13,6 +13,11 @@ import time
 
 from .file_handler import CSVFileHandler
 from ..core.translator import TranslationOrchestrator
+from ..llm.registry import get_registry
+from ..llm.concurrency import get_limiter_stats
+from ..core.config import settings
+from ..core.metrics import get_metrics
+from ..llm.usage_ledger import format_summary, get_run_id, get_usage_ledger, set_run_id
 
 # Configure logging
 import os
@@ -67,9 +72,10 @@ class TranslationCLI:
         source_path: Path,
         target_languages: List[str],
         output_dir: Optional[Path] = None,
-        batch_size: int = 5,
+        batch_size: Optional[int] = None,
         force: bool = False,
-        memory_mode: str = "rag"  # NEW
+        memory_mode: str = "rag",  # NEW
+        fanout: bool = False
     ):
         """
         Translate a single CSV file.
@@ -78,13 +84,14 @@ class TranslationCLI:
             source_path: Path to source CSV file
             target_languages: List of target language codes
             output_dir: Optional custom output directory
-            batch_size: Number of rows to process concurrently
+            batch_size: Number of rows to process concurrently (None: adaptive)
             force: Whether to force re-translation of already translated files
+            fanout: Translate each cell into all target languages with one LLM request
         """
         start_time = time.time()
         
         # Build global literal dictionary ONCE before translating file
-        if memory_mode == "literal":
+        if memory_mode in ("literal", "cascade"):
             for target_lang in target_languages:
                 logger.info(f"📖 Building global literal dictionary for {target_lang}...")
                 count = self.translator.literal_search.build_from_csv_files(
@@ -97,7 +104,7 @@ class TranslationCLI:
             # Set the current source file for lookup context (fallback)
             self.translator.literal_search.set_current_source_file(source_path)
         
-        logger.info(f"📄 Source: {source_path} | Target: {', '.join(target_languages)} | Batch: {batch_size}")
+        logger.info(f"📄 Source: {source_path} | Target: {', '.join(target_languages)} | Batch: {batch_size or 'adaptive'}")
         
         
         output_files = await self.file_handler.translate_csv(
@@ -107,7 +114,8 @@ class TranslationCLI:
             output_dir=output_dir,
             batch_size=batch_size,
             force=force,
-            memory_mode=memory_mode
+            memory_mode=memory_mode,
+            fanout=fanout
         )
         
         elapsed_time = time.time() - start_time
@@ -116,6 +124,26 @@ class TranslationCLI:
         for lang, path in output_files.items():
             logger.info(f"   📁 {lang.upper()}: {path}")
         
+        if memory_mode == "cascade":
+            for tier, tier_stats in self.translator.cascade.get_stats()["tiers"].items():
+                logger.info(
+                    f"   🪜 {tier}: {tier_stats['hits']}/{tier_stats['attempts']} hits "
+                    f"({tier_stats['hit_rate']:.0%}), avg {tier_stats['avg_latency_ms']:.1f}ms"
+                )
+        
+        if self.translator.packed_batcher:
+            packed_stats = self.translator.packed_batcher.get_stats()
+            logger.info(
+                f"   📦 Packed: {packed_stats['items']} segments in {packed_stats['requests']} requests "
+                f"({packed_stats['items_per_request']:.1f}/request)"
+            )
+
+        for deployment, limiter_stats in get_limiter_stats().items():
+            logger.info(
+                f"   🚦 {deployment}: concurrency limit {limiter_stats['limit']} "
+                f"({limiter_stats['congestion_events']} congestion event(s))"
+            )
+
         return output_files
     
     async def translate_directory(
@@ -123,10 +151,11 @@ class TranslationCLI:
         source_dir: Path,
         target_languages: List[str],
         output_dir: Optional[Path] = None,
-        batch_size: int = 5,
+        batch_size: Optional[int] = None,
         pattern: str = "*_en*.csv",
         force: bool = False,
-        memory_mode: str = "rag"  # ADD THIS
+        memory_mode: str = "rag",  # ADD THIS
+        fanout: bool = False
     ):
         """
         Translate all matching CSV files in a directory.
@@ -135,9 +164,10 @@ class TranslationCLI:
             source_dir: Directory containing source CSV files
             target_languages: List of target language codes
             output_dir: Optional custom output directory
-            batch_size: Number of rows to process concurrently
+            batch_size: Number of rows to process concurrently (None: adaptive)
             pattern: Glob pattern for file matching
             force: Whether to force re-translation of already translated files
+            fanout: Translate each cell into all target languages with one LLM request
         """
         logger.info(f"🔍 Scanning directory: {source_dir}")
         logger.info(f"🔎 Pattern: {pattern}")
@@ -163,7 +193,8 @@ class TranslationCLI:
                     output_dir=output_dir,
                     batch_size=batch_size,
                     force=force,
-                    memory_mode=memory_mode
+                    memory_mode=memory_mode,
+                    fanout=fanout
                 )
                 all_output_files[csv_file.name] = output_files
             except Exception as e:
@@ -232,9 +263,10 @@ Examples:
     parser.add_argument(
         '--memory-mode',
         type=str,
-        choices=['rag', 'literal'],
+        choices=['rag', 'literal', 'cascade'],
         default='rag',
-        help='Memory search mode: rag (semantic similarity) or literal (exact match dictionary)'
+        help='Memory search mode: rag (semantic similarity), literal (exact match dictionary) '
+             'or cascade (literal -> normalized -> fuzzy -> semantic, stopping at the first confident tier)'
     )
     # Optional arguments
     parser.add_argument(
@@ -245,8 +277,35 @@ Examples:
     parser.add_argument(
         '--batch-size',
         type=int,
-        default=5,
-        help='Number of rows to process concurrently (default: 5)'
+        default=None,
+        help='Number of rows to process concurrently (default: adaptive, follows the LLM concurrency '
+             'limit discovered at run time)'
+    )
+    parser.add_argument(
+        '--packed',
+        action='store_true',
+        help='Pack concurrent short cells into shared LLM requests (same as PACKED_TRANSLATION=true); '
+             'a fixed --batch-size should be large enough to keep several cells in flight'
+    )
+    parser.add_argument(
+        '--fanout',
+        action='store_true',
+        help='With several targets, translate each cell into all languages in one LLM request'
+    )
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        help='Record per-stage timing spans to this file (.jsonl, or .json for Chrome trace format)'
+    )
+    parser.add_argument(
+        '--run-id',
+        type=str,
+        help='Label for this run in the LLM usage ledger (default: timestamp and process id)'
+    )
+    parser.add_argument(
+        '--metrics-out',
+        type=Path,
+        help='Write the metrics registry here at the end of the run (Prometheus text, or JSON for .json)'
     )
     parser.add_argument(
         '--pattern',
@@ -282,6 +341,17 @@ async def main():
     else:
         target_languages = [lang.strip() for lang in args.targets.split(',')]
     
+    if args.packed:
+        settings.packed_translation = True
+    
+    if args.run_id:
+        set_run_id(args.run_id)
+    
+    if args.trace:
+        settings.trace_enabled = True
+        settings.trace_export_path = str(args.trace)
+        settings.trace_format = "chrome" if args.trace.suffix == ".json" else "jsonl"
+    
     # Initialize CLI
     cli = TranslationCLI()
     cli.setup_translator(
@@ -302,7 +372,8 @@ async def main():
             output_dir=args.output_dir,
             batch_size=args.batch_size,
             force=args.force,
-            memory_mode=args.memory_mode
+            memory_mode=args.memory_mode,
+            fanout=args.fanout
         )
     
     elif args.source_dir:
@@ -318,9 +389,23 @@ async def main():
             batch_size=args.batch_size,
             pattern=args.pattern,
             force=args.force,
-            memory_mode=args.memory_mode
+            memory_mode=args.memory_mode,
+            fanout=args.fanout
         )
     
+    # Finish background TM writes, then close shared LLM clients and connection pools
+    await cli.translator.flush_writes()
+    await get_registry().aclose()
+    
+    ledger = get_usage_ledger()
+    if ledger:
+        logger.info(f"💰 LLM usage for run {get_run_id()}:\n{format_summary(ledger.summary(get_run_id()))}")
+        logger.info(f"   More detail: python -m src.llm.usage_ledger --run {get_run_id()} --by language,purpose")
+    
+    if args.metrics_out:
+        get_metrics().write(str(args.metrics_out))
+        logger.info(f"📈 Metrics written to {args.metrics_out}")
+    
     logger.info("\n🎉 All translations completed successfully!")
 
 if __name__ == "__main__":
@@ -19,6 +19,86 @@ class Settings(BaseSettings):
     azure_openai_deployment_name: str = Field(default="gpt-4", env="AZURE_OPENAI_DEPLOYMENT_NAME")
     model_name: str = Field(default="gpt-4", env="MODEL_NAME")
     
+    # Azure OpenAI Deployment Pool Configuration (load balancing, failover, hedging)
+    azure_openai_deployments: str = Field(default="", env="AZURE_OPENAI_DEPLOYMENTS")  # JSON list of {deployment, endpoint, api_key?, api_version?, weight?}
+    azure_hedge_enabled: bool = Field(default=False, env="AZURE_HEDGE_ENABLED")
+    azure_hedge_budget: float = Field(default=0.05, env="AZURE_HEDGE_BUDGET")  # Max hedged calls as a fraction of all calls
+    azure_hedge_min_samples: int = Field(default=20, env="AZURE_HEDGE_MIN_SAMPLES")  # Latencies needed before p95 is trusted
+    
+    # LLM HTTP Connection Pool Configuration (shared by all LLM clients)
+    llm_max_connections: int = Field(default=50, env="LLM_MAX_CONNECTIONS")
+    llm_max_keepalive_connections: int = Field(default=20, env="LLM_MAX_KEEPALIVE_CONNECTIONS")
+    llm_keepalive_expiry: float = Field(default=60.0, env="LLM_KEEPALIVE_EXPIRY")
+    llm_http2: bool = Field(default=True, env="LLM_HTTP2")
+    llm_request_timeout: float = Field(default=60.0, env="LLM_REQUEST_TIMEOUT")
+    llm_connect_timeout: float = Field(default=10.0, env="LLM_CONNECT_TIMEOUT")
+    
+    # LLM Retry / Circuit Breaker Configuration (shared by all LLM calls)
+    llm_retry_max_attempts: int = Field(default=5, env="LLM_RETRY_MAX_ATTEMPTS")
+    llm_retry_base_delay: float = Field(default=1.0, env="LLM_RETRY_BASE_DELAY")
+    llm_retry_max_delay: float = Field(default=30.0, env="LLM_RETRY_MAX_DELAY")
+    llm_retry_total_timeout: float = Field(default=120.0, env="LLM_RETRY_TOTAL_TIMEOUT")  # Max time spent retrying one request
+    llm_circuit_failure_threshold: int = Field(default=5, env="LLM_CIRCUIT_FAILURE_THRESHOLD")
+    llm_circuit_reset_timeout: float = Field(default=30.0, env="LLM_CIRCUIT_RESET_TIMEOUT")
+
+    # Adaptive (AIMD) Concurrency Configuration (per deployment)
+    llm_adaptive_concurrency: bool = Field(default=True, env="LLM_ADAPTIVE_CONCURRENCY")
+    llm_aimd_initial_concurrency: int = Field(default=8, env="LLM_AIMD_INITIAL_CONCURRENCY")
+    llm_aimd_min_concurrency: int = Field(default=1, env="LLM_AIMD_MIN_CONCURRENCY")
+    llm_aimd_max_concurrency: int = Field(default=64, env="LLM_AIMD_MAX_CONCURRENCY")
+    llm_aimd_increase: float = Field(default=1.0, env="LLM_AIMD_INCREASE")  # Slots added per round of successful calls
+    llm_aimd_decrease: float = Field(default=0.5, env="LLM_AIMD_DECREASE")  # Limit multiplier on throttling/latency spikes
+    llm_aimd_latency_factor: float = Field(default=2.5, env="LLM_AIMD_LATENCY_FACTOR")  # Spike = latency above baseline * factor
+
+    # LLM Rate Limit Configuration (per deployment, 0 = unlimited)
+    llm_rate_limit_rpm: int = Field(default=0, env="LLM_RATE_LIMIT_RPM")
+    llm_rate_limit_tpm: int = Field(default=0, env="LLM_RATE_LIMIT_TPM")
+    llm_rate_limit_overrides: str = Field(default="", env="LLM_RATE_LIMIT_OVERRIDES")  # "gpt-4=300/40000,gpt-35-turbo=600/120000"
+    llm_rate_limit_db: Optional[str] = Field(default=None, env="LLM_RATE_LIMIT_DB")  # Share buckets across processes via SQLite
+    
+    # Local Model (Ollama-compatible) Configuration
+    local_model_url: str = Field(default="http://localhost:11434", env="LOCAL_MODEL_URL")
+    local_model_name: str = Field(default="llama2", env="LOCAL_MODEL_NAME")
+    local_max_connections: int = Field(default=8, env="LOCAL_MAX_CONNECTIONS")
+    local_keepalive_timeout: float = Field(default=60.0, env="LOCAL_KEEPALIVE_TIMEOUT")
+    local_request_timeout: float = Field(default=300.0, env="LOCAL_REQUEST_TIMEOUT")
+    local_stream: bool = Field(default=False, env="LOCAL_STREAM")
+    local_batch_url: Optional[str] = Field(default=None, env="LOCAL_BATCH_URL")  # OpenAI-style /v1/completions accepting a list of prompts
+    
+    # Fake/Replay LLM Provider Configuration (LLM_PROVIDER=fake or replay, load and benchmark testing)
+    fake_llm_latency_ms: float = Field(default=200.0, env="FAKE_LLM_LATENCY_MS")  # Median latency per call
+    fake_llm_latency_sigma: float = Field(default=0.3, env="FAKE_LLM_LATENCY_SIGMA")  # Log-normal spread
+    fake_llm_ms_per_token: float = Field(default=0.0, env="FAKE_LLM_MS_PER_TOKEN")  # Extra latency per output token
+    fake_llm_error_rate: float = Field(default=0.0, env="FAKE_LLM_ERROR_RATE")  # Fraction of calls failing with 500
+    fake_llm_throttle_rate: float = Field(default=0.0, env="FAKE_LLM_THROTTLE_RATE")  # Fraction of calls failing with 429
+    fake_llm_seed: int = Field(default=42, env="FAKE_LLM_SEED")
+    fake_llm_replay_path: Optional[str] = Field(default=None, env="FAKE_LLM_REPLAY_PATH")  # JSONL of {text, target_language, translation}
+    
+    # Usage Ledger Configuration (LLM tokens and cost per run, file, language and purpose)
+    usage_ledger_enabled: bool = Field(default=True, env="USAGE_LEDGER_ENABLED")
+    usage_ledger_path: str = Field(default="./data/llm_usage.db", env="USAGE_LEDGER_PATH")
+    llm_pricing: str = Field(default="", env="LLM_PRICING")  # JSON {"gpt-4": [input_per_1k, output_per_1k], ...}
+    
+    # Metrics Configuration (in-process counters/histograms served at /metrics)
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+    
+    # Tracing Configuration (per-stage timing spans)
+    trace_enabled: bool = Field(default=False, env="TRACE_ENABLED")
+    trace_export_path: str = Field(default="./logs/traces.jsonl", env="TRACE_EXPORT_PATH")
+    trace_format: str = Field(default="jsonl", env="TRACE_FORMAT")  # "jsonl" or "chrome"
+    
+    # Pipeline Configuration
+    background_tm_writes: bool = Field(default=True, env="BACKGROUND_TM_WRITES")  # Persist TM/RAG entries after responding
+    enrichment_policy_path: Optional[str] = Field(default=None, env="ENRICHMENT_POLICY_PATH")  # Default: config/enrichment_policy.json
+    speculative_llm_enabled: bool = Field(default=False, env="SPECULATIVE_LLM_ENABLED")  # Race the LLM call against memory lookup
+    speculation_threshold: float = Field(default=0.7, env="SPECULATION_THRESHOLD")  # Minimum predicted miss probability
+    speculation_long_words: int = Field(default=12, env="SPECULATION_LONG_WORDS")  # Segments this long count as fully "long"
+    speculation_miss_rate_alpha: float = Field(default=0.1, env="SPECULATION_MISS_RATE_ALPHA")  # EWMA weight of the latest lookup
+    speculation_recent_texts: int = Field(default=10000, env="SPECULATION_RECENT_TEXTS")  # Texts remembered for novelty
+    grammar_repair_enabled: bool = Field(default=True, env="GRAMMAR_REPAIR_ENABLED")  # Rule-based repair before the LLM grammar pass
+    grammar_repair_min_confidence: float = Field(default=0.8, env="GRAMMAR_REPAIR_MIN_CONFIDENCE")  # Below this, fall back to the LLM
+    grammar_rules_path: Optional[str] = Field(default=None, env="GRAMMAR_RULES_PATH")  # Default: config/grammar_rules.json
+    
     # Database Configuration
     database_url: str = Field(default="sqlite:///./translation.db", env="DATABASE_URL")
     vector_db_path: str = Field(default="./data/vector_index.faiss", env="VECTOR_DB_PATH")
@@ -33,6 +113,34 @@ class Settings(BaseSettings):
     top_k_matches: int = Field(default=5, env="TOP_K_MATCHES")
     similarity_threshold: float = Field(default=0.7, env="SIMILARITY_THRESHOLD")
     
+    # Glossary Configuration
+    glossary_discover_terms: bool = Field(default=False, env="GLOSSARY_DISCOVER_TERMS")  # Also ask the LLM for new terms
+    glossary_generation_check_ms: float = Field(default=1000.0, env="GLOSSARY_GENERATION_CHECK_MS")  # How often to look for glossary writes from other processes
+    term_extraction_cache_enabled: bool = Field(default=True, env="TERM_EXTRACTION_CACHE_ENABLED")
+    term_extraction_cache_path: str = Field(default="./data/term_extraction_cache.db", env="TERM_EXTRACTION_CACHE_PATH")
+    extraction_batch_max_items: int = Field(default=40, env="EXTRACTION_BATCH_MAX_ITEMS")
+    extraction_batch_max_input_tokens: int = Field(default=6000, env="EXTRACTION_BATCH_MAX_INPUT_TOKENS")
+    extraction_batch_max_output_tokens: int = Field(default=3000, env="EXTRACTION_BATCH_MAX_OUTPUT_TOKENS")
+    extraction_batch_output_tokens_per_item: int = Field(default=60, env="EXTRACTION_BATCH_OUTPUT_TOKENS_PER_ITEM")
+    
+    # Prompt Token Budget Configuration
+    prompt_input_token_budget: int = Field(default=1500, env="PROMPT_INPUT_TOKEN_BUDGET")
+    prompt_grammar_token_budget: int = Field(default=300, env="PROMPT_GRAMMAR_TOKEN_BUDGET")  # MCP grammar rules
+    prompt_output_token_ratio: float = Field(default=3.0, env="PROMPT_OUTPUT_TOKEN_RATIO")  # max_tokens per source token
+    prompt_min_output_tokens: int = Field(default=32, env="PROMPT_MIN_OUTPUT_TOKENS")
+    prompt_max_output_tokens: int = Field(default=1000, env="PROMPT_MAX_OUTPUT_TOKENS")
+    
+    # Packed Translation Configuration (many short segments per LLM request)
+    packed_translation: bool = Field(default=False, env="PACKED_TRANSLATION")
+    packed_max_items: int = Field(default=30, env="PACKED_MAX_ITEMS")
+    packed_max_words: int = Field(default=12, env="PACKED_MAX_WORDS")  # Longer segments are sent on their own
+    packed_max_wait_ms: int = Field(default=50, env="PACKED_MAX_WAIT_MS")
+    packed_max_input_tokens: int = Field(default=6000, env="PACKED_MAX_INPUT_TOKENS")
+    
+    # Cascade Memory Lookup Configuration
+    cascade_tiers: str = Field(default="literal,normalized,fuzzy,semantic,llm", env="CASCADE_TIERS")
+    cascade_thresholds: str = Field(default="literal=1.0,normalized=0.98,fuzzy=0.92,semantic=0.9", env="CASCADE_THRESHOLDS")
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
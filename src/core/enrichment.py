@@ -0,0 +1,121 @@
+"""
+Enrichment policy: which post-retrieval stages run for a segment.
+
+Once memory lookup is done, the orchestrator asks the policy what to do with the
+result. Rules in config/enrichment_policy.json (or ENRICHMENT_POLICY_PATH) are
+tried in order and the first matching rule decides:
+
+    {"name": "trusted_exact", "modes": ["literal", "cascade"], "min_score": 1.0, "trusted": true,
+     "stages": {"glossary": false, "glossary_apply": false, "grammar_correction": false}}
+
+A rule matches on the memory search mode, the cascade tier, the best match score
+and whether the match is trusted, i.e. came from the human reference files. The
+global dictionary can also hold unreviewed LLM output, so its matches are only
+trusted with "trust_global_dictionary": true at the top of the policy. Stages a
+rule does not mention keep the policy defaults. A trusted exact hit therefore
+returns without any LLM call, and the decision is reported in the response metadata.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from .config import settings
+from ..memory.models import SearchResult, TranslationMatch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICY_PATH = Path(__file__).parent.parent.parent / "config" / "enrichment_policy.json"
+
+STAGES = ("glossary", "term_discovery", "glossary_apply", "grammar_correction")
+
+
+def is_trusted(match: TranslationMatch, trust_global_dictionary: bool = False) -> bool:
+    """Whether a memory match came from the human reference files rather than an earlier LLM run"""
+    metadata = match.metadata or {}
+    if metadata.get("source") == "reference":
+        return True
+    return trust_global_dictionary and metadata.get("dictionary_type") == "global"
+
+
+class EnrichmentRule(BaseModel):
+    """One policy rule; unset conditions match anything"""
+    name: str
+    modes: Optional[List[str]] = None
+    tiers: Optional[List[str]] = None
+    min_score: Optional[float] = None
+    trusted: Optional[bool] = None
+    stages: Dict[str, bool] = Field(default_factory=dict)
+
+    def matches(self, mode: str, memory_result: SearchResult, best: Optional[TranslationMatch], trusted: bool) -> bool:
+        if self.modes is not None and mode not in self.modes:
+            return False
+        if self.tiers is not None and memory_result.tier not in self.tiers:
+            return False
+        if self.min_score is not None and (best is None or best.similarity_score < self.min_score):
+            return False
+        if self.trusted is not None and trusted != self.trusted:
+            return False
+        return True
+
+
+class EnrichmentDecision(BaseModel):
+    """Stages to run for one segment, and the rule that chose them"""
+    rule: str
+    glossary: bool = True
+    term_discovery: bool = False
+    glossary_apply: bool = True
+    grammar_correction: bool = True
+
+    @property
+    def skipped(self) -> List[str]:
+        return [stage for stage in STAGES if not getattr(self, stage)]
+
+
+class EnrichmentPolicy:
+    """Ordered enrichment rules loaded from JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.enrichment_policy_path or DEFAULT_POLICY_PATH)
+        self.defaults: Dict[str, bool] = {}
+        self.rules: List[EnrichmentRule] = []
+        self.trust_global_dictionary = False
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load the rules; a missing or invalid file leaves every stage on"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            self.defaults = {stage: bool(value) for stage, value in config.get("defaults", {}).items() if stage in STAGES}
+            self.rules = [EnrichmentRule(**rule) for rule in config.get("rules", [])]
+            self.trust_global_dictionary = bool(config.get("trust_global_dictionary", False))
+            logger.info(f"🧭 Loaded {len(self.rules)} enrichment rules from {self.path}")
+        except FileNotFoundError:
+            logger.info(f"🧭 No enrichment policy at {self.path} - running every enrichment stage")
+            self.defaults, self.rules, self.trust_global_dictionary = {}, [], False
+        except (ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Invalid enrichment policy {self.path} ({e}) - running every enrichment stage")
+            self.defaults, self.rules, self.trust_global_dictionary = {}, [], False
+
+    def decide(self, mode: str, memory_result: SearchResult) -> EnrichmentDecision:
+        """
+        Decide the enrichment stages for a memory lookup result.
+
+        Args:
+            mode: Memory search mode ('rag', 'literal' or 'cascade')
+            memory_result: Result of the lookup (empty when memory was not used)
+
+        Returns:
+            EnrichmentDecision from the first matching rule, or the defaults
+        """
+        best = max(memory_result.matches, key=lambda m: m.similarity_score) if memory_result.matches else None
+        trusted = best is not None and is_trusted(best, self.trust_global_dictionary)
+        stages: Dict[str, Any] = {"term_discovery": settings.glossary_discover_terms, **self.defaults}
+        rule_name = "default"
+        for rule in self.rules:
+            if rule.matches(mode, memory_result, best, trusted):
+                stages.update({stage: value for stage, value in rule.stages.items() if stage in STAGES})
+                rule_name = rule.name
+                break
+        return EnrichmentDecision(rule=rule_name, **stages)
@@ -0,0 +1,313 @@
+"""
+Rule-based grammar repair around glossary substitutions.
+
+Replacing a term's rendering with the glossary's preferred translation often
+breaks the words next to it: "le température", "la humidité" instead of
+"l'humidité", "de le" instead of "du". These fixes are mechanical, so
+GrammarRepairer makes them locally, driven by the "repair" section of each
+language in config/grammar_rules.json (or GRAMMAR_RULES_PATH):
+
+    "fr": {"prompt_rules": [...], "repair": {"articles": {"le": "m", ...}, "elision": {"la": "l'", ...}, ...}}
+
+Around every substituted term it can:
+- swap gendered articles when the new term has another gender (le ↔ la, du ↔ de la)
+- elide or restore function words before the term (la → l', d' → de)
+- contract preposition + article (de le → du, a el → al)
+- apply euphony rules (es y → e, o → u; fr ce → cet; ru о → об)
+- flip regular adjective endings after the term (élevé → élevée)
+- keep Arabic definiteness (ال) from the replaced rendering
+
+The new term's gender comes from its glossary notes ("gender: f", "(nf)",
+"féminin"...) or, at lower confidence, from its ending. Every repair reports a
+confidence; the orchestrator only falls back to the LLM grammar pass when it is
+below GRAMMAR_REPAIR_MIN_CONFIDENCE, e.g. when an article depends on a gender
+nothing states, or when the language's agreement is beyond these rules.
+"""
+import re
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = Path(__file__).parent.parent.parent / "config" / "grammar_rules.json"
+
+_GENDER_NOTE = re.compile(
+    r"\bgender\s*[:=]\s*([mfn])\b|\((n?[mf])\.?\)|\b(n[mf])\b|\bn\.\s?([mf])\.|\b(masculine|feminine|neuter|masculin|féminin|neutre)\b",
+    re.IGNORECASE
+)
+# Up to two words (or an elided word such as "l'") right before a term
+_TAIL = re.compile(r"(?:\b(\w+)\s+)?\b(\w+)(?:(['’])|\s+)$")
+_NEXT_WORD = re.compile(r"^(\s+)(\w+)")
+
+
+def parse_gender(notes: Optional[str]) -> Optional[str]:
+    """Grammatical gender ('m', 'f' or 'n') stated in glossary notes, if any"""
+    if not notes:
+        return None
+    match = _GENDER_NOTE.search(notes)
+    if not match:
+        return None
+    value = next(group for group in match.groups() if group).lower()
+    return value[-1] if len(value) <= 2 else value[0]
+
+
+def _match_case(word: str, like: str) -> str:
+    return word[:1].upper() + word[1:] if like[:1].isupper() else word
+
+
+class RepairResult(BaseModel):
+    """Repaired text, how far the rules can be trusted on it, and the edits made"""
+    text: str
+    confidence: float = 1.0
+    fixes: List[str] = Field(default_factory=list)
+
+
+class LanguageRules:
+    """Repair rules for one target language"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.head = config.get("head", "first")
+        self.agreement = config.get("agreement", "rules")
+        self.articles = {article.lower(): gender for article, gender in config.get("articles", {}).items()}
+        self.gender_swap = config.get("gender_swap", {})
+        self.elision = config.get("elision", {})
+        self.elided = config.get("elided", {})
+        self.contractions = config.get("contractions", {})
+        self.euphony = [
+            (rule["word"], rule["alt"], re.compile(rule["before"], re.IGNORECASE)) for rule in config.get("euphony", [])
+        ]
+        vowel_initial = config.get("vowel_initial")
+        self.vowel_initial = re.compile(vowel_initial, re.IGNORECASE) if vowel_initial else None
+        # Longest endings first, so "os"/"as" wins over "o"/"a"
+        self.adjective_endings = sorted(
+            (tuple(pair) for pair in config.get("adjective_endings", [])), key=lambda pair: -max(map(len, pair))
+        )
+        self.invariable = {word.lower() for word in config.get("invariable", [])}
+        self.gender_hints = sorted(
+            ((suffix, gender) for gender, suffixes in config.get("gender_hints", {}).items() for suffix in suffixes),
+            key=lambda hint: -len(hint[0])
+        )
+        self.definite_prefix = config.get("definite_prefix")
+
+    def starts_with_vowel(self, text: str) -> bool:
+        return bool(self.vowel_initial and self.vowel_initial.match(text))
+
+    def guess_gender(self, phrase: str) -> Optional[str]:
+        """Gender suggested by the ending of the phrase's head noun"""
+        words = phrase.split()
+        if not words:
+            return None
+        head = (words[-1] if self.head == "last" else words[0]).lower()
+        for suffix, gender in self.gender_hints:
+            if head.endswith(suffix):
+                return gender
+        return None
+
+
+class GrammarRepairer:
+    """Applies per-language repair rules around substituted glossary terms"""
+
+    # Confidence multipliers for the parts the rules cannot fully vouch for
+    # Anything below the default GRAMMAR_REPAIR_MIN_CONFIDENCE (0.8) sends the text to the LLM pass
+    GENDER_UNKNOWN = 0.5         # an article or agreement depends on a gender nothing states
+    GENDER_GUESSED = 0.75        # an article or agreement was decided from the noun's ending, not the glossary
+    ADJECTIVE_FLIPPED = 0.9      # the word after the term may not be an adjective
+    AGREEMENT_UNRESOLVED = 0.5   # gender changed and the word after the term could not be made to agree
+    AGREEMENT_UNSUPPORTED = 0.5  # gender changed in a language whose agreement the rules don't cover
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.grammar_rules_path or DEFAULT_RULES_PATH)
+        self.languages: Dict[str, LanguageRules] = {}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)load the rules; languages without a "repair" section always fall back to the LLM"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            self.languages = {
+                language: LanguageRules(rules["repair"])
+                for language, rules in config.items()
+                if isinstance(rules, dict) and rules.get("repair")
+            }
+            logger.info(f"🔧 Loaded grammar repair rules for {sorted(self.languages)} from {self.path}")
+        except FileNotFoundError:
+            logger.info(f"🔧 No grammar rules at {self.path} - grammar correction stays with the LLM")
+            self.languages = {}
+        except (ValueError, TypeError, KeyError, re.error) as e:
+            logger.warning(f"⚠️ Invalid grammar rules {self.path} ({e}) - grammar correction stays with the LLM")
+            self.languages = {}
+
+    def repair(self, text: str, replacements: List[Dict[str, Any]], target_language: str) -> RepairResult:
+        """
+        Repair the grammar around glossary substitutions.
+
+        Args:
+            text: Translation after the substitutions
+            replacements: One dict per substituted term with 'to' (the preferred translation),
+                'rendering' (the text it replaced) and optionally 'notes' (glossary notes)
+            target_language: Language code of the text
+
+        Returns:
+            RepairResult; its confidence is 0.0 when the language has no repair rules
+        """
+        rules = self.languages.get(target_language)
+        if rules is None:
+            return RepairResult(text=text, confidence=0.0)
+
+        result = RepairResult(text=text)
+        for replacement in replacements:
+            self._repair_term(result, replacement, rules)
+        return result
+
+    def _repair_term(self, result: RepairResult, replacement: Dict[str, Any], rules: LanguageRules) -> None:
+        term = replacement["to"]
+        rendering = replacement.get("rendering") or ""
+        gender = parse_gender(replacement.get("notes"))
+        guessed = False
+        if gender is None:
+            gender = rules.guess_gender(term)
+            guessed = gender is not None
+
+        pattern = re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE)
+        # Right to left, so the offsets of earlier occurrences stay valid as the text changes
+        for occurrence in reversed(list(pattern.finditer(result.text))):
+            text = result.text
+            prefix, found, suffix = text[:occurrence.start()], occurrence.group(0), text[occurrence.end():]
+            confidence = 1.0
+
+            if rules.definite_prefix and rendering.startswith(rules.definite_prefix) and not found.startswith(rules.definite_prefix):
+                if len(found.split()) == 1:
+                    found = rules.definite_prefix + found
+                else:
+                    # Which words of a phrase take the article depends on its structure
+                    confidence *= self.GENDER_UNKNOWN
+
+            prefix, old_gender, prefix_confidence, used_gender = self._repair_before(prefix, found, gender, rules)
+            confidence *= prefix_confidence
+            if old_gender is None:
+                old_gender = rules.guess_gender(rendering)
+
+            if gender and old_gender and gender != old_gender:
+                used_gender = True
+                if rules.adjective_endings:
+                    suffix, agreement = self._repair_after(suffix, gender, rules)
+                    if agreement == "flipped":
+                        confidence *= self.ADJECTIVE_FLIPPED
+                    elif agreement == "unresolved":
+                        confidence *= self.AGREEMENT_UNRESOLVED
+                elif rules.agreement == "unsupported":
+                    confidence *= self.AGREEMENT_UNSUPPORTED
+            if used_gender and guessed:
+                confidence *= self.GENDER_GUESSED
+
+            repaired = prefix + found + suffix
+            if repaired != text:
+                start = max(0, len(prefix) - 20)
+                result.fixes.append(f"'{text[start:occurrence.end() + 20]}' → '{repaired[start:len(prefix) + len(found) + 20]}'")
+                result.text = repaired
+            result.confidence = min(result.confidence, confidence)
+
+    def _repair_before(
+        self, prefix: str, term: str, gender: Optional[str], rules: LanguageRules
+    ) -> Tuple[str, Optional[str], float, bool]:
+        """
+        Fix the article/preposition before a term.
+
+        Returns:
+            The new prefix, the old article's gender, a confidence, and whether a
+            gendered form was chosen from the new term's gender
+        """
+        tail = _TAIL.search(prefix)
+        if tail is None:
+            return prefix, None, 1.0, False
+
+        words = [word for word in (tail.group(1), tail.group(2)) if word]
+        if tail.group(3):
+            words[-1] += tail.group(3)
+        original = list(words)
+        vowel = rules.starts_with_vowel(term)
+        old_gender = None
+        confidence = 1.0
+        needs_gender = False
+        used_gender = False
+
+        last = words[-1].lower().replace("’", "'")
+        if tail.group(3):
+            # Elided word before a term that no longer starts with a vowel: restore it
+            forms = rules.elided.get(last)
+            if forms and not vowel:
+                form = (forms.get(gender) if gender else None) or forms.get("*")
+                if form is None:
+                    confidence *= self.GENDER_UNKNOWN
+                else:
+                    words[-1] = _match_case(form, words[-1])
+                    used_gender = "*" not in forms
+        else:
+            pair = " ".join(words).lower()
+            article, size = (pair, 2) if len(words) == 2 and pair in rules.articles else (last, 1)
+            if article in rules.articles:
+                old_gender = rules.articles[article]
+                if gender is None:
+                    needs_gender = True
+                else:
+                    # Kept or swapped, the article now depends on the new term's gender
+                    used_gender = True
+                    if gender != old_gender and article in rules.gender_swap:
+                        swapped = rules.gender_swap[article].split()
+                        swapped[0] = _match_case(swapped[0], words[-size])
+                        words = words[:-size] + swapped
+
+            last = words[-1].lower()
+            if vowel and last in rules.elision:
+                words[-1:] = _match_case(rules.elision[last], words[-1]).split()
+            for word, alt, before in rules.euphony:
+                if last == word and before.match(term):
+                    words[-1] = _match_case(alt, words[-1])
+                elif last == alt and not before.match(term):
+                    words[-1] = _match_case(word, words[-1])
+
+        if len(words) >= 2:
+            pair = " ".join(words[-2:]).lower()
+            if pair in rules.contractions:
+                words = words[:-2] + [_match_case(rules.contractions[pair], words[-2])]
+
+        # The article still carries a gender nobody could confirm for the new term
+        if needs_gender and words[-1].lower() in rules.articles:
+            confidence *= self.GENDER_UNKNOWN
+
+        if words == original:
+            return prefix, old_gender, confidence, used_gender
+        joined = " ".join(words)
+        separator = "" if joined[-1] in "'’" else " "
+        return prefix[:tail.start()] + joined + separator, old_gender, confidence, used_gender
+
+    @staticmethod
+    def _repair_after(suffix: str, gender: str, rules: LanguageRules) -> Tuple[str, Optional[str]]:
+        """
+        Make a regular adjective right after the term agree with its new gender.
+
+        Returns:
+            The new suffix and 'flipped', 'agrees' (already has the new gender's ending),
+            'unresolved' (a word that may need to agree but has no known ending) or None
+            (nothing after the term that could agree)
+        """
+        match = _NEXT_WORD.match(suffix)
+        if not match:
+            return suffix, None
+        word = match.group(2)
+        lower = word.lower()
+        if len(lower) < 4 or lower in rules.invariable or lower in rules.articles or lower in rules.elision:
+            return suffix, None
+        for masculine, feminine in rules.adjective_endings:
+            source, target = (masculine, feminine) if gender == "f" else (feminine, masculine)
+            if lower.endswith(target):
+                return suffix, "agrees"
+            if lower.endswith(source):
+                flipped = word[:len(word) - len(source)] + target
+                return match.group(1) + flipped + suffix[match.end():], "flipped"
+        return suffix, "unresolved"
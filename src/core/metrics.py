@@ -0,0 +1,243 @@
+"""
+In-process counters, gauges and histograms with Prometheus text exposition.
+
+Instrumented code updates metrics directly; they are cheap (a lock and a dict
+update) so they stay on all the time:
+
+    get_metrics().counter("llm_calls_total", "LLM calls", ["deployment", "outcome"]).inc(deployment=name, outcome="success")
+
+Values that already live elsewhere (queue depths, index sizes, cache sizes) are
+read at scrape time by collectors registered with register_collector(), which
+set gauges just before rendering. GET /metrics serves render(); the CLI writes
+the same registry at the end of a run with --metrics-out.
+"""
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds, from a dictionary lookup to a slow LLM call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set"""
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _items(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._items()
+        ]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {",".join(key) or "_": value for key, value in self._items()}
+
+
+class Gauge(Counter):
+    """Value that can go up and down, usually set by a collector at scrape time"""
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def clear(self) -> None:
+        """Forget every label set (collectors call this so vanished series disappear)"""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """Bucketed distribution with sum and count per label set"""
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def _items(self) -> List[Tuple[LabelValues, List[int], float]]:
+        with self._lock:
+            return [(key, list(self._counts[key]), self._sums[key]) for key in sorted(self._counts)]
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Approximate quantile (upper bound of the bucket holding it)"""
+        counts = self._counts.get(self._key(labels))
+        if not counts:
+            return None
+        target = q * sum(counts)
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            if running >= target:
+                return bound
+        return None
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, counts, total in self._items():
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {running}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {running}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        snapshot = {}
+        for key, counts, total in self._items():
+            labels = dict(zip(self.labelnames, key))
+            count = sum(counts)
+            snapshot[",".join(key) or "_"] = {
+                "count": count,
+                "sum": total,
+                "avg": total / count if count else None,
+                "p50": self.quantile(0.5, **labels),
+                "p95": self.quantile(0.95, **labels)
+            }
+        return snapshot
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[["MetricsRegistry"], None]] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.type}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, name: str, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Run collector(registry) before every render/snapshot; re-registering a name replaces it"""
+        self._collectors[name] = collector
+
+    def collect(self) -> None:
+        """Refresh scrape-time gauges; a failing collector is logged and skipped"""
+        for name, collector in list(self._collectors.items()):
+            try:
+                collector(self)
+            except Exception as e:
+                logger.debug(f"Metrics collector {name} failed: {e}")
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        self.collect()
+        self.gauge("process_uptime_seconds", "Seconds since the metrics registry was created").set(time.time() - self.started_at)
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current values as plain dicts (label values joined by commas)"""
+        self.collect()
+        return {name: self._metrics[name].snapshot() for name in sorted(self._metrics)}
+
+    def write(self, path: str) -> None:
+        """Write render() output, or JSON snapshot() when path ends in .json"""
+        content = json.dumps(self.snapshot(), indent=2) if str(path).endswith(".json") else self.render()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+_metrics: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
@@ -0,0 +1,103 @@
+"""
+Speculative LLM dispatch for segments that will probably miss translation memory.
+
+Normally the LLM call waits for memory lookup. With SPECULATIVE_LLM_ENABLED, the
+orchestrator asks SpeculationPredictor whether a memory hit is unlikely. If so,
+the LLM translation starts at the same time as the lookup, with only the
+source-side glossary terms as context. If the lookup then finds a reusable match,
+the in-flight call is cancelled. Otherwise its result is used, and the lookup
+latency no longer adds to the request.
+
+The predictor blends three cheap signals into a miss probability:
+- recent miss rate per search mode (EWMA)
+- segment length (long free-text notes rarely repeat)
+- novelty (whether the text was seen recently)
+
+Speculated calls whose result is thrown away are counted as wasted. The wasted
+ratio reported by get_stats() is what SPECULATION_THRESHOLD should be tuned
+against.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict
+from .config import settings
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+SPECULATIONS = get_metrics().counter(
+    "llm_speculations_total", "Speculative LLM calls by outcome (used, cancelled, wasted, failed)", ["outcome"]
+)
+
+
+class SpeculationPredictor:
+    """Predicts memory misses from recent miss rate, length and novelty"""
+
+    # Weights of the three signals in the miss probability
+    MISS_RATE_WEIGHT = 0.5
+    LENGTH_WEIGHT = 0.3
+    NOVELTY_WEIGHT = 0.2
+
+    def __init__(self):
+        self.threshold = settings.speculation_threshold
+        self.long_words = max(1, settings.speculation_long_words)
+        self.alpha = settings.speculation_miss_rate_alpha
+        self.max_recent = settings.speculation_recent_texts
+        self._miss_rate: Dict[str, float] = {}
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"predictions": 0, "speculated": 0, "used": 0, "cancelled": 0, "wasted": 0, "failed": 0}
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def miss_probability(self, text: str, mode: str) -> float:
+        """Estimated probability that memory lookup will not return a reusable match"""
+        miss_rate = self._miss_rate.get(mode, 0.5)
+        length = min(1.0, len(text.split()) / self.long_words)
+        novelty = 0.0 if self._normalize(text) in self._recent else 1.0
+        return self.MISS_RATE_WEIGHT * miss_rate + self.LENGTH_WEIGHT * length + self.NOVELTY_WEIGHT * novelty
+
+    def should_speculate(self, text: str, mode: str) -> bool:
+        """Whether to start the LLM call before memory lookup finishes"""
+        self.stats["predictions"] += 1
+        speculate = self.miss_probability(text, mode) >= self.threshold
+        if speculate:
+            self.stats["speculated"] += 1
+        return speculate
+
+    def observe(self, text: str, mode: str, hit: bool) -> None:
+        """Feed back one memory lookup outcome (for every request, speculated or not)"""
+        with self._lock:
+            previous = self._miss_rate.get(mode, 0.5)
+            self._miss_rate[mode] = (1 - self.alpha) * previous + self.alpha * (0.0 if hit else 1.0)
+            key = self._normalize(text)
+            self._recent[key] = None
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+
+    def record_outcome(self, outcome: str) -> None:
+        """
+        Record what happened to a speculative call.
+
+        Args:
+            outcome: 'used' (its translation was returned), 'cancelled' (memory hit, cancelled in flight),
+                'wasted' (memory hit after the call had already finished) or 'failed' (the call raised)
+        """
+        self.stats[outcome] += 1
+        SPECULATIONS.inc(outcome=outcome)
+
+    def get_stats(self) -> dict:
+        """Speculation counters, wasted-spend ratio and per-mode miss rates"""
+        speculated = self.stats["speculated"]
+        thrown_away = self.stats["cancelled"] + self.stats["wasted"]
+        return {
+            **self.stats,
+            "threshold": self.threshold,
+            # Cancelled calls may still have been billed for their prompt, so they count as waste
+            "wasted_ratio": thrown_away / speculated if speculated else 0.0,
+            "miss_rate": dict(self._miss_rate)
+        }
@@ -0,0 +1,264 @@
+"""
+Lightweight per-stage timing spans.
+
+A trace covers one unit of work (a translation request, a CSV file) and holds
+the spans recorded inside it:
+
+    with start_trace("translate", language="fr") as trace:
+        with span("memory_lookup", mode="rag"):
+            ...
+        trace.stage_timings()   # {"memory_lookup": 12.3, ...} in milliseconds
+
+span() records nothing outside a trace, so library code can be instrumented
+unconditionally; every span and trace duration also feeds the
+translation_stage_duration_seconds histogram (see metrics.py). The current
+trace and parent span live in context variables, so spans recorded in asyncio
+tasks and asyncio.to_thread calls land in the trace that started them.
+
+With TRACE_ENABLED, finished traces are appended to TRACE_EXPORT_PATH as JSONL
+(one span per line) or as Chrome trace events (TRACE_FORMAT=chrome, open in
+chrome://tracing or ui.perfetto.dev). A JSONL file can be converted or
+summarised later:
+
+    python -m src.core.tracing logs/traces.jsonl --chrome logs/traces.json
+    python -m src.core.tracing logs/traces.jsonl --summary
+"""
+import os
+import json
+import time
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from .config import settings
+from .metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """One timed stage"""
+
+    __slots__ = ("span_id", "parent_id", "name", "attrs", "start", "start_wall", "duration", "thread")
+
+    def __init__(self, name: str, parent_id: Optional[int], attrs: Dict[str, Any]):
+        self.span_id = next(_ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.start_wall = time.time()
+        self.duration: Optional[float] = None
+        self.thread = threading.get_ident()
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.start
+
+
+class Trace:
+    """Spans recorded for one request or file"""
+
+    def __init__(self, name: str, attrs: Dict[str, Any], parent: Optional["Trace"] = None):
+        self.trace_id = next(_ids)
+        self.parent_trace_id = parent.trace_id if parent else None
+        self.root = Span(name, None, attrs)
+        self.spans: List[Span] = [self.root]
+
+    @property
+    def name(self) -> str:
+        return self.root.name
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Milliseconds per stage name (summed over repeats), excluding the root span"""
+        timings: Dict[str, float] = {}
+        for recorded in self.spans[1:]:
+            if recorded.duration is not None:
+                timings[recorded.name] = round(timings.get(recorded.name, 0.0) + recorded.duration * 1000, 3)
+        return timings
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Finished spans as JSONL records"""
+        return [{
+            "trace_id": self.trace_id,
+            "parent_trace_id": self.parent_trace_id,
+            "trace": self.name,
+            "span_id": s.span_id,
+            "parent_id": s.parent_id,
+            "name": s.name,
+            "start": s.start_wall,
+            "duration_ms": round(s.duration * 1000, 3),
+            "thread": s.thread,
+            "attrs": s.attrs
+        } for s in self.spans if s.duration is not None]
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    """Record a stage duration in the metrics registry"""
+    if settings.metrics_enabled:
+        get_metrics().histogram(
+            "translation_stage_duration_seconds", "Duration of translation stages (spans and traces)", ["stage"]
+        ).observe(seconds, stage=name)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace being recorded in this context, if any"""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """Time a stage of the current trace; only feeds stage metrics when no trace is active"""
+    trace = _current_trace.get()
+    if trace is None:
+        started = time.perf_counter()
+        try:
+            yield None
+        finally:
+            observe_stage(name, time.perf_counter() - started)
+        return
+
+    parent = _current_span.get()
+    recorded = Span(name, parent.span_id if parent else trace.root.span_id, attrs)
+    trace.spans.append(recorded)
+    token = _current_span.set(recorded)
+    try:
+        yield recorded
+    finally:
+        recorded.finish()
+        _current_span.reset(token)
+        observe_stage(name, recorded.duration)
+
+
+@contextmanager
+def start_trace(name: str, force: bool = False, **attrs) -> Iterator[Optional[Trace]]:
+    """
+    Record a new trace for the enclosed work.
+
+    Args:
+        name: Trace (root span) name
+        force: Record even when TRACE_ENABLED is off, e.g. to return stage timings
+        **attrs: Attributes stored on the root span
+
+    Yields:
+        The trace, or None when tracing is off and not forced
+    """
+    if not (settings.trace_enabled or force):
+        started = time.perf_counter()
+        try:
+            yield None
+        finally:
+            observe_stage(name, time.perf_counter() - started)
+        return
+
+    trace = Trace(name, attrs, parent=_current_trace.get())
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    try:
+        yield trace
+    finally:
+        trace.root.finish()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        observe_stage(name, trace.root.duration)
+        if settings.trace_enabled:
+            get_exporter().export(trace)
+
+
+class TraceExporter:
+    """Appends finished traces to a JSONL or Chrome trace-event file"""
+
+    def __init__(self, path: str, format: str = "jsonl"):
+        self.path = Path(path)
+        self.format = format
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"🧭 Exporting traces to {self.path} ({self.format})")
+
+    def export(self, trace: Trace) -> None:
+        records = trace.to_records()
+        if self.format == "chrome":
+            lines = [json.dumps(event, ensure_ascii=False) + "," for event in chrome_events(records)]
+        else:
+            lines = [json.dumps(record, ensure_ascii=False) for record in records]
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                # Chrome accepts an unterminated JSON array, so events can be appended forever
+                if self.format == "chrome" and f.tell() == 0:
+                    f.write("[\n")
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ Trace export failed: {e}")
+
+
+def chrome_events(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Chrome trace 'complete' events, one timeline row per trace"""
+    return [{
+        "name": record["name"],
+        "cat": record["trace"],
+        "ph": "X",
+        "ts": int(record["start"] * 1_000_000),
+        "dur": int(record["duration_ms"] * 1000),
+        "pid": os.getpid(),
+        "tid": record["trace_id"],
+        "args": {**record["attrs"], "parent_trace_id": record["parent_trace_id"]}
+    } for record in records]
+
+
+_exporter: Optional[TraceExporter] = None
+
+
+def get_exporter() -> TraceExporter:
+    """Get the process-wide trace exporter"""
+    global _exporter
+    if _exporter is None or str(_exporter.path) != str(Path(settings.trace_export_path)) or _exporter.format != settings.trace_format:
+        _exporter = TraceExporter(settings.trace_export_path, settings.trace_format)
+    return _exporter
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Count, total and p50/p95 milliseconds per span name"""
+    durations: Dict[str, List[float]] = {}
+    for record in records:
+        durations.setdefault(record["name"], []).append(record["duration_ms"])
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {
+            "count": len(values),
+            "total_ms": round(sum(values), 3),
+            "p50_ms": values[len(values) // 2],
+            "p95_ms": values[min(len(values) - 1, int(0.95 * len(values)))]
+        }
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert or summarise a JSONL trace file")
+    parser.add_argument("trace_file", type=Path)
+    parser.add_argument("--chrome", type=Path, help="Write Chrome trace-event JSON to this path")
+    parser.add_argument("--summary", action="store_true", help="Print per-stage counts and latencies")
+    args = parser.parse_args()
+
+    with open(args.trace_file, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    if args.chrome:
+        args.chrome.write_text(json.dumps(chrome_events(records)), encoding="utf-8")
+        print(f"💾 {len(records)} spans written to {args.chrome}")
+    if args.summary or not args.chrome:
+        print(f"{'stage':<32} {'count':>7} {'total ms':>12} {'p50 ms':>10} {'p95 ms':>10}")
+        for name, stats in summarize(records).items():
+            print(f"{name:<32} {stats['count']:>7} {stats['total_ms']:>12.1f} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
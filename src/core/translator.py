@@ -1,56 +1,386 @@
 import asyncio
 import time
 import logging
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 from ..glossary.manager import GlossaryManager
 from ..memory.rag_search import RAGSearch
-from ..llm.client import LLMFactory
+from ..llm.client import LLMFactory, falls_back_per_item
+from ..llm.registry import get_registry
+from ..llm.batching import TranslationMicroBatcher
+from ..llm.resilience import get_dispatcher
+from ..llm.usage_ledger import usage_scope
 from ..api.models import TranslationResponse, TranslationRequest
 from ..glossary.models import GlossaryExtractionResult
-from ..memory.models import SearchResult
+from ..glossary.extraction_cache import get_extraction_cache
+from ..memory.models import SearchResult, TranslationMatch
 from ..core.config import settings
+from ..core.enrichment import EnrichmentPolicy
+from ..core.grammar_repair import GrammarRepairer
+from ..core.metrics import get_metrics
+from ..core.speculation import SpeculationPredictor
+from ..core.tracing import current_trace, span, start_trace
 from ..memory.models import TranslationMemoryEntry
 from ..memory.literal_search import LiteralDictionarySearch
+from ..memory.cascade import CascadeLookup
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MEMORY_LOOKUPS = get_metrics().counter("memory_lookups_total", "Translation memory lookups by reusable-match result", ["mode", "result"])
+GLOSSARY_MATCHES = get_metrics().histogram(
+    "glossary_matches_per_segment", "Glossary terms matched per segment", buckets=(0, 1, 2, 3, 5, 8, 13)
+)
+TRANSLATIONS = get_metrics().counter("translations_total", "Translations by where the text came from", ["source"])
+ENRICHMENT_DECISIONS = get_metrics().counter("enrichment_decisions_total", "Enrichment policy decisions by rule", ["rule"])
+GRAMMAR_CORRECTIONS = get_metrics().counter(
+    "grammar_corrections_total", "Grammar corrections after glossary substitution by method (rules, llm_fallback, llm)", ["language", "method"]
+)
+
 
 class TranslationOrchestrator:
     def __init__(self, llm_backend: str = "azure", memory_mode: str = "rag"):
         self.glossary_manager = GlossaryManager()
         self.rag_search = RAGSearch()
         self.literal_search = LiteralDictionarySearch()
+        self.cascade = CascadeLookup(self.literal_search, self.rag_search)
         self.llm_backend = llm_backend
         self.memory_mode = memory_mode
+        # Decides which enrichment stages (glossary, grammar correction...) run after memory lookup
+        self.enrichment_policy = EnrichmentPolicy()
+        # Local rules fix articles/elision around substituted terms; the LLM pass is only the fallback
+        self.grammar_repairer = GrammarRepairer() if settings.grammar_repair_enabled else None
         
         try:
-            self.llm_client = LLMFactory.create_client(
-                backend=llm_backend,
-                memory_mode=memory_mode,
-                glossary_manager=self.glossary_manager,
-                literal_search=self.literal_search,
-                rag_search=self.rag_search
-            )
+            if llm_backend == "mcp":
+                self.llm_client = LLMFactory.create_client(
+                    backend=llm_backend,
+                    memory_mode=memory_mode,
+                    glossary_manager=self.glossary_manager,
+                    literal_search=self.literal_search,
+                    rag_search=self.rag_search
+                )
+            else:
+                # Standard providers share one long-lived client per provider/deployment
+                self.llm_client = get_registry().get_client()
             logger.info("✅ LLM client initialized successfully (backend=%s)", llm_backend)
         except Exception as e:
             logger.warning("⚠️  LLM client initialization failed: %s", str(e))
             self.llm_client = None
+        
+        # Packed mode: concurrent short segments share one LLM request
+        self.packed_batcher = None
+        if settings.packed_translation and self.llm_client and llm_backend != "mcp":
+            self.packed_batcher = TranslationMicroBatcher(self.llm_client)
+            logger.info("📦 Packed translation enabled (max %d segments/request)", self.packed_batcher.max_items)
+        
+        # Speculative mode: likely memory misses start the LLM call alongside the lookup
+        self.speculation = None
+        if settings.speculative_llm_enabled and self.llm_client and llm_backend != "mcp":
+            self.speculation = SpeculationPredictor()
+            logger.info("🏁 Speculative LLM dispatch enabled (miss probability >= %.2f)", self.speculation.threshold)
+
+        # TM writes (SQLite insert, re-encoding, index save) run off the request's critical path,
+        # one at a time and in order
+        self._tm_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tm-writer")
+        self._pending_writes: Set[asyncio.Future] = set()
+        
+        get_metrics().register_collector("orchestrator", self._collect_metrics)
     
     async def translate(self, request: TranslationRequest) -> TranslationResponse:
         """Main translation orchestrator"""
+        with start_trace(
+            "translate",
+            force=request.include_stage_timings,
+            target_language=request.target_language,
+            memory_mode=request.memory_search_mode or "rag"
+        ), usage_scope(language=request.target_language):
+            if (
+                self.speculation is not None
+                and request.use_memory
+                and self.speculation.should_speculate(request.text, request.memory_search_mode or "rag")
+            ):
+                return await self._translate_speculative(request)
+            return await self._translate(request)
+    
+    async def translate_stream(self, request: TranslationRequest) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Translate one request as a stream of (event, data) pairs.
+        
+        Events:
+            context: memory and glossary matches, as soon as they are known
+            token: a chunk of the LLM translation as the provider streams it
+            done: the final TranslationResponse (after glossary and grammar post-processing)
+        
+        Memory reuse and the MCP backend produce no token events.
+        
+        The pipeline runs in its own task, which owns the trace and usage scope; this
+        generator only relays its events. A consumer that stops early (an SSE client
+        disconnecting) cancels the task, instead of leaving the scopes to be closed by
+        the async generator finalizer in another context.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        pipeline = asyncio.create_task(self._stream_pipeline(request, events))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            # Re-raises the pipeline's error, if any
+            await pipeline
+        finally:
+            if not pipeline.done():
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+    
+    async def _stream_pipeline(self, request: TranslationRequest, events: asyncio.Queue) -> None:
+        """translate_stream body: puts (event, data) pairs on the queue, then None"""
         start_time = time.time()
+        try:
+            with start_trace(
+                "translate_stream",
+                force=request.include_stage_timings,
+                target_language=request.target_language,
+                memory_mode=request.memory_search_mode or "rag"
+            ), usage_scope(language=request.target_language):
+                context = await self._gather_context(request)
+                memory_result, glossary_result = context
+                events.put_nowait(("context", self._match_payloads(glossary_result, memory_result)))
+                
+                llm_translation = None
+                if (
+                    self.llm_client
+                    and self.llm_backend != "mcp"
+                    and not self._reusable_memory_match(memory_result, request.memory_search_mode or "rag")[1]
+                ):
+                    chunks = []
+                    with span("llm_translate", streamed=True):
+                        async for chunk in self.llm_client.translate_stream(
+                            request.text,
+                            request.target_language,
+                            request.source_language,
+                            glossary_result.matches,
+                            memory_result.matches,
+                            request.domain
+                        ):
+                            chunks.append(chunk)
+                            events.put_nowait(("token", {"text": chunk}))
+                    llm_translation = "".join(chunks).strip()
+                
+                response = await self._translate(request, context=context, llm_translation=llm_translation)
+                response.processing_time = time.time() - start_time
+            events.put_nowait(("done", response.model_dump(mode="json")))
+        finally:
+            events.put_nowait(None)
+    
+    async def translate_fanout(
+        self,
+        request: TranslationRequest,
+        target_languages: List[str]
+    ) -> Dict[str, TranslationResponse]:
+        """
+        Translate one source segment into several target languages.
         
-        # More concise logging
-        logger.info("🔄 '%s' -> %s", request.text, request.target_language)        
+        Memory and glossary context is gathered per language, then every language that
+        still needs the LLM is translated in one multi-target request. Languages whose
+        output fails validation are translated individually.
+        
+        Args:
+            request: Translation request (its target_language is ignored)
+            target_languages: Target language codes
+            
+        Returns:
+            Dictionary mapping language -> TranslationResponse
+        """
+        # The ledger splits each multi-target call's tokens evenly across these languages
+        with start_trace("translate_fanout", force=request.include_stage_timings, target_languages=list(target_languages)), \
+                usage_scope(language=",".join(target_languages)):
+            return await self._translate_fanout(request, target_languages)
+    
+    async def _translate_fanout(
+        self,
+        request: TranslationRequest,
+        target_languages: List[str]
+    ) -> Dict[str, TranslationResponse]:
+        """translate_fanout body, run inside its trace"""
+        lang_requests = {
+            lang: request.model_copy(update={"target_language": lang})
+            for lang in dict.fromkeys(target_languages)
+        }
+        
+        if self.llm_backend == "mcp" or not self.llm_client or len(lang_requests) < 2:
+            responses = {}
+            for lang, lang_request in lang_requests.items():
+                with usage_scope(language=lang):
+                    responses[lang] = await self._translate(lang_request)
+            return responses
+        
+        # Step 1-2 for every language
+        contexts = {}
+        for lang, lang_request in lang_requests.items():
+            with usage_scope(language=lang):
+                contexts[lang] = await self._gather_context(lang_request)
+        
+        # Step 3: one LLM call for all languages without a reusable memory match
+        llm_targets = {
+            lang: (glossary_result.matches, memory_result.matches)
+            for lang, (memory_result, glossary_result) in contexts.items()
+            if not self._reusable_memory_match(memory_result, request.memory_search_mode or "rag")[1]
+        }
+        llm_translations = {}
+        if llm_targets:
+            try:
+                with span("llm_translate", languages=len(llm_targets)):
+                    llm_translations = await self.llm_client.translate_multi(
+                        request.text,
+                        llm_targets,
+                        request.source_language,
+                        request.domain
+                    )
+                logger.info("🌐 Fan-out: %d/%d languages in one request", len(llm_translations), len(llm_targets))
+            except Exception as e:
+                if not falls_back_per_item(e):
+                    raise
+                logger.warning("⚠️ Fan-out translation failed, translating per language: %s", str(e))
+        
+        responses = {}
+        for lang, lang_request in lang_requests.items():
+            with usage_scope(language=lang):
+                responses[lang] = await self._translate(
+                    lang_request,
+                    context=contexts[lang],
+                    llm_translation=llm_translations.get(lang)
+                )
+        return responses
+    
+    async def _gather_context(self, request: TranslationRequest) -> Tuple[SearchResult, GlossaryExtractionResult]:
+        """
+        Steps 1-2: search translation memory and extract glossary terms.
+        
+        The two steps only depend on each other through the memory hit's translation,
+        so they overlap: the memory lookup runs in a worker thread (embedding, FAISS and
+        fuzzy matching are CPU-bound) while known terms are recognized in the source text.
+        The enrichment policy then decides from the lookup result whether glossary terms
+        are needed at all; extraction is redone with the memory translation only when
+        there is a hit to use or LLM term discovery is on.
+        """
+        use_memory = request.use_memory and self.llm_backend != "mcp"
+        use_glossary = request.use_glossary and self.llm_backend != "mcp"
+        search_mode = request.memory_search_mode or "rag"  # default to rag
         
         # Step 1: Search translation memory
+        memory_task = None
         memory_result = SearchResult()
-        if request.use_memory and self.llm_backend != "mcp":
-            
-            search_mode = request.memory_search_mode or "rag"  # default to rag
+        if use_memory:
+            if search_mode == "literal":
+                # A dictionary lookup is cheaper than a thread hop
+                memory_result = self._search_memory(request, search_mode)
+            else:
+                memory_task = asyncio.create_task(asyncio.to_thread(self._search_memory, request, search_mode))
+        
+        # Step 2: Recognize known glossary terms in the source text while the lookup runs
+        recognized = None
+        try:
+            if use_glossary and memory_task is not None:
+                with span("glossary_extraction", concurrent=True):
+                    recognized = await self.glossary_manager.extract_terms(
+                        request.text, "", request.target_language, discover=False
+                    )
+            if memory_task is not None:
+                memory_result = await memory_task
+        finally:
+            if memory_task is not None and not memory_task.done():
+                memory_task.cancel()
+        
+        best_memory_match, reuse_memory = self._reusable_memory_match(memory_result, search_mode)
+        if use_memory:
+            MEMORY_LOOKUPS.inc(mode=search_mode, result="hit" if reuse_memory else "miss")
+            if self.speculation is not None:
+                self.speculation.observe(request.text, search_mode, reuse_memory)
+        
+        glossary_result = GlossaryExtractionResult()
+        decision = self.enrichment_policy.decide(search_mode, memory_result)
+        if use_glossary and decision.glossary:
+            # A reused memory translation shows how each term was rendered, and is the
+            # hint for LLM term discovery, so extraction waits for the lookup in those cases
+            if recognized is None or reuse_memory or decision.term_discovery:
+                translation_so_far = best_memory_match.target_text if reuse_memory else ""
+                with span("glossary_extraction"):
+                    glossary_result = await self.glossary_manager.extract_terms(
+                        request.text,
+                        translation_so_far,
+                        request.target_language,
+                        discover=decision.term_discovery
+                    )
+            else:
+                glossary_result = recognized
             
+            logger.info("📚 Glossary matches found: %d", len(glossary_result.matches))
+            GLOSSARY_MATCHES.observe(len(glossary_result.matches))
+        
+        return memory_result, glossary_result
+    
+    async def _translate_speculative(self, request: TranslationRequest) -> TranslationResponse:
+        """Run the LLM call alongside memory lookup, cancelling it if memory has a reusable match"""
+        # Only the source-side glossary terms are known this early; memory matches are not
+        glossary_matches = []
+        if request.use_glossary:
+            glossary_matches = self.glossary_manager.recognize_terms(request.text, None, request.target_language).matches
+        llm_task = asyncio.create_task(self._speculative_llm_call(request, glossary_matches))
+        try:
+            context = await self._gather_context(request)
+        except BaseException:
+            await self._discard_speculation(llm_task)
+            raise
+        
+        _, reuse_memory = self._reusable_memory_match(context[0], request.memory_search_mode or "rag")
+        if reuse_memory:
+            if llm_task.done():
+                self.speculation.record_outcome("failed" if llm_task.cancelled() or llm_task.exception() else "wasted")
+            else:
+                await self._discard_speculation(llm_task)
+                self.speculation.record_outcome("cancelled")
+            logger.info("🏁 Memory hit - speculative LLM call discarded")
+            return await self._translate(request, context=context)
+        
+        try:
+            llm_translation = await llm_task
+            self.speculation.record_outcome("used")
+        except Exception as e:
+            logger.warning("⚠️ Speculative LLM call failed, translating normally: %s", str(e))
+            self.speculation.record_outcome("failed")
+            llm_translation = None
+        return await self._translate(request, context=context, llm_translation=llm_translation)
+    
+    @staticmethod
+    async def _discard_speculation(llm_task: asyncio.Task) -> None:
+        """
+        Cancel a speculative LLM call and wait for it to unwind.
+
+        The dispatcher releases a half-open circuit probe and records the cancelled
+        attempt in the usage ledger while the task unwinds; waiting makes both happen
+        before the request moves on.
+        """
+        llm_task.cancel()
+        await asyncio.gather(llm_task, return_exceptions=True)
+    
+    async def _speculative_llm_call(self, request: TranslationRequest, glossary_matches: list) -> str:
+        # Own purpose, so the ledger shows what speculation costs (cancelled calls included)
+        with span("llm_translate", speculative=True), usage_scope(purpose="speculative_translate"):
+            return await self.llm_client.translate(
+                request.text,
+                request.target_language,
+                request.source_language,
+                glossary_matches,
+                [],
+                request.domain
+            )
+    
+    def _search_memory(self, request: TranslationRequest, search_mode: str) -> SearchResult:
+        """Step 1 for one search mode (runs in a worker thread except for literal lookups)"""
+        with span("memory_lookup", mode=search_mode):
             if search_mode == "literal":
                 memory_result = self.literal_search.search_literal(
                     request.text,
@@ -59,6 +389,13 @@ class TranslationOrchestrator:
                 )
                 logger.info("📖 Literal dictionary matches: %d", len(memory_result.matches))
                 logger.info("memory_result.matches: %s", memory_result.matches)
+            elif search_mode == "cascade":
+                memory_result = self.cascade.lookup(
+                    request.text,
+                    request.target_language,
+                    request.source_language
+                )
+                logger.info("🪜 Cascade matches: %d (tier=%s)", len(memory_result.matches), memory_result.tier)
             else:  # rag mode
                 memory_result = self.rag_search.search_similar(
                     request.text,
@@ -66,27 +403,41 @@ class TranslationOrchestrator:
                     request.source_language
                 )
                 logger.info("🧠 RAG semantic matches: %d", len(memory_result.matches))
-          
-                
-
-        # Step 2: Extract glossary terms
-        glossary_result = GlossaryExtractionResult()
-        if request.use_glossary and self.llm_backend != "mcp":
-            # Always use LLM-based extraction with no fallback to traditional extraction
-            translation_so_far = ""
-
-            # Use the already-fetched memory result for term extraction
-            if memory_result.matches and memory_result.matches[0].similarity_score > 0.9:
-                translation_so_far = memory_result.matches[0].target_text
-
-            # Extract terms from english sentence using LLM provided the translation of that sentence
-            glossary_result = await self.glossary_manager.extract_terms(
-                request.text,
-                translation_so_far,
-                request.target_language
-            )
-
-            logger.info("📚 Glossary matches found: %d", len(glossary_result.matches))
+        return memory_result
+    
+    @staticmethod
+    def _reusable_memory_match(memory_result: SearchResult, search_mode: str) -> Tuple[Optional[TranslationMatch], bool]:
+        """
+        Best memory match, and whether it is reused.
+        
+        In cascade mode only a match accepted by a tier is reused, so the per-tier
+        thresholds decide; below-threshold candidates are LLM context. Other modes
+        reuse a match scoring above 0.9.
+        """
+        best_memory_match = max(memory_result.matches, key=lambda x: x.similarity_score) if memory_result.matches else None
+        if best_memory_match is None:
+            return None, False
+        if search_mode == "cascade":
+            return best_memory_match, memory_result.tier is not None
+        return best_memory_match, best_memory_match.similarity_score > 0.9
+    
+    async def _translate(
+        self,
+        request: TranslationRequest,
+        context: Optional[Tuple[SearchResult, GlossaryExtractionResult]] = None,
+        llm_translation: Optional[str] = None
+    ) -> TranslationResponse:
+        """Translate one request, optionally with pre-gathered context and a pre-computed LLM translation"""
+        start_time = time.time()
+        
+        # More concise logging
+        logger.info("🔄 '%s' -> %s", request.text, request.target_language)        
+        
+        if context is None:
+            context = await self._gather_context(request)
+        memory_result, glossary_result = context
+        best_memory_match, reuse_memory = self._reusable_memory_match(memory_result, request.memory_search_mode or "rag")
+        decision = self.enrichment_policy.decide(request.memory_search_mode or "rag", memory_result)
 
         # Step 3: Get translation
         translation = ""
@@ -94,14 +445,15 @@ class TranslationOrchestrator:
         translation_source = "unknown"  # Track actual source used
         if self.llm_client:
             if self.llm_backend == "mcp":
-                mcp_result = await self.llm_client.translate(
-                    request.text,
-                    request.target_language,
-                    request.source_language,
-                    glossary_result.matches,
-                    memory_result.matches,
-                    request.domain
-                )
+                with span("llm_translate", backend="mcp"):
+                    mcp_result = await self.llm_client.translate(
+                        request.text,
+                        request.target_language,
+                        request.source_language,
+                        glossary_result.matches,
+                        memory_result.matches,
+                        request.domain
+                    )
 
                 # MCP returns dict with metadata
                 if isinstance(mcp_result, dict):
@@ -128,42 +480,49 @@ class TranslationOrchestrator:
                 logger.info("✅ MCP Translation: '%s'", translation)
                 
                 # MCP handles its own memory, but we still add to literal dictionary for future use
-                if request.memory_search_mode == "literal":
-                    self.literal_search.add_translation(
-                        source_text=request.text,
-                        target_text=translation,
-                        target_language=request.target_language,
-                        metadata=request.metadata
-                    )
-                elif request.memory_search_mode == "rag":
-                    # Store MCP translation to RAG for future reference
-                    entry = TranslationMemoryEntry(
-                        source_text=request.text,
-                        target_text=translation,
-                        source_language=request.source_language,
-                        target_language=request.target_language,
-                        confidence=0.95,
-                        metadata={"source": "mcp"}
-                    )
-                    self.rag_search.add_and_update_index(entry)
+                with span("memory_store"):
+                    if request.memory_search_mode == "literal":
+                        self.literal_search.add_translation(
+                            source_text=request.text,
+                            target_text=translation,
+                            target_language=request.target_language,
+                            metadata=request.metadata
+                        )
+                    elif request.memory_search_mode == "rag":
+                        # Store MCP translation to RAG for future reference
+                        entry = TranslationMemoryEntry(
+                            source_text=request.text,
+                            target_text=translation,
+                            source_language=request.source_language,
+                            target_language=request.target_language,
+                            confidence=0.95,
+                            metadata={"source": "mcp"}
+                        )
+                        self._persist(self.rag_search.add_and_update_index, entry)
                     
             else: # standard Azure LLM
                 if memory_result.matches:
         
-                    best_match = max(memory_result.matches, key=lambda x: x.similarity_score)
-                    if best_match.similarity_score > 0.9:
+                    best_match = best_memory_match
+                    if reuse_memory:
                     
                         translation = best_match.target_text
                         original_translation = translation
                         # Set source based on memory mode
                         if request.memory_search_mode == "literal":
                             translation_source = "Using Literal Dictionary"
+                        elif request.memory_search_mode == "cascade":
+                            translation_source = f"Using Cascade ({memory_result.tier})"
                         else:
                             translation_source = "Using RAG=Similar translation used"
 
                         # Apply glossary terms to the translation
-                        if glossary_result and glossary_result.matches:
-                            translation = await self._apply_glossary_terms(translation, glossary_result)
+                        if decision.glossary_apply and glossary_result and glossary_result.matches:
+                            with span("glossary_apply"):
+                                translation = await self._apply_glossary_terms(
+                                    translation, glossary_result, request.target_language,
+                                    correct_grammar=decision.grammar_correction
+                                )
 
                             # Check if translation was modified
                             if translation != original_translation:
@@ -183,7 +542,8 @@ class TranslationOrchestrator:
                                         "glossary_terms_applied": len(glossary_result.matches)
                                     }
                                 )
-                                self.rag_search.add_and_update_index(corrected_entry)
+                                with span("memory_store"):
+                                    self._persist(self.rag_search.add_and_update_index, corrected_entry)
                                 logger.debug("🔄 Updated RAG with corrected translation")
 
                     else: # mean there is no match found from RAG similar search
@@ -195,54 +555,103 @@ class TranslationOrchestrator:
                     translation = None
                 # If we don't have a translation yet (no RAG match or low confidence), use LLM
                 if translation is None:
-                    translation = await self.llm_client.translate(
-                        request.text,
-                        request.target_language,
-                        request.source_language,
-                        glossary_result.matches,
-                        memory_result.matches,
-                        request.domain
-                    )
+                    llm_start = time.perf_counter()
+                    if llm_translation is not None:
+                        # Already translated by a multi-target fan-out request or a stream
+                        translation = llm_translation
+                    else:
+                        use_packed = self.packed_batcher is not None and self.packed_batcher.accepts(request.text)
+                        llm_translate = self.packed_batcher.translate if use_packed else self.llm_client.translate
+                        with span("llm_translate", packed=use_packed):
+                            translation = await llm_translate(
+                                request.text,
+                                request.target_language,
+                                request.source_language,
+                                glossary_result.matches,
+                                memory_result.matches,
+                                request.domain
+                            )
                     logger.info("✅ LLM: '%s'", translation)
                     translation_source = settings.llm_provider
                     
-                    # If using literal mode, add to dictionary immediately
-                    if request.memory_search_mode == "literal":
-                        self.literal_search.add_translation(
-                            source_text=request.text,
-                            target_text=translation,
-                            target_language=request.target_language,
-                            metadata=request.metadata
-                        )
-                    # Only store to database if using RAG mode
-                    if request.memory_search_mode == "rag":
-                        self._store_llm_translation(request, translation, glossary_result, memory_result)       
+                    if request.memory_search_mode == "cascade":
+                        # The LLM is the cascade's terminal tier
+                        self.cascade.record(CascadeLookup.TERMINAL_TIER, time.perf_counter() - llm_start)
+                    
+                    with span("memory_store"):
+                        # If using literal or cascade mode, add to dictionary immediately
+                        if request.memory_search_mode in ("literal", "cascade"):
+                            self.literal_search.add_translation(
+                                source_text=request.text,
+                                target_text=translation,
+                                target_language=request.target_language,
+                                metadata=request.metadata
+                            )
+                        # Only store to database if using RAG or cascade mode
+                        if request.memory_search_mode in ("rag", "cascade"):
+                            self._persist(self._store_llm_translation, request, translation, glossary_result, memory_result)       
+
+        if translation:
+            TRANSLATIONS.inc(source="mcp" if self.llm_backend == "mcp" else "memory" if reuse_memory else "llm")
 
         # Calculate confidence
         confidence = self._calculate_confidence(glossary_result, memory_result)
         
         processing_time = time.time() - start_time
+        trace = current_trace()
+        metadata = {}
+        if self.llm_backend != "mcp":
+            ENRICHMENT_DECISIONS.inc(rule=decision.rule)
+            metadata["enrichment"] = {**decision.model_dump(), "skipped": decision.skipped}
         
         return TranslationResponse(
             translation=translation,
             source_text=request.text,
             target_language=request.target_language,
-            glossary_matches=[{
+            **self._match_payloads(glossary_result, memory_result),
+            confidence=confidence,
+            model_used=translation_source,
+            processing_time=processing_time,
+            stage_timings=trace.stage_timings() if trace and request.include_stage_timings else None,
+            metadata=metadata
+        )
+    
+    def _persist(self, write: Callable[..., Any], *args) -> None:
+        """Run a TM write in the background writer thread (inline when BACKGROUND_TM_WRITES is off)"""
+        if not settings.background_tm_writes:
+            write(*args)
+            return
+        future = asyncio.get_running_loop().run_in_executor(self._tm_writer, write, *args)
+        self._pending_writes.add(future)
+        future.add_done_callback(self._write_done)
+    
+    def _write_done(self, future: asyncio.Future) -> None:
+        self._pending_writes.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("⚠️ Background TM write failed: %s", str(future.exception()))
+    
+    async def flush_writes(self) -> None:
+        """Wait for background TM writes to finish (call before exiting or reading the TM back)"""
+        while self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
+    
+    @staticmethod
+    def _match_payloads(glossary_result: GlossaryExtractionResult, memory_result: SearchResult) -> Dict[str, List[Dict[str, Any]]]:
+        """Glossary and memory matches in the TranslationResponse format"""
+        return {
+            "glossary_matches": [{
                 "term": m.term,
                 "translation": m.prefered_translation,
                 "confidence": m.confidence,
                 "notes": m.notes
             } for m in glossary_result.matches],
-            memory_matches=[{
+            "memory_matches": [{
                 "source_text": m.source_text,
                 "target_text": m.target_text,
                 "similarity_score": m.similarity_score,
                 "confidence": m.confidence
-            } for m in memory_result.matches],
-            confidence=confidence,
-            model_used=translation_source,
-            processing_time=processing_time
-        )
+            } for m in memory_result.matches]
+        }
     
     def _store_llm_translation(
         self,
@@ -285,8 +694,14 @@ class TranslationOrchestrator:
         except Exception as e:
             logger.warning("⚠️ RAG store failed: %s", str(e))
     
-    async def _apply_glossary_terms(self, translation: str, glossary_result: GlossaryExtractionResult) -> str:
-        """Apply glossary term replacements to translation"""
+    async def _apply_glossary_terms(
+        self,
+        translation: str,
+        glossary_result: GlossaryExtractionResult,
+        target_language: str,
+        correct_grammar: bool = True
+    ) -> str:
+        """Apply glossary term replacements to translation, then (optionally) correct the grammar around them"""
         corrected_translation = translation
         replacements_made = []
         
@@ -301,6 +716,10 @@ class TranslationOrchestrator:
             term = match.term
             preferred = match.prefered_translation
             original_translation = match.original_translation
+            
+            # Nothing to replace when the term's rendering in the translation is unknown
+            if not original_translation:
+                continue
            
             # Use word boundaries to avoid partial replacements
             pattern = re.compile(r'\b' + re.escape(original_translation.lower()) + r'\b', re.IGNORECASE)
@@ -316,7 +735,9 @@ class TranslationOrchestrator:
                     replacements_made.append({
                         'term': term,
                         'from': term,
-                        'to': preferred
+                        'to': preferred,
+                        'rendering': original_translation,
+                        'notes': match.notes
                     })
         
         # If replacements were made, log them and perform grammar correction
@@ -325,11 +746,25 @@ class TranslationOrchestrator:
             logger.info("📝 Glossary applied: '%s' → '%s'", 
                         translation[:100] + "..." if len(translation) > 100 else translation,
                         corrected_translation[:100] + "..." if len(corrected_translation) > 100 else corrected_translation)
-            corrected_translation = await self._correct_grammar(corrected_translation, replacements_made)
+        if replacements_made and correct_grammar:
+            method = "llm"
+            if self.grammar_repairer:
+                with span("grammar_repair", replacements=len(replacements_made)):
+                    repaired = self.grammar_repairer.repair(corrected_translation, replacements_made, target_language)
+                corrected_translation = repaired.text
+                if repaired.fixes:
+                    logger.info("🔧 Grammar repaired by rules (confidence %.2f): %s", repaired.confidence, "; ".join(repaired.fixes))
+                method = "rules" if repaired.confidence >= settings.grammar_repair_min_confidence else "llm_fallback"
+            GRAMMAR_CORRECTIONS.inc(language=target_language, method=method)
+            if method != "rules":
+                with span("grammar_correction", replacements=len(replacements_made)), usage_scope(purpose="grammar_correction"):
+                    corrected_translation = await self._correct_grammar(
+                        corrected_translation, replacements_made, target_language
+                    )
             
         return corrected_translation
         
-    async def _correct_grammar(self, text: str, replacements_made: list) -> str:
+    async def _correct_grammar(self, text: str, replacements_made: list, target_language: str) -> str:
         """Correct grammar issues that might arise from term replacements"""
         # Skip if no LLM client available or no replacements were made
         if not hasattr(self, 'llm_client') or not replacements_made:
@@ -349,8 +784,8 @@ class TranslationOrchestrator:
 
             corrected_text = await self.llm_client.translate(
                 text=correction_prompt,
-                target_language="fr",
-                source_language="fr"
+                target_language=target_language,
+                source_language=target_language
             )
             if corrected_text and 0.9 <= len(corrected_text) / len(text) <= 1.1:
                 return corrected_text
@@ -397,11 +832,11 @@ class TranslationOrchestrator:
         # Test glossary
         try:
             test_text = "The cloud server and database connection failed"
-            glossary_result = self.glossary_manager.extract_terms(test_text, "fr")
+            glossary_result = self.glossary_manager.recognize_terms(test_text, target_language="fr")
             results["glossary"] = {
                 "status": "✅ Working",
                 "terms_found": len(glossary_result.matches),
-                "sample_matches": [{"term": m.term, "translation": m.translation} for m in glossary_result.matches[:3]]
+                "sample_matches": [{"term": m.term, "translation": m.prefered_translation} for m in glossary_result.matches[:3]]
             }
         except Exception as e:
             results["glossary"] = {"status": "❌ Failed", "error": str(e)}
@@ -448,6 +883,34 @@ class TranslationOrchestrator:
         
         return results
     
+    def _collect_metrics(self, registry) -> None:
+        """Scrape-time gauges for index sizes, queue depths and cache ratios"""
+        registry.gauge("rag_index_size", "Vectors in the RAG FAISS index").set(
+            self.rag_search.index.ntotal if self.rag_search.index else 0
+        )
+        registry.gauge("literal_dictionary_size", "Entries in the literal dictionary", ["scope"]).set(
+            len(self.literal_search.global_dictionary), scope="global"
+        )
+        registry.gauge("literal_dictionary_size", "Entries in the literal dictionary", ["scope"]).set(
+            len(self.literal_search.dictionary), scope="file"
+        )
+        if self.packed_batcher:
+            registry.gauge("packed_batcher_pending", "Segments waiting to be packed into an LLM request").set(
+                sum(len(batch) for batch in self.packed_batcher._pending.values())
+            )
+        registry.gauge("tm_pending_writes", "TM writes queued for the background writer").set(len(self._pending_writes))
+        cache = get_extraction_cache()
+        lookups = cache.hits + cache.misses
+        registry.gauge("term_extraction_cache_hit_ratio", "Term extraction cache hit ratio").set(
+            cache.hits / lookups if lookups else 0.0
+        )
+        pool = getattr(self.llm_client, "pool", None)
+        if pool:
+            outstanding = registry.gauge("azure_pool_outstanding", "Requests in flight per pooled Azure deployment", ["deployment"])
+            outstanding.clear()
+            for deployment in pool.deployments:
+                outstanding.set(deployment.outstanding, deployment=deployment.key)
+
     def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
         try:
@@ -460,6 +923,13 @@ class TranslationOrchestrator:
                     "total_entries": len(self.rag_search.tm_manager.get_all_entries()),
                     "index_size": self.rag_search.get_stats()["index_size"]
                 },
+                "cascade": self.cascade.get_stats(),
+                "term_extraction_cache": get_extraction_cache().get_stats(),
+                "packed_translation": self.packed_batcher.get_stats() if self.packed_batcher else None,
+                "speculation": self.speculation.get_stats() if self.speculation else None,
+                "llm_resilience": get_dispatcher().get_stats(),
+                "azure_pool": getattr(self.llm_client, "pool", None) and self.llm_client.pool.get_stats(),
+                "prompt_tokens": self.llm_client.prompt_builder.get_stats() if hasattr(self.llm_client, "prompt_builder") else None,
                 "llm": {
                     "provider": settings.llm_provider,
                     "model": settings.model_name,
@@ -0,0 +1,247 @@
+"""
+Persistent memoization of LLM term-extraction results.
+
+Term extraction is called with the same (text, translation, target_language)
+arguments over and over - across runs, across languages and from the builder,
+the orchestrator and the MCP client. Parsed term lists are cached on disk in
+SQLite, keyed by a hash of the arguments, the prompt version and the model.
+"""
+import json
+import hashlib
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from ..core.config import settings
+from ..core.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = get_metrics().counter("term_extraction_cache_lookups_total", "Term extraction cache lookups", ["result"])
+
+
+def parse_term_list(json_response: str) -> List[Dict[str, Any]]:
+    """
+    Parse an LLM term-extraction response into a list of term dicts.
+
+    Strips markdown code fences and any text around the JSON array.
+
+    Raises:
+        json.JSONDecodeError: If the response does not contain a valid JSON array
+    """
+    json_text = (json_response or "").strip()
+
+    # Handle various markdown code block formats
+    if json_text.startswith('```json'):
+        json_text = json_text[7:]
+    elif json_text.startswith('```'):
+        json_text = json_text[3:]
+    if json_text.endswith('```'):
+        json_text = json_text[:-3]
+
+    # Remove any non-JSON text before the array start and after array end
+    start_idx = json_text.find('[')
+    if start_idx >= 0:
+        end_idx = json_text.rfind(']')
+        if end_idx > start_idx:
+            json_text = json_text[start_idx:end_idx + 1]
+
+    json_text = json_text.strip()
+    if not json_text or json_text == "[]":
+        return []
+
+    terms = json.loads(json_text)
+    if not isinstance(terms, list):
+        raise json.JSONDecodeError("Expected a JSON array of terms", json_text, 0)
+    return [item for item in terms if isinstance(item, dict) and item.get("term")]
+
+
+def describe_model(llm_client) -> str:
+    """Identify the deployment/model behind an LLM client for cache keys"""
+    for attr in ("deployment_name", "model", "model_name"):
+        value = getattr(llm_client, attr, None)
+        if value:
+            return f"{type(llm_client).__name__}:{value}"
+    return type(llm_client).__name__
+
+
+class TermExtractionCache:
+    """SQLite-backed cache of parsed term-extraction results with hit/miss counters"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or settings.term_extraction_cache_path
+        self.hits = 0
+        self.misses = 0
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize the cache database"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS term_extraction_cache (
+                key TEXT PRIMARY KEY,
+                terms TEXT NOT NULL,
+                prompt_version TEXT,
+                model TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(
+        text: str,
+        translation: Optional[str],
+        target_language: str,
+        prompt_version: str,
+        model: str
+    ) -> str:
+        """
+        Build the cache key for an extraction call.
+
+        The source-only prompt does not depend on the target language, so its key
+        ignores it and the result is shared across languages.
+        """
+        language = target_language if translation else "*"
+        payload = json.dumps([text, translation or "", language, prompt_version, model], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a cached term list, or None if not cached"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT terms FROM term_extraction_cache WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        conn.close()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, terms: List[Dict[str, Any]], prompt_version: str = None, model: str = None) -> None:
+        """Store a parsed term list"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO term_extraction_cache (key, terms, prompt_version, model)
+            VALUES (?, ?, ?, ?)
+        ''', (key, json.dumps(terms, ensure_ascii=False), prompt_version, model))
+        conn.commit()
+        conn.close()
+
+    async def get_or_extract(
+        self,
+        text: str,
+        translation: Optional[str],
+        target_language: str,
+        extract: Callable[[], Awaitable[str]],
+        prompt_version: str,
+        model: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the cached term list for these arguments, calling the LLM on a miss.
+
+        Args:
+            text: Source text
+            translation: Optional translation given to the extractor
+            target_language: Target language code
+            extract: Coroutine factory returning the raw LLM response
+            prompt_version: Version of the extraction prompt
+            model: Deployment/model identifier (see describe_model)
+
+        Returns:
+            Parsed list of term dicts
+
+        Raises:
+            json.JSONDecodeError: If the LLM response cannot be parsed (nothing is cached)
+        """
+        key = self.make_key(text, translation, target_language, prompt_version, model)
+
+        if settings.term_extraction_cache_enabled:
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                CACHE_LOOKUPS.inc(result="hit")
+                logger.debug(f"💾 Term extraction cache hit: '{text[:50]}'")
+                return cached
+
+        self.misses += 1
+        CACHE_LOOKUPS.inc(result="miss")
+        terms = parse_term_list(await extract())
+
+        if settings.term_extraction_cache_enabled:
+            self.put(key, terms, prompt_version, model)
+        return terms
+
+    async def get_or_extract_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str]]],
+        target_language: str,
+        extract_batch: Callable[[List[Tuple[str, str, Optional[str]]]], Awaitable[Dict[str, List[Dict[str, Any]]]]],
+        prompt_version: str,
+        model: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Batch version of get_or_extract: only the cache misses are sent to the LLM.
+
+        Args:
+            items: List of (id, source_text, optional translation) tuples
+            target_language: Target language code
+            extract_batch: Coroutine function taking the missing items and returning id -> term list
+            prompt_version: Version of the extraction prompt
+            model: Deployment/model identifier (see describe_model)
+
+        Returns:
+            Dictionary mapping item id -> parsed list of term dicts (items the LLM could not handle are omitted)
+        """
+        results = {}
+        missing = []
+        keys = {}
+        for item_id, text, translation in items:
+            key = self.make_key(text, translation, target_language, prompt_version, model)
+            keys[item_id] = key
+            cached = self.get(key) if settings.term_extraction_cache_enabled else None
+            if cached is not None:
+                results[item_id] = cached
+                self.hits += 1
+                CACHE_LOOKUPS.inc(result="hit")
+            else:
+                missing.append((item_id, text, translation))
+                self.misses += 1
+                CACHE_LOOKUPS.inc(result="miss")
+
+        if missing:
+            logger.info(f"💾 Term extraction cache: {len(results)} hits, extracting {len(missing)} item(s)")
+            extracted = await extract_batch(missing)
+            for item_id, terms in extracted.items():
+                results[item_id] = terms
+                if settings.term_extraction_cache_enabled:
+                    self.put(keys[item_id], terms, prompt_version, model)
+        return results
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss counters and size"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM term_extraction_cache")
+        size = cursor.fetchone()[0]
+        conn.close()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": size
+        }
+
+
+_cache: Optional[TermExtractionCache] = None
+
+
+def get_extraction_cache() -> TermExtractionCache:
+    """Get the process-wide term extraction cache"""
+    global _cache
+    if _cache is None:
+        _cache = TermExtractionCache()
+    return _cache
@@ -1,16 +1,30 @@
 import re
 import json
 import sqlite3
+import time
 from typing import List, Optional, Dict
 from pathlib import Path
 from .models import GlossaryEntry, GlossaryMatch, GlossaryExtractionResult
+from .recognizer import GlossaryTermRecognizer
 from ..core.config import settings
-from ..llm.client import LLMFactory
+from ..core.tracing import span
+from ..llm.client import EXTRACTION_PROMPT_VERSION
+from ..llm.registry import get_registry
+from .extraction_cache import get_extraction_cache, describe_model
 import json
 import logging
 class GlossaryManager:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or settings.database_url.replace("sqlite:///", "")
+        # In-memory term index per language: {target_language: {term.lower(): GlossaryEntry}}
+        self._term_index: Dict[str, Dict[str, GlossaryEntry]] = {}
+        # Glossary generation each language index was built from
+        self._index_generation: Dict[str, int] = {}
+        # Last generation read from the database, and when (time.monotonic())
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        # Aho-Corasick term recognizer per language, rebuilt together with the index
+        self._recognizers: Dict[str, GlossaryTermRecognizer] = {}
         self._init_database()
         self._load_initial_data()
     
@@ -53,6 +67,24 @@ class GlossaryManager:
             cursor.execute("SELECT occurrence_count FROM glossary LIMIT 1")
         except sqlite3.OperationalError:
             cursor.execute("ALTER TABLE glossary ADD COLUMN occurrence_count INTEGER DEFAULT 0")
+        
+        # Generation counter bumped by triggers on every glossary write, so in-memory
+        # indexes notice changes made by any connection or process (e.g. the builder)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS glossary_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO glossary_meta (key, value) VALUES ('generation', 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS glossary_generation_{event.lower()}
+                AFTER {event} ON glossary
+                BEGIN
+                    UPDATE glossary_meta SET value = value + 1 WHERE key = 'generation';
+                END
+            ''')
             
         conn.commit()
         conn.close()
@@ -104,6 +136,7 @@ class GlossaryManager:
         
         entry_id = cursor.lastrowid
         conn.commit()
+        self._note_write(cursor)
         conn.close()
         
         return entry_id
@@ -135,9 +168,137 @@ class GlossaryManager:
             for row in rows
         ]
     
+    def get_generation(self) -> int:
+        """
+        Get the glossary generation counter (bumped on every write to the glossary table).
+        
+        Recognition asks for it on every segment, so the database is read at most once
+        per GLOSSARY_GENERATION_CHECK_MS; writes made through this manager update the
+        cached value immediately, writes from other processes are seen within that interval.
+        """
+        now = time.monotonic()
+        if self._generation is None or (now - self._generation_checked_at) * 1000 >= settings.glossary_generation_check_ms:
+            conn = sqlite3.connect(self.db_path)
+            self._generation = self._read_generation(conn.cursor())
+            self._generation_checked_at = now
+            conn.close()
+        return self._generation
+    
+    @staticmethod
+    def _read_generation(cursor: sqlite3.Cursor) -> int:
+        cursor.execute("SELECT value FROM glossary_meta WHERE key = 'generation'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    def _note_write(self, cursor: sqlite3.Cursor) -> None:
+        """Refresh the cached generation after this manager committed a glossary write"""
+        self._generation = self._read_generation(cursor)
+        self._generation_checked_at = time.monotonic()
+    
+    def get_term_index(self, target_language: str = "fr") -> Dict[str, GlossaryEntry]:
+        """
+        Get the in-memory term index for a target language.
+        
+        The index maps lowercased term -> GlossaryEntry and is rebuilt only when the
+        glossary generation has changed since it was last built.
+        
+        Args:
+            target_language: Target language code (default: 'fr')
+            
+        Returns:
+            Dictionary of lowercased term -> GlossaryEntry
+        """
+        generation = self.get_generation()
+        if self._index_generation.get(target_language) != generation:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT term, preferred_translation, target_language, notes, domain, translation, occurrence_count
+                FROM glossary
+                WHERE target_language = ?
+            ''', (target_language,))
+            rows = cursor.fetchall()
+            conn.close()
+            
+            index = {}
+            for row in rows:
+                entry = GlossaryEntry(
+                    term=row[0],
+                    preferred_translation=row[1],
+                    target_language=row[2],
+                    notes=row[3],
+                    domain=row[4],
+                    translation=row[5] or row[1],  # Raw (possibly non-preferred) rendering, used to spot it in existing translations
+                    occurrence_count=row[6] or 0
+                )
+                # Keep the first row for a term, matching the previous linear scan
+                index.setdefault(entry.term.lower(), entry)
+            self._term_index[target_language] = index
+            self._recognizers[target_language] = GlossaryTermRecognizer(index.values())
+            self._index_generation[target_language] = generation
+            logging.debug("🔁 Rebuilt glossary index for %s: %d terms (generation %d)", target_language, len(index), generation)
+        
+        return self._term_index[target_language]
+    
+    def get_recognizer(self, target_language: str = "fr") -> GlossaryTermRecognizer:
+        """Get the Aho-Corasick term recognizer for a target language (rebuilt with the term index)"""
+        self.get_term_index(target_language)
+        return self._recognizers[target_language]
+    
+    def recognize_terms(self, text: str, translation: str = None, target_language: str = "fr") -> GlossaryExtractionResult:
+        """
+        Find known glossary terms in text locally, without an LLM call.
+        
+        Args:
+            text: Source text to scan
+            translation: Optional existing translation, used to report how each term was rendered
+            target_language: Target language code (default: 'fr')
+        Returns:
+            GlossaryExtractionResult with longest, non-overlapping glossary matches
+        """
+        result = self.get_recognizer(target_language).match(text, translation)
+        logging.debug("📚 Recognized %d glossary terms locally: %s", len(result.matches), result.terms_found)
+        return result
+    
+    def get_entry(self, term: str, target_language: str = "fr") -> Optional[GlossaryEntry]:
+        """Look up a single glossary entry by term (case-insensitive)"""
+        return self.get_term_index(target_language).get(term.strip().lower())
+    
     # Traditional pattern-matching extraction method removed in favor of LLM-based approach
         
-    async def extract_terms(self, text: str, translation: str = None, target_language: str = "fr") -> GlossaryExtractionResult:
+    async def extract_terms(self, text: str, translation: str = None, target_language: str = "fr", discover: bool = None) -> GlossaryExtractionResult:
+        """Extract glossary terms from input text
+        
+        Known glossary terms are always recognized locally. The LLM extractor only runs in
+        "discover new terms" mode, and its terms are added after the recognized ones.
+        
+        Args:
+            text: Source text to extract terms from
+            translation: Optional translated text to help with term extraction
+            target_language: Target language code (default: 'fr')
+            discover: Also ask the LLM for new terms (default: settings.glossary_discover_terms)
+        Returns:
+            GlossaryExtractionResult with extracted terms and their translations
+        """
+        with span("glossary_recognize"):
+            result = self.recognize_terms(text, translation, target_language)
+        
+        if discover is None:
+            discover = settings.glossary_discover_terms
+        if not discover:
+            return result
+        
+        with span("glossary_discover"):
+            discovered = await self.discover_terms(text, translation, target_language)
+        known = {m.term.lower() for m in result.matches}
+        for match, term in zip(discovered.matches, discovered.terms_found):
+            if match.term.lower() not in known:
+                known.add(match.term.lower())
+                result.matches.append(match)
+                result.terms_found.append(term)
+        return result
+    
+    async def discover_terms(self, text: str, translation: str = None, target_language: str = "fr") -> GlossaryExtractionResult:
         """Extract glossary terms from input text using LLM
         
         Extract terms works during the build process and also during the translation process. 
@@ -151,7 +312,7 @@ class GlossaryManager:
             GlossaryExtractionResult with extracted terms and their translations
         """
         try:
-            llm_client = LLMFactory.create_client()
+            llm_client = get_registry().get_client()
         except Exception as e:
             import logging
             logging.warning("Could not initialize LLM for term extraction: %s", str(e))
@@ -159,49 +320,34 @@ class GlossaryManager:
             return GlossaryExtractionResult()
 
         try:
-            json_response = await llm_client.extract_terms(
-                text=text,
-                translation=translation,
-                target_language=target_language
-            )
-            
             # Parse JSON response with improved error handling
             try:
-                # Clean up the response to ensure it's valid JSON
-                json_text = json_response.strip()
-                
-                # Handle various markdown code block formats
-                if json_text.startswith('```json'):
-                    json_text = json_text[7:]
-                elif json_text.startswith('```'):
-                    json_text = json_text[3:]
-                if json_text.endswith('```'):
-                    json_text = json_text[:-3]
-                
-                # Remove any non-JSON text before the array start and after array end
-                start_idx = json_text.find('[')
-                if start_idx >= 0:
-                    end_idx = json_text.rfind(']')
-                    if end_idx > start_idx:
-                        json_text = json_text[start_idx:end_idx+1]
-                
-                json_text = json_text.strip()
+                # Parsed term lists are memoized on disk across runs, languages and callers
+                terms_data = await get_extraction_cache().get_or_extract(
+                    text,
+                    translation,
+                    target_language,
+                    extract=lambda: llm_client.extract_terms(
+                        text=text,
+                        translation=translation,
+                        target_language=target_language
+                    ),
+                    prompt_version=EXTRACTION_PROMPT_VERSION,
+                    model=describe_model(llm_client)
+                )
                 
-                # Log the cleaned JSON for debugging
+                # Log the parsed terms for debugging
                 import logging
-                logging.info("Cleaned JSON response: %s", json_text)
-            
+                logging.info("Extracted terms: %s", terms_data)
               
                 # Handle empty array case
-                if json_text == "[]" or not json_text:
+                if not terms_data:
                     return GlossaryExtractionResult()
-                    
-                # Try to parse the JSON
-                terms_data = json.loads(json_text)
                 
                 # Create matches from LLM-extracted terms
                 matches = []
                 terms_found = []
+                term_index = self.get_term_index(target_language)
                 
                 for item in terms_data:
                     term = item["term"].strip()
@@ -237,8 +383,7 @@ class GlossaryManager:
                         continue
                     
                     # Check if term exists in glossary
-                    existing_entry = next((e for e in self.get_entries(target_language) 
-                                         if e.term.lower() == term.lower()), None)
+                    existing_entry = term_index.get(term.lower())
                     
                     if existing_entry:
                         # Use existing entry's data - only using preferred_translation
@@ -285,6 +430,7 @@ class GlossaryManager:
                                     None  # No domain information available
                                 ))
                                 conn.commit()
+                                self._note_write(cursor)
                                 logging.info(f"✅ AUTO-ADDED TO GLOSSARY: Term '{term}' saved to glossary database")
                             except Exception as e:
                                 logging.warning(f"⚠️ Failed to auto-add term to glossary: {e}")
@@ -294,12 +440,10 @@ class GlossaryManager:
                         else:
                             # When we don't have a translation yet, just use the term
                             # Look for existing glossary entries for this term
-                            entries = self.get_entries(target_language)
-                            matching_entries = [e for e in entries if e.term.lower() == term.lower()]
+                            entry = term_index.get(term.lower())
                             
-                            if matching_entries:
+                            if entry:
                                 # Use existing glossary entry if available
-                                entry = matching_entries[0]
                                 match = GlossaryMatch(
                                     term=term,
                                     prefered_translation=entry.preferred_translation,
@@ -337,7 +481,7 @@ class GlossaryManager:
                 
             except json.JSONDecodeError as e:
                 import logging
-                logging.warning(f"Failed to parse LLM response: {e} - {json_response}")
+                logging.warning(f"Failed to parse LLM response: {e}")
                 # Return empty result set if JSON parsing fails
                 return GlossaryExtractionResult()
                 
@@ -347,6 +491,46 @@ class GlossaryManager:
             # Return empty result set if extraction fails completely
             return GlossaryExtractionResult()
     
+    async def prefetch_term_extractions(self, texts: List[str], target_language: str = "fr") -> int:
+        """
+        Warm the term-extraction cache for many source texts with packed LLM requests.
+        
+        Only does work in "discover new terms" mode; later extract_terms calls for the
+        same source-only arguments are then served from the cache.
+        
+        Args:
+            texts: Source texts (duplicates are ignored)
+            target_language: Target language code (default: 'fr')
+        Returns:
+            Number of texts with an extraction result
+        """
+        if not settings.glossary_discover_terms:
+            return 0
+        
+        unique_texts = list(dict.fromkeys(t for t in texts if t))
+        if not unique_texts:
+            return 0
+        
+        try:
+            llm_client = get_registry().get_client()
+        except Exception as e:
+            logging.warning("Could not initialize LLM for term extraction: %s", str(e))
+            return 0
+        
+        items = [(str(i), text, None) for i, text in enumerate(unique_texts)]
+        try:
+            results = await get_extraction_cache().get_or_extract_batch(
+                items,
+                target_language,
+                extract_batch=lambda missing: llm_client.extract_terms_batch(missing, target_language),
+                prompt_version=EXTRACTION_PROMPT_VERSION,
+                model=describe_model(llm_client)
+            )
+        except Exception as e:
+            logging.warning(f"⚠️ Batched term extraction failed: {e}")
+            return 0
+        return len(results)
+    
     def import_from_csv(self, csv_path: str, target_language: str = "fr") -> int:
         """Import glossary entries from CSV file"""
         import csv
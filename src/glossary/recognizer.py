@@ -0,0 +1,174 @@
+"""
+Local glossary term recognizer.
+
+Finds known glossary terms in source text with an Aho-Corasick automaton built
+over the per-language glossary, so recognizing terms no longer needs an LLM call.
+Matching is case-, whitespace- and hyphen-insensitive, respects word boundaries,
+and returns longest, non-overlapping matches (leftmost first).
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from .models import GlossaryEntry, GlossaryMatch, GlossaryExtractionResult
+
+# Characters treated as a single space when matching (whitespace, hyphens, underscores, slashes)
+_SEPARATORS = set(" \t\r\n -‐‑‒–—―_/")
+
+
+def normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """
+    Normalize text for matching and keep a map back to the original positions.
+
+    Returns:
+        Tuple of (normalized_text, offsets) where offsets[i] is the index in the
+        original text of normalized character i
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+    for i, ch in enumerate(text):
+        if ch in _SEPARATORS:
+            # Collapse runs of separators into one space and drop leading ones
+            if chars and chars[-1] != " ":
+                chars.append(" ")
+                offsets.append(i)
+            continue
+        for lowered in ch.lower():
+            chars.append(lowered)
+            offsets.append(i)
+    if chars and chars[-1] == " ":
+        chars.pop()
+        offsets.pop()
+    return "".join(chars), offsets
+
+
+def normalize_term(text: str) -> str:
+    """Normalize a glossary term the same way source text is normalized"""
+    return normalize_with_offsets(text)[0]
+
+
+class GlossaryTermRecognizer:
+    """Aho-Corasick multi-pattern matcher over glossary terms"""
+
+    def __init__(self, entries: Iterable[GlossaryEntry]):
+        # Trie stored as parallel lists indexed by node id; node 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Pattern lengths ending at each node (own pattern plus those reached via fail links)
+        self._outputs: List[List[int]] = [[]]
+        self._patterns: List[GlossaryEntry] = []
+        self._pattern_lengths: List[int] = []
+
+        seen = set()
+        for entry in entries:
+            pattern = normalize_term(entry.term)
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add_pattern(pattern, entry)
+
+        self._build_fail_links()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _add_pattern(self, pattern: str, entry: GlossaryEntry) -> None:
+        node = 0
+        for ch in pattern:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append(len(self._patterns))
+        self._patterns.append(entry)
+        self._pattern_lengths.append(len(pattern))
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[GlossaryEntry, int, int]]:
+        """
+        Find glossary terms in text.
+
+        Args:
+            text: Source text to scan
+
+        Returns:
+            List of (entry, start, end) tuples with start/end offsets into the
+            original text, longest non-overlapping matches in order of appearance
+        """
+        normalized, offsets = normalize_with_offsets(text)
+        candidates = []
+        node = 0
+        for i, ch in enumerate(normalized):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern_id in self._outputs[node]:
+                start = i - self._pattern_lengths[pattern_id] + 1
+                # Only accept whole-word matches
+                if start > 0 and normalized[start - 1].isalnum():
+                    continue
+                if i + 1 < len(normalized) and normalized[i + 1].isalnum():
+                    continue
+                candidates.append((start, i + 1, pattern_id))
+
+        # Leftmost-longest, non-overlapping selection
+        candidates.sort(key=lambda c: (c[0], -(c[1] - c[0])))
+        selected = []
+        last_end = 0
+        for start, end, pattern_id in candidates:
+            if start < last_end:
+                continue
+            selected.append((self._patterns[pattern_id], offsets[start], offsets[end - 1] + 1))
+            last_end = end
+        return selected
+
+    def match(self, text: str, translation: Optional[str] = None) -> GlossaryExtractionResult:
+        """
+        Recognize glossary terms in text and build glossary matches.
+
+        Args:
+            text: Source text
+            translation: Optional existing translation; when given, the rendering of each
+                term found in it is reported as ``original_translation``
+
+        Returns:
+            GlossaryExtractionResult with one match per recognized term
+        """
+        matches = []
+        terms_found = []
+        for entry, start, end in self.find(text):
+            original_translation = None
+            if translation:
+                original_translation = self._find_rendering(entry, translation)
+            matches.append(GlossaryMatch(
+                term=entry.term,
+                prefered_translation=entry.preferred_translation,
+                original_translation=original_translation,
+                notes=entry.notes,
+                confidence=1.0
+            ))
+            terms_found.append(text[start:end])
+        return GlossaryExtractionResult(matches=matches, terms_found=terms_found)
+
+    @staticmethod
+    def _find_rendering(entry: GlossaryEntry, translation: str) -> Optional[str]:
+        """Find which known rendering of a term appears in a translation (non-preferred variant first)"""
+        for candidate in (entry.translation, entry.preferred_translation):
+            if candidate and re.search(r'\b' + re.escape(candidate) + r'\b', translation, re.IGNORECASE):
+                return candidate
+        return None
@@ -0,0 +1,129 @@
+"""
+Cross-row micro-batching of short translation requests.
+
+Most CSV cells are a handful of words, so sending each one with the full prompt
+scaffolding wastes most of every request. The micro-batcher collects concurrent
+short translate calls for the same language pair for a few milliseconds and sends
+them as one packed request via LLMClient.translate_batch.
+
+A batch runs in a fresh context rather than the first caller's: its usage is
+split across every caller's usage_scope, and it belongs to no single request's
+trace (each caller's own span covers its wait).
+"""
+import asyncio
+import logging
+import contextvars
+from typing import Dict, List, Optional, Set, Tuple
+from ..core.config import settings
+from ..glossary.models import GlossaryMatch
+from ..memory.models import TranslationMatch
+from .usage_ledger import current_usage_scope, split_usage_scope
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationMicroBatcher:
+    """Coalesces concurrent short translate calls into packed translate_batch requests"""
+
+    def __init__(
+        self,
+        llm_client,
+        max_items: int = None,
+        max_wait_ms: int = None,
+        max_words: int = None
+    ):
+        self.llm_client = llm_client
+        self.max_items = max_items or settings.packed_max_items
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.packed_max_wait_ms) / 1000.0
+        self.max_words = max_words or settings.packed_max_words
+
+        # Pending items per (target_language, source_language, domain)
+        self._pending: Dict[Tuple[str, str, Optional[str]], List[tuple]] = {}
+        self._timers: Dict[Tuple[str, str, Optional[str]], asyncio.TimerHandle] = {}
+        # Running batches; the loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        self._next_id = 0
+
+        self.stats = {"requests": 0, "items": 0}
+
+    def accepts(self, text: str) -> bool:
+        """Whether a segment is short enough to be packed with others"""
+        return bool(text and text.strip()) and len(text.split()) <= self.max_words
+
+    async def translate(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> str:
+        """Queue a segment for the next packed request and wait for its translation"""
+        key = (target_language, source_language, domain)
+        future = asyncio.get_running_loop().create_future()
+        item_id = str(self._next_id)
+        self._next_id += 1
+
+        pending = self._pending.setdefault(key, [])
+        pending.append((item_id, text, glossary_matches or [], memory_matches or [], current_usage_scope(), future))
+        self.stats["items"] += 1
+
+        if len(pending) >= self.max_items:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.max_wait, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str, Optional[str]]) -> None:
+        """Send everything pending for a language pair as one batch"""
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(key, batch), context=contextvars.Context())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: Tuple[str, str, Optional[str]], batch: List[tuple]) -> None:
+        target_language, source_language, domain = key
+        items = [(item_id, text, glossary, memory) for item_id, text, glossary, memory, _, _ in batch]
+        self.stats["requests"] += 1
+        logger.debug(f"📦 Packed translation: {len(batch)} segment(s) -> {target_language}")
+
+        try:
+            with split_usage_scope([scope for *_, scope, _ in batch]):
+                if len(items) == 1:
+                    _, text, glossary, memory = items[0]
+                    translations = {items[0][0]: await self.llm_client.translate(
+                        text, target_language, source_language, glossary, memory, domain
+                    )}
+                else:
+                    translations = await self.llm_client.translate_batch(items, target_language, source_language, domain)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for item_id, *_, future in batch:
+                if future.done():
+                    continue
+                if item_id in translations:
+                    future.set_result(translations[item_id])
+                else:
+                    future.set_exception(RuntimeError(f"No translation returned for packed item {item_id}"))
+        finally:
+            # Cancelled (e.g. at shutdown): callers must not wait forever
+            for *_, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    def get_stats(self) -> dict:
+        """Get segments per request for packed translation"""
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "items_per_request": self.stats["items"] / requests if requests else 0.0
+        }
@@ -1,11 +1,48 @@
 import os
-from typing import List, Optional, Dict, Any
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Dict, Any, Tuple
 from abc import ABC, abstractmethod
-from openai import OpenAI, AzureOpenAI, AsyncAzureOpenAI
+from openai import AsyncOpenAI, AzureOpenAI
 import anthropic
 from ..core.config import settings
 from ..glossary.models import GlossaryMatch
 from ..memory.models import TranslationMatch
+from .registry import get_registry
+from .resilience import CircuitOpenError, get_dispatcher, is_retryable
+from .tokens import count_tokens
+from .prompt_builder import PromptBuilder, BuiltPrompt
+
+# Bump whenever the extract_terms prompts change so cached extraction results are not reused
+EXTRACTION_PROMPT_VERSION = "1"
+
+# A packed translation item: (id, text, glossary_matches, memory_matches)
+PackedItem = Tuple[str, str, List[GlossaryMatch], List[TranslationMatch]]
+
+
+def falls_back_per_item(exc: BaseException) -> bool:
+    """
+    Whether a failed packed request should be re-issued one item at a time.
+    
+    Only request-specific rejections (content filter, context length, bad request) do.
+    A shed call (open circuit) or a transient error that outlived its retries (429, 5xx,
+    timeouts) would fail the same way for every item, so it is re-raised instead.
+    """
+    return not (isinstance(exc, CircuitOpenError) or is_retryable(exc))
+
+
+def packed_response_json(choice: Any) -> Dict[str, Any]:
+    """Parse a JSON-mode choice, raising ValueError when it is truncated, filtered or not an object"""
+    if choice.finish_reason == "length":
+        raise ValueError("output truncated")
+    content = choice.message.content
+    if content is None:
+        raise ValueError(f"no content (finish_reason={choice.finish_reason})")
+    parsed = json.loads(content)
+    if not isinstance(parsed, dict):
+        raise ValueError("response is not a JSON object")
+    return parsed
 
 
 class LLMClient(ABC):
@@ -31,30 +68,34 @@ class LLMClient(ABC):
         """Extract technical terminology from text"""
         pass
     
-    def _debug_translation_info(self, text: str, prompt: str, glossary_matches: List[GlossaryMatch]):
-        """Debug helper to print information about important terms"""
-        import logging
-        # Check for specific terms of interest
-        important_terms = ["data present bit-map", "table de corrélation", "table binaire de présence de données"]
+    async def extract_terms_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str]]],
+        target_language: str = "fr"
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract terminology for many segments.
         
-        if any(term in text.lower() for term in important_terms):
-            logging.info(f"🔍 TRANSLATION DEBUG - Text contains important term")
-            logging.info(f"🔍 Source text: {text}")
-            for match in glossary_matches or []:
-                if any(term in match.term.lower() for term in important_terms):
-                    logging.info(f"🔍 Glossary match: '{match.term}' -> '{match.translation}'")
-                    if hasattr(match, 'original_translation') and match.original_translation:
-                        logging.info(f"🔍 Original translation: '{match.original_translation}'")
-            logging.info(f"🔍 Prompt excerpt: {prompt[:300]}...")
-            logging.info(f"🔍 End of debug info for important term")
-
-
-class OpenAIClient(LLMClient):
-    def __init__(self, api_key: str = None):
-        self.client = OpenAI(api_key=api_key or settings.openai_api_key)
-        self.model = settings.model_name
+        Providers without a packed implementation call extract_terms once per item.
+        
+        Args:
+            items: List of (id, source_text, optional translation) tuples
+            target_language: Target language code
+            
+        Returns:
+            Dictionary mapping item id -> parsed list of term dicts (unparseable items are omitted)
+        """
+        from ..glossary.extraction_cache import parse_term_list
+        
+        results = {}
+        for item_id, text, translation in items:
+            try:
+                results[item_id] = parse_term_list(await self.extract_terms(text, translation, target_language))
+            except json.JSONDecodeError as e:
+                logging.warning(f"Failed to parse term extraction for item {item_id}: {e}")
+        return results
     
-    async def translate(
+    async def translate_stream(
         self,
         text: str,
         target_language: str,
@@ -62,29 +103,94 @@ class OpenAIClient(LLMClient):
         glossary_matches: List[GlossaryMatch] = None,
         memory_matches: List[TranslationMatch] = None,
         domain: Optional[str] = None
-    ) -> str:
-        """Translate text using OpenAI GPT"""
+    ) -> AsyncIterator[str]:
+        """Translate text, yielding chunks as they arrive; providers without streaming yield it in one piece"""
+        yield await self.translate(text, target_language, source_language, glossary_matches, memory_matches, domain)
+    
+    async def translate_batch(
+        self,
+        items: List[PackedItem],
+        target_language: str,
+        source_language: str = "en",
+        domain: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Translate many short segments.
         
-        prompt = self._build_prompt(
-            text=text,
-            target_language=target_language,
-            source_language=source_language,
-            glossary_matches=glossary_matches or [],
-            memory_matches=memory_matches or [],
-            domain=domain
-        )
+        Providers without a packed implementation call translate once per item, concurrently.
         
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
+        Args:
+            items: List of (id, text, glossary_matches, memory_matches) tuples
+            target_language: Target language code
+            source_language: Source language code
+            domain: Optional domain shared by all items
+            
+        Returns:
+            Dictionary mapping item id -> translation
+        """
+        translations = await asyncio.gather(*[
+            self.translate(text, target_language, source_language, glossary_matches, memory_matches, domain)
+            for _, text, glossary_matches, memory_matches in items
+        ])
+        return {item[0]: translation for item, translation in zip(items, translations)}
+    
+    async def translate_multi(
+        self,
+        text: str,
+        targets: Dict[str, Tuple[List[GlossaryMatch], List[TranslationMatch]]],
+        source_language: str = "en",
+        domain: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Translate one segment into several target languages.
         
-        return response.choices[0].message.content.strip()
+        Providers without a multi-target implementation call translate once per language, concurrently.
+        
+        Args:
+            text: Source text
+            targets: Dictionary mapping language -> (glossary_matches, memory_matches)
+            source_language: Source language code
+            domain: Optional domain context
+            
+        Returns:
+            Dictionary mapping language -> translation
+        """
+        translations = await asyncio.gather(*[
+            self.translate(text, lang, source_language, glossary_matches, memory_matches, domain)
+            for lang, (glossary_matches, memory_matches) in targets.items()
+        ])
+        return dict(zip(targets.keys(), translations))
+    
+    def _deployment_key(self) -> str:
+        """Identifier of the deployment/model this client calls (one circuit breaker each)"""
+        for attr in ("deployment_name", "model", "model_name"):
+            value = getattr(self, attr, None)
+            if value:
+                return f"{type(self).__name__}:{value}"
+        return type(self).__name__
+    
+    async def _dispatch(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        operation: str = "translate",
+        estimated_tokens: int = 0
+    ) -> Any:
+        """Run one LLM API call through the shared rate-limit/retry/backoff/circuit-breaker layer"""
+        return await get_dispatcher().call(self._deployment_key(), call, operation, estimated_tokens)
+    
+    async def _dispatch_pooled(
+        self,
+        call: Callable[[Any], Awaitable[Any]],
+        operation: str = "translate",
+        estimated_tokens: int = 0
+    ) -> Any:
+        """Run one Azure OpenAI call on the shared deployment pool (routing, failover, hedging)"""
+        return await get_registry().get_azure_pool().call(call, operation, estimated_tokens)
+    
+    def _estimate_tokens(self, *texts: str, max_tokens: int = 0) -> int:
+        """Tokens a call will be charged for: its prompt texts plus the output budget"""
+        model = getattr(self, "deployment_name", None) or getattr(self, "model", None)
+        return sum(count_tokens(text, model) for text in texts) + max_tokens
     
     def _build_prompt(
         self,
@@ -94,101 +200,19 @@ class OpenAIClient(LLMClient):
         glossary_matches: List[GlossaryMatch],
         memory_matches: List[TranslationMatch],
         domain: Optional[str]
-    ) -> str:
-        """Build MCP-style prompt with context"""
-        
-        prompt_parts = []
-        
-        # Translation instructions
-        prompt_parts.append(f"Translate the following text from {source_language} to {target_language}:")
-        
-        # Domain context
-        if domain:
-            prompt_parts.append(f"Domain: {domain}")
-        
-        # Glossary terms
-        if glossary_matches:
-            prompt_parts.append("\nGlossary Terms:")
-            for match in glossary_matches:
-                prompt_parts.append(f"- {match.term} → {match.translation}")
-                if match.notes:
-                    prompt_parts.append(f"  Note: {match.notes}")
-        
-        # Translation memory matches
-        if memory_matches:
-            prompt_parts.append("\nTranslation Memory Matches:")
-            for match in memory_matches:
-                prompt_parts.append(f"- Source: {match.source_text}")
-                prompt_parts.append(f"  Translation: {match.target_text}")
-                prompt_parts.append(f"  Confidence: {match.confidence}")
-        
-        # Final instruction
-        prompt_parts.append("\nTranslation Instructions:")
-        prompt_parts.append("- Maintain the original meaning and tone")
-        prompt_parts.append("- Use the provided glossary terms exactly as specified")
-        prompt_parts.append("- Follow the style shown in the translation memory examples")
-        prompt_parts.append(f"\nText to translate: {text}")
-        
-        return "\n".join(prompt_parts)
-
-
-class AzureOpenAIClient(LLMClient):
-    def __init__(self):
-        self.client = AzureOpenAI(
-            api_key=settings.azure_openai_api_key,
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_version=settings.azure_openai_api_version
-        )
-        self.async_client = AsyncAzureOpenAI(
-            api_key=settings.azure_openai_api_key,
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_version=settings.azure_openai_api_version
+    ) -> BuiltPrompt:
+        """Build MCP-style prompt with context, trimmed to the input token budget"""
+        return self.prompt_builder.build(
+            text, target_language, source_language, glossary_matches, memory_matches, domain
         )
-        self.deployment_name = settings.azure_openai_deployment_name
     
-    async def translate(
+    def _build_extraction_prompt(
         self,
         text: str,
-        target_language: str,
-        source_language: str = "en",
-        glossary_matches: List[GlossaryMatch] = None,
-        memory_matches: List[TranslationMatch] = None,
-        domain: Optional[str] = None
-    ) -> str:
-        """Translate text using Azure OpenAI"""
-        
-        prompt = self._build_prompt(
-            text=text,
-            target_language=target_language,
-            source_language=source_language,
-            glossary_matches=glossary_matches or [],
-            memory_matches=memory_matches or [],
-            domain=domain
-        )
-        
-        # Add debug information for specific terms
-        # self._debug_translation_info(text, prompt, glossary_matches)
-        
-        response = await self.async_client.chat.completions.create(
-            model=self.deployment_name,
-            messages=[
-                {"role": "system", "content": "You are a professional technical translator. Return ONLY the translated text without ANY explanations or additional comments."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
-        # Print only length of prompt instead of the full content
-        return response.choices[0].message.content.strip()
-    
-    
-    async def extract_terms(
-        self,
-        text: str, 
-        translation: Optional[str] = None,
-        target_language: str = "fr"
+        translation: Optional[str],
+        target_language: str
     ) -> str:
-        """Extract technical terminology from text using Azure OpenAI"""
+        """Build the term-extraction prompt (bump EXTRACTION_PROMPT_VERSION when changing it)"""
         
         # Build extraction prompt instead of translation prompt
         if translation:
@@ -265,72 +289,597 @@ class AzureOpenAIClient(LLMClient):
 
             
             """
+        return extraction_prompt
+    
+    def _debug_translation_info(self, text: str, prompt: str, glossary_matches: List[GlossaryMatch]):
+        """Debug helper to print information about important terms"""
+        import logging
+        # Check for specific terms of interest
+        important_terms = ["data present bit-map", "table de corrélation", "table binaire de présence de données"]
+        
+        if any(term in text.lower() for term in important_terms):
+            logging.info(f"🔍 TRANSLATION DEBUG - Text contains important term")
+            logging.info(f"🔍 Source text: {text}")
+            for match in glossary_matches or []:
+                if any(term in match.term.lower() for term in important_terms):
+                    logging.info(f"🔍 Glossary match: '{match.term}' -> '{match.translation}'")
+                    if hasattr(match, 'original_translation') and match.original_translation:
+                        logging.info(f"🔍 Original translation: '{match.original_translation}'")
+            logging.info(f"🔍 Prompt excerpt: {prompt[:300]}...")
+            logging.info(f"🔍 End of debug info for important term")
+
+
+class OpenAIClient(LLMClient):
+    def __init__(self, api_key: str = None):
+        # Async SDK client on the shared pool, so concurrent translations actually overlap
+        self.client = AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key,
+            http_client=get_registry().get_async_http_client(),
+            max_retries=0  # retries are handled by the resilience layer
+        )
+        self.model = settings.model_name
+        self.prompt_builder = PromptBuilder(model=self.model)
     
-        response = await self.async_client.chat.completions.create(
-            model=self.deployment_name,
+    async def translate(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> str:
+        """Translate text using OpenAI GPT"""
+        
+        built = self._build_prompt(
+            text=text,
+            target_language=target_language,
+            source_language=source_language,
+            glossary_matches=glossary_matches or [],
+            memory_matches=memory_matches or [],
+            domain=domain
+        )
+        
+        response = await self._dispatch(lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments."},
+                {"role": "user", "content": built.prompt}
+            ],
+            temperature=0.3,
+            max_tokens=built.max_tokens
+        ), "translate", built.input_tokens + built.max_tokens)
+        
+        return response.choices[0].message.content.strip()
+    
+    async def translate_stream(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Translate text, yielding tokens from the streaming chat completions API"""
+        built = self._build_prompt(
+            text=text,
+            target_language=target_language,
+            source_language=source_language,
+            glossary_matches=glossary_matches or [],
+            memory_matches=memory_matches or [],
+            domain=domain
+        )
+        
+        stream = await self._dispatch(lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments."},
+                {"role": "user", "content": built.prompt}
+            ],
+            temperature=0.3,
+            max_tokens=built.max_tokens,
+            stream=True
+        ), "translate_stream", built.input_tokens + built.max_tokens)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def extract_terms(
+        self,
+        text: str,
+        translation: Optional[str] = None,
+        target_language: str = "fr"
+    ) -> str:
+        """Extract technical terminology from text using OpenAI GPT"""
+        extraction_prompt = self._build_extraction_prompt(text, translation, target_language)
+        response = await self._dispatch(lambda: self.client.chat.completions.create(
+            model=self.model,
             messages=[
                 {"role": "system", "content": "You are a technical terminology extraction system. Return ONLY the JSON array of extracted terms."},
                 {"role": "user", "content": extraction_prompt}
             ],
             temperature=0.3,
             max_tokens=500
+        ), "extract_terms", self._estimate_tokens(extraction_prompt, max_tokens=500))
+        
+        return response.choices[0].message.content.strip()
+
+
+class AzureOpenAIClient(LLMClient):
+    def __init__(self):
+        self._client = None
+        # Calls are routed across AZURE_OPENAI_DEPLOYMENTS (or the single configured deployment)
+        self.pool = get_registry().get_azure_pool()
+        self.async_client = self.pool.deployments[0].client
+        self.deployment_name = settings.azure_openai_deployment_name
+        self.prompt_builder = PromptBuilder(model=self.deployment_name)
+    
+    @property
+    def client(self) -> AzureOpenAI:
+        """Synchronous client, only created when something actually needs it"""
+        if self._client is None:
+            self._client = AzureOpenAI(
+                api_key=settings.azure_openai_api_key,
+                azure_endpoint=settings.azure_openai_endpoint,
+                api_version=settings.azure_openai_api_version,
+                http_client=get_registry().get_sync_http_client(),
+                max_retries=0  # retries are handled by the resilience layer
+            )
+        return self._client
+    
+    async def translate(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> str:
+        """Translate text using Azure OpenAI"""
+        
+        built = self._build_prompt(
+            text=text,
+            target_language=target_language,
+            source_language=source_language,
+            glossary_matches=glossary_matches or [],
+            memory_matches=memory_matches or [],
+            domain=domain
         )
         
+        # Add debug information for specific terms
+        # self._debug_translation_info(text, built.prompt, glossary_matches)
+        
+        response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+            model=deployment.name,
+            messages=[
+                {"role": "system", "content": "You are a professional technical translator. Return ONLY the translated text without ANY explanations or additional comments."},
+                {"role": "user", "content": built.prompt}
+            ],
+            temperature=0.3,
+            max_tokens=built.max_tokens
+        ), "translate", built.input_tokens + built.max_tokens)
         return response.choices[0].message.content.strip()
-    def _build_prompt(
+    
+    
+    async def translate_stream(
         self,
         text: str,
         target_language: str,
-        source_language: str,
-        glossary_matches: List[GlossaryMatch],
-        memory_matches: List[TranslationMatch],
-        domain: Optional[str]
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Translate text, yielding tokens from the streaming chat completions API"""
+        built = self._build_prompt(
+            text=text,
+            target_language=target_language,
+            source_language=source_language,
+            glossary_matches=glossary_matches or [],
+            memory_matches=memory_matches or [],
+            domain=domain
+        )
+        
+        # Only opening the stream is retried/failed over; tokens already sent cannot be taken back
+        stream = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+            model=deployment.name,
+            messages=[
+                {"role": "system", "content": "You are a professional technical translator. Return ONLY the translated text without ANY explanations or additional comments."},
+                {"role": "user", "content": built.prompt}
+            ],
+            temperature=0.3,
+            max_tokens=built.max_tokens,
+            stream=True
+        ), "translate_stream", built.input_tokens + built.max_tokens)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def extract_terms(
+        self,
+        text: str, 
+        translation: Optional[str] = None,
+        target_language: str = "fr"
     ) -> str:
-        """Build MCP-style prompt with context"""
+        """Extract technical terminology from text using Azure OpenAI"""
         
-        prompt_parts = []
+        extraction_prompt = self._build_extraction_prompt(text, translation, target_language)
+    
+        response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+            model=deployment.name,
+            messages=[
+                {"role": "system", "content": "You are a technical terminology extraction system. Return ONLY the JSON array of extracted terms."},
+                {"role": "user", "content": extraction_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=500
+        ), "extract_terms", self._estimate_tokens(extraction_prompt, max_tokens=500))
         
-        # Translation instructions
-        prompt_parts.append(f"Translate the following text from {source_language} to {target_language}:")
+        return response.choices[0].message.content.strip()
+    
+    async def extract_terms_batch(
+        self,
+        items: List[Tuple[str, str, Optional[str]]],
+        target_language: str = "fr"
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract terminology for many segments in packed JSON-mode requests.
+        
+        Items are packed into as few requests as the token limits allow. A chunk whose
+        output is truncated, filtered or unparseable is split in half and retried; a single
+        item that still fails (or a chunk the API rejects as invalid) falls back to
+        extract_terms. Throttling, server errors and open circuits are raised.
+        
+        Args:
+            items: List of (id, source_text, optional translation) tuples
+            target_language: Target language code
+            
+        Returns:
+            Dictionary mapping item id -> parsed list of term dicts (unparseable items are omitted)
+        """
+        results = {}
+        for chunk in self._chunk_extraction_items(items):
+            results.update(await self._extract_terms_chunk(chunk, target_language))
+        return results
+    
+    def _chunk_extraction_items(self, items: List[Tuple[str, str, Optional[str]]]) -> List[list]:
+        """Group items so each packed request stays within the input/output token limits"""
+        chunks = []
+        current = []
+        input_tokens = 0
+        for item in items:
+            item_id, text, translation = item
+            item_tokens = count_tokens(text, self.deployment_name) + count_tokens(translation or "", self.deployment_name) + 15
+            over_input = input_tokens + item_tokens > settings.extraction_batch_max_input_tokens
+            over_output = (len(current) + 1) * settings.extraction_batch_output_tokens_per_item > settings.extraction_batch_max_output_tokens
+            if current and (over_input or over_output or len(current) >= settings.extraction_batch_max_items):
+                chunks.append(current)
+                current, input_tokens = [], 0
+            current.append(item)
+            input_tokens += item_tokens
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    async def _extract_terms_chunk(self, chunk: list, target_language: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract terms for one packed chunk, splitting or falling back on failure"""
+        payload = [
+            {"id": item_id, "source": text, **({"translation": translation} if translation else {})}
+            for item_id, text, translation in chunk
+        ]
+        extraction_prompt = f"""
+            You are a terminology extraction expert. For EACH item, extract technical terms from the English
+            source text. When an item has a {target_language.upper()} translation, also give each term's exact
+            translation equivalent found in that translation.
+
+            CRITICAL RULES:
+            1. Extract complete technical terms (often multi-word compounds) as single units, never split them
+            2. Focus on domain-specific technical vocabulary
+            3. Exclude modifiers that are not part of the core term (like "use", "defined", "new", "current", etc.)
+            4. Limit terms to max 3 words
+            5. If a word is excluded from the source term, its translation must be excluded from the target term
+
+            Output format (JSON object only), with one key per item id (use [] when an item has no terms):
+
+            {{"results": {{"<id>": [{{"term": "<english term>", "translation": "<translation equivalent, only if a translation was given>"}}]}}}}
+
+            Items:
+            {json.dumps(payload, ensure_ascii=False)}
+            """
         
-        # Domain context
+        max_tokens = min(
+            settings.extraction_batch_max_output_tokens,
+            len(chunk) * settings.extraction_batch_output_tokens_per_item + 50
+        )
+        try:
+            response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+                model=deployment.name,
+                messages=[
+                    {"role": "system", "content": "You are a technical terminology extraction system. Return ONLY the JSON object of extracted terms."},
+                    {"role": "user", "content": extraction_prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            ), "extract_terms_chunk", self._estimate_tokens(extraction_prompt, max_tokens=max_tokens))
+        except Exception as e:
+            if not falls_back_per_item(e):
+                raise
+            logging.warning(f"⚠️ Packed term extraction failed ({e}) - extracting {len(chunk)} item(s) one by one")
+            return await LLMClient.extract_terms_batch(self, chunk, target_language)
+        
+        try:
+            raw_results = packed_response_json(response.choices[0]).get("results", {})
+            if not isinstance(raw_results, dict):
+                raise ValueError("'results' is not an object")
+        except (ValueError, AttributeError) as e:
+            if len(chunk) > 1:
+                # Halve the chunk and try again - smaller outputs are less likely to break
+                logging.info(f"🔀 Packed term extraction unusable ({e}) - splitting {len(chunk)} items")
+                middle = len(chunk) // 2
+                results = await self._extract_terms_chunk(chunk[:middle], target_language)
+                results.update(await self._extract_terms_chunk(chunk[middle:], target_language))
+                return results
+            return await LLMClient.extract_terms_batch(self, chunk, target_language)
+        
+        results = {}
+        missing = []
+        for item in chunk:
+            terms = raw_results.get(item[0])
+            if isinstance(terms, list):
+                results[item[0]] = [t for t in terms if isinstance(t, dict) and t.get("term")]
+            else:
+                missing.append(item)
+        
+        if missing:
+            # Re-issue only the items the model left out
+            results.update(await LLMClient.extract_terms_batch(self, missing, target_language))
+        return results
+    
+    async def translate_batch(
+        self,
+        items: List[PackedItem],
+        target_language: str,
+        source_language: str = "en",
+        domain: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Translate many short segments in packed JSON-mode requests.
+        
+        Each item carries its own glossary and memory hints. Every returned translation
+        is validated; items that are missing or fail validation are re-issued one by one
+        through translate. A truncated, filtered or unparseable chunk is split in half and
+        retried. Throttling, server errors and open circuits are raised.
+        
+        Args:
+            items: List of (id, text, glossary_matches, memory_matches) tuples
+            target_language: Target language code
+            source_language: Source language code
+            domain: Optional domain shared by all items
+            
+        Returns:
+            Dictionary mapping item id -> translation
+        """
+        results = {}
+        for chunk in self._chunk_translation_items(items):
+            results.update(await self._translate_chunk(chunk, target_language, source_language, domain))
+        return results
+    
+    async def translate_multi(
+        self,
+        text: str,
+        targets: Dict[str, Tuple[List[GlossaryMatch], List[TranslationMatch]]],
+        source_language: str = "en",
+        domain: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Translate one segment into several target languages in a single JSON-mode request.
+        
+        Each language carries its own glossary and memory hints. Languages that are
+        missing from the response or fail validation are translated individually.
+        Throttling, server errors and open circuits are raised.
+        
+        Args:
+            text: Source text
+            targets: Dictionary mapping language -> (glossary_matches, memory_matches)
+            source_language: Source language code
+            domain: Optional domain context
+            
+        Returns:
+            Dictionary mapping language -> translation
+        """
+        hints = {
+            lang: {k: v for k, v in self._packed_payload((lang, text, glossary, memory)).items() if k not in ("id", "text")}
+            for lang, (glossary, memory) in targets.items()
+        }
+        prompt_parts = [f"Translate the following text from {source_language} into each of these languages: {', '.join(targets)}."]
         if domain:
             prompt_parts.append(f"Domain: {domain}")
+        if any(hints.values()):
+            prompt_parts.append(f"\nPer-language hints (\"glossary\" terms must be used exactly, follow the style of \"memory\" examples):\n{json.dumps(hints, ensure_ascii=False)}")
+        prompt_parts.append("""
+Translation Instructions:
+- Maintain the original meaning and tone
+- Translate independently into every requested language
+
+Output format (JSON object only), with one key per language code:
+
+{"translations": {"<language code>": "<translated text>"}}
+""")
+        prompt_parts.append(f"Text to translate: {text}")
         
-        # Glossary terms
-        if glossary_matches:
-            prompt_parts.append("\nGlossary Terms:")
-            for match in glossary_matches:
-                prompt_parts.append(f"- {match.term} → {match.prefered_translation}")
-                if match.notes:
-                    prompt_parts.append(f"  Note: {match.notes}")
+        source_tokens = count_tokens(text, self.deployment_name)
+        prompt = "\n".join(prompt_parts)
+        max_tokens = len(targets) * (3 * source_tokens + 15) + 50
+        try:
+            response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+                model=deployment.name,
+                messages=[
+                    {"role": "system", "content": "You are a professional technical translator. Return ONLY the JSON object of translations."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            ), "translate_multi", self._estimate_tokens(prompt, max_tokens=max_tokens))
+        except Exception as e:
+            if not falls_back_per_item(e):
+                raise
+            logging.warning(f"⚠️ Multi-target translation failed ({e}) - translating {len(targets)} language(s) one by one")
+            response = None
         
-        # Translation memory matches
-        if memory_matches:
-            prompt_parts.append("\nTranslation Memory Matches:")
-            for match in memory_matches:
-                prompt_parts.append(f"- Source: {match.source_text}")
-                prompt_parts.append(f"  Translation: {match.target_text}")
-                prompt_parts.append(f"  Confidence: {match.confidence}")
+        raw_results = {}
+        if response is not None:
+            try:
+                raw_results = packed_response_json(response.choices[0]).get("translations", {})
+                if not isinstance(raw_results, dict):
+                    raise ValueError("'translations' is not an object")
+            except (ValueError, AttributeError) as e:
+                logging.warning(f"⚠️ Multi-target translation unusable ({e}) - translating {len(targets)} language(s) one by one")
+                raw_results = {}
         
-        # Final instruction
-        prompt_parts.append("\nTranslation Instructions:")
-        prompt_parts.append("- Maintain the original meaning and tone")
-        prompt_parts.append("- Use the provided glossary terms exactly as specified")
-        prompt_parts.append("- Follow the style shown in the translation memory examples")
-        prompt_parts.append("- IMPORTANT: Return ONLY the translated text without ANY explanation, introduction, or additional commentary")
-        prompt_parts.append(f"\nText to translate: {text}")
+        results = {}
+        failed = {}
+        for lang, target in targets.items():
+            translation = raw_results.get(lang)
+            if self._is_valid_packed_translation(text, translation):
+                results[lang] = translation.strip()
+            else:
+                failed[lang] = target
         
-        final_prompt = "\n".join(prompt_parts)
-        # Only log length for debugging purposes
-        print(f"Prompt length: {len(final_prompt)} characters")
+        if failed:
+            # Per-language fallback for targets that came back missing or invalid
+            results.update(await LLMClient.translate_multi(self, text, failed, source_language, domain))
+        return results
+    
+    def _chunk_translation_items(self, items: List[PackedItem]) -> List[list]:
+        """Group items so each packed request stays within the item and input token limits"""
+        chunks = []
+        current = []
+        input_tokens = 0
+        for item in items:
+            item_tokens = count_tokens(json.dumps(self._packed_payload(item), ensure_ascii=False), self.deployment_name)
+            over_input = input_tokens + item_tokens > settings.packed_max_input_tokens
+            if current and (over_input or len(current) >= settings.packed_max_items):
+                chunks.append(current)
+                current, input_tokens = [], 0
+            current.append(item)
+            input_tokens += item_tokens
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    @staticmethod
+    def _packed_payload(item: PackedItem) -> Dict[str, Any]:
+        """JSON payload for one packed item, with its glossary and best memory hints"""
+        item_id, text, glossary_matches, memory_matches = item
+        payload = {"id": item_id, "text": text}
+        if glossary_matches:
+            payload["glossary"] = {m.term: m.prefered_translation for m in glossary_matches if m.prefered_translation}
+        if memory_matches:
+            best = sorted(memory_matches, key=lambda m: m.similarity_score, reverse=True)[:2]
+            payload["memory"] = [{"source": m.source_text, "translation": m.target_text} for m in best]
+        return payload
+    
+    @staticmethod
+    def _is_valid_packed_translation(text: str, translation: Any) -> bool:
+        """Reject empty, runaway or structurally broken translations from a packed response"""
+        if not isinstance(translation, str) or not translation.strip():
+            return False
+        if len(translation) > 4 * len(text) + 40:
+            return False
+        if "\n" in translation and "\n" not in text:
+            return False
+        return not translation.lstrip().startswith(("{", "[", '"id"'))
+    
+    async def _translate_chunk(
+        self,
+        chunk: list,
+        target_language: str,
+        source_language: str,
+        domain: Optional[str]
+    ) -> Dict[str, str]:
+        """Translate one packed chunk, splitting or falling back on failure"""
+        payload = [self._packed_payload(item) for item in chunk]
+        prompt_parts = [
+            f"Translate the \"text\" of EACH item from {source_language} to {target_language}."
+        ]
+        if domain:
+            prompt_parts.append(f"Domain: {domain}")
+        prompt_parts.append("""
+Translation Instructions:
+- Maintain the original meaning and tone; items are short table cells, keep them concise
+- When an item has "glossary" terms, use those translations exactly as specified
+- When an item has "memory" examples, follow their style and terminology
+- Translate every item independently, do not merge or skip items
 
-        return final_prompt
+Output format (JSON object only), with one key per item id:
+
+{"translations": {"<id>": "<translated text>"}}
+""")
+        prompt_parts.append(f"Items:\n{json.dumps(payload, ensure_ascii=False)}")
+        
+        source_tokens = sum(count_tokens(item[1], self.deployment_name) for item in chunk)
+        prompt = "\n".join(prompt_parts)
+        max_tokens = 3 * source_tokens + 15 * len(chunk) + 50
+        try:
+            response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+                model=deployment.name,
+                messages=[
+                    {"role": "system", "content": "You are a professional technical translator. Return ONLY the JSON object of translations."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            ), "translate_chunk", self._estimate_tokens(prompt, max_tokens=max_tokens))
+        except Exception as e:
+            if not falls_back_per_item(e):
+                raise
+            logging.warning(f"⚠️ Packed translation failed ({e}) - translating {len(chunk)} item(s) one by one")
+            return await LLMClient.translate_batch(self, chunk, target_language, source_language, domain)
+        
+        try:
+            raw_results = packed_response_json(response.choices[0]).get("translations", {})
+            if not isinstance(raw_results, dict):
+                raise ValueError("'translations' is not an object")
+        except (ValueError, AttributeError) as e:
+            if len(chunk) > 1:
+                logging.info(f"🔀 Packed translation unusable ({e}) - splitting {len(chunk)} items")
+                middle = len(chunk) // 2
+                results = await self._translate_chunk(chunk[:middle], target_language, source_language, domain)
+                results.update(await self._translate_chunk(chunk[middle:], target_language, source_language, domain))
+                return results
+            return await LLMClient.translate_batch(self, chunk, target_language, source_language, domain)
+        
+        results = {}
+        failed = []
+        for item in chunk:
+            translation = raw_results.get(item[0])
+            if self._is_valid_packed_translation(item[1], translation):
+                results[item[0]] = translation.strip()
+            else:
+                failed.append(item)
+        
+        if failed:
+            # Re-issue only the items that came back missing or invalid
+            logging.info(f"🔁 Re-translating {len(failed)}/{len(chunk)} packed item(s) individually")
+            results.update(await LLMClient.translate_batch(self, failed, target_language, source_language, domain))
+        return results
 
 
 class AnthropicClient(LLMClient):
     def __init__(self, api_key: str = None):
-        self.client = anthropic.Anthropic(api_key=api_key or settings.anthropic_api_key)
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key or settings.anthropic_api_key,
+            http_client=get_registry().get_async_http_client(),
+            max_retries=0  # retries are handled by the resilience layer
+        )
+        self.model = "claude-3-sonnet-20240229"
+        # tiktoken has no Claude encoding; the GPT-4 encoding is a close enough estimate
+        self.prompt_builder = PromptBuilder()
     
     async def translate(
         self,
@@ -343,7 +892,7 @@ class AnthropicClient(LLMClient):
     ) -> str:
         """Translate text using Anthropic Claude"""
         
-        prompt = self._build_prompt(
+        built = self._build_prompt(
             text=text,
             target_language=target_language,
             source_language=source_language,
@@ -353,68 +902,102 @@ class AnthropicClient(LLMClient):
         )
         
         # Add a system instruction to Claude
-        direct_prompt = "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments. Do not include any notes, clarifications, or alternative translations. Only return the direct translation.\n\n" + prompt
+        direct_prompt = "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments. Do not include any notes, clarifications, or alternative translations. Only return the direct translation.\n\n" + built.prompt
         
-        response = self.client.messages.create(
-            model="claude-3-sonnet-20240229",
-            max_tokens=1000,
+        response = await self._dispatch(lambda: self.client.messages.create(
+            model=self.model,
+            max_tokens=built.max_tokens,
             messages=[
                 {"role": "user", "content": direct_prompt}
             ]
-        )
+        ), "translate", self._estimate_tokens(direct_prompt, max_tokens=built.max_tokens))
         
         return response.content[0].text.strip()
     
-    def _build_prompt(
+    async def translate_stream(
         self,
         text: str,
         target_language: str,
-        source_language: str,
-        glossary_matches: List[GlossaryMatch],
-        memory_matches: List[TranslationMatch],
-        domain: Optional[str]
-    ) -> str:
-        """Build MCP-style prompt with context"""
-        
-        prompt_parts = []
-        
-        # Translation instructions
-        prompt_parts.append(f"Translate the following text from {source_language} to {target_language}:")
-        
-        # Domain context
-        if domain:
-            prompt_parts.append(f"Domain: {domain}")
-        
-        # Glossary terms
-        if glossary_matches:
-            prompt_parts.append("\nGlossary Terms:")
-            for match in glossary_matches:
-                prompt_parts.append(f"- {match.term} → {match.translation}")
-                if match.notes:
-                    prompt_parts.append(f"  Note: {match.notes}")
-        
-        # Translation memory matches
-        if memory_matches:
-            prompt_parts.append("\nTranslation Memory Matches:")
-            for match in memory_matches:
-                prompt_parts.append(f"- Source: {match.source_text}")
-                prompt_parts.append(f"  Translation: {match.target_text}")
-                prompt_parts.append(f"  Confidence: {match.confidence}")
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Translate text, yielding text deltas from the streaming Messages API"""
+        built = self._build_prompt(
+            text=text,
+            target_language=target_language,
+            source_language=source_language,
+            glossary_matches=glossary_matches or [],
+            memory_matches=memory_matches or [],
+            domain=domain
+        )
+        direct_prompt = "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments. Do not include any notes, clarifications, or alternative translations. Only return the direct translation.\n\n" + built.prompt
         
-        # Final instruction
-        prompt_parts.append("\nTranslation Instructions:")
-        prompt_parts.append("- Maintain the original meaning and tone")
-        prompt_parts.append("- Use the provided glossary terms exactly as specified")
-        prompt_parts.append("- Follow the style shown in the translation memory examples")
-        prompt_parts.append(f"\nText to translate: {text}")
+        stream = await self._dispatch(lambda: self.client.messages.create(
+            model=self.model,
+            max_tokens=built.max_tokens,
+            messages=[
+                {"role": "user", "content": direct_prompt}
+            ],
+            stream=True
+        ), "translate_stream", self._estimate_tokens(direct_prompt, max_tokens=built.max_tokens))
+        async for event in stream:
+            if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                yield event.delta.text
+    
+    async def extract_terms(
+        self,
+        text: str,
+        translation: Optional[str] = None,
+        target_language: str = "fr"
+    ) -> str:
+        """Extract technical terminology from text using Anthropic Claude"""
+        extraction_prompt = self._build_extraction_prompt(text, translation, target_language)
+        response = await self._dispatch(lambda: self.client.messages.create(
+            model=self.model,
+            max_tokens=500,
+            system="You are a technical terminology extraction system. Return ONLY the JSON array of extracted terms.",
+            messages=[
+                {"role": "user", "content": extraction_prompt}
+            ]
+        ), "extract_terms", self._estimate_tokens(extraction_prompt, max_tokens=500))
         
-        return "\n".join(prompt_parts)
+        return response.content[0].text.strip()
 
 
 class LocalModelClient(LLMClient):
-    def __init__(self, model_name: str = "llama2"):
-        self.model_name = model_name
-        self.api_url = "http://localhost:11434/api/generate"
+    """Ollama-compatible local model client for offline runs, on one pooled aiohttp session"""
+    
+    SYSTEM_INSTRUCTION = "You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments."
+    
+    def __init__(self, model_name: str = None, base_url: str = None):
+        self.model_name = model_name or settings.local_model_name
+        self.base_url = (base_url or settings.local_model_url).rstrip("/")
+        self.api_url = f"{self.base_url}/api/generate"
+        self.batch_url = settings.local_batch_url
+        self.prompt_builder = PromptBuilder()
+        self._session = None
+    
+    def _get_session(self):
+        """Get the client's long-lived session, creating it on first use"""
+        import aiohttp
+        
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.local_max_connections,
+                    keepalive_timeout=settings.local_keepalive_timeout
+                ),
+                timeout=aiohttp.ClientTimeout(total=settings.local_request_timeout)
+            )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def translate(
         self,
@@ -427,7 +1010,7 @@ class LocalModelClient(LLMClient):
     ) -> str:
         """Translate text using local Ollama model"""
         
-        prompt = self._build_prompt(
+        built = self._build_prompt(
             text=text,
             target_language=target_language,
             source_language=source_language,
@@ -435,47 +1018,146 @@ class LocalModelClient(LLMClient):
             memory_matches=memory_matches or [],
             domain=domain
         )
+        prompt = f"{self.SYSTEM_INSTRUCTION}\n{built.prompt}"
         
-        import aiohttp
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.api_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            ) as response:
-                result = await response.json()
-                return result.get("response", "").strip()
+        if settings.local_stream:
+            chunks = [chunk async for chunk in self._generate_stream(prompt, built.max_tokens, "translate")]
+            return "".join(chunks).strip()
+        return await self._generate(prompt, built.max_tokens, "translate")
     
-    def _build_prompt(
+    async def translate_stream(
         self,
         text: str,
         target_language: str,
-        source_language: str,
-        glossary_matches: List[GlossaryMatch],
-        memory_matches: List[TranslationMatch],
-        domain: Optional[str]
-    ) -> str:
-        """Build MCP-style prompt with context"""
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Translate text, yielding tokens as the local model generates them"""
+        built = self._build_prompt(
+            text=text,
+            target_language=target_language,
+            source_language=source_language,
+            glossary_matches=glossary_matches or [],
+            memory_matches=memory_matches or [],
+            domain=domain
+        )
+        async for chunk in self._generate_stream(f"{self.SYSTEM_INSTRUCTION}\n{built.prompt}", built.max_tokens):
+            yield chunk
+    
+    async def translate_batch(
+        self,
+        items: List[PackedItem],
+        target_language: str,
+        source_language: str = "en",
+        domain: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Translate many segments through the server's batch endpoint when one is configured.
         
-        prompt_parts = []
+        LOCAL_BATCH_URL points at an OpenAI-style /v1/completions endpoint that accepts a
+        list of prompts (vLLM, llama.cpp server). Without it, or if the batch call fails,
+        segments are sent concurrently over the pooled session.
+        """
+        if not self.batch_url or len(items) < 2:
+            return await super().translate_batch(items, target_language, source_language, domain)
         
-        # Translation instructions
-        prompt_parts.append("You are a professional translator. Return ONLY the translated text without ANY explanations or additional comments.")
-        prompt_parts.append(f"Translate from {source_language} to {target_language}:")
+        prompts = [
+            f"{self.SYSTEM_INSTRUCTION}\n" + self._build_prompt(
+                text, target_language, source_language, glossary_matches, memory_matches, domain
+            ).prompt
+            for _, text, glossary_matches, memory_matches in items
+        ]
+        max_tokens = max(self.prompt_builder.max_output_tokens(item[1]) for item in items)
+        async def call():
+            async with self._get_session().post(
+                self.batch_url,
+                json={"model": self.model_name, "prompt": prompts, "max_tokens": max_tokens, "temperature": 0.3}
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
         
-        if glossary_matches:
-            prompt_parts.append("\nTerms:")
-            for match in glossary_matches:
-                prompt_parts.append(f"- {match.term}={match.translation}")
+        try:
+            result = await self._dispatch(
+                call, "translate_batch", self._estimate_tokens(*prompts, max_tokens=max_tokens * len(prompts))
+            )
+            choices = {choice["index"]: choice["text"].strip() for choice in result.get("choices", [])}
+        except Exception as e:
+            logging.warning(f"⚠️ Local batch endpoint failed ({e}) - translating {len(items)} item(s) one by one")
+            return await super().translate_batch(items, target_language, source_language, domain)
         
-        prompt_parts.append(f"\nText: {text}")
-        prompt_parts.append("\nTranslation only without any explanations:")
+        results = {}
+        missing = []
+        for index, item in enumerate(items):
+            if choices.get(index):
+                results[item[0]] = choices[index]
+            else:
+                missing.append(item)
+        if missing:
+            results.update(await super().translate_batch(missing, target_language, source_language, domain))
+        return results
+    
+    async def extract_terms(
+        self,
+        text: str,
+        translation: Optional[str] = None,
+        target_language: str = "fr"
+    ) -> str:
+        """Extract technical terminology from text using local Ollama model"""
+        prompt = self._build_extraction_prompt(text, translation, target_language)
+        return await self._generate(prompt, 500, "extract_terms")
+    
+    async def _generate(self, prompt: str, max_tokens: int, operation: str = "generate") -> str:
+        """Run one non-streamed generation"""
+        async def call():
+            async with self._get_session().post(
+                self.api_url,
+                json={
+                    "model": self.model_name,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": {"num_predict": max_tokens}
+                }
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
         
-        return " ".join(prompt_parts)
+        result = await self._dispatch(call, operation, self._estimate_tokens(prompt, max_tokens=max_tokens))
+        return result.get("response", "").strip()
+    
+    async def _generate_stream(
+        self, prompt: str, max_tokens: int, operation: str = "translate_stream"
+    ) -> AsyncIterator[str]:
+        """Run one streamed generation, yielding response chunks (Ollama sends one JSON object per line)"""
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "options": {"num_predict": max_tokens}
+        }
+
+        async def open_stream():
+            response = await self._get_session().post(self.api_url, json=payload)
+            try:
+                response.raise_for_status()
+            except Exception:
+                response.close()
+                raise
+            return response
+
+        # Only opening the stream is retried; tokens already yielded cannot be taken back
+        response = await self._dispatch(open_stream, operation, self._estimate_tokens(prompt, max_tokens=max_tokens))
+        async with response:
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
 
 
 class LLMFactory:
@@ -513,6 +1195,12 @@ class LLMFactory:
             return AnthropicClient()
         elif provider == "local":
             return LocalModelClient()
+        elif provider == "fake":
+            from .fake_provider import FakeLLMClient
+            return FakeLLMClient()
+        elif provider == "replay":
+            from .fake_provider import ReplayLLMClient
+            return ReplayLLMClient()
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
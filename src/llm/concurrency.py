@@ -0,0 +1,131 @@
+"""
+Adaptive (AIMD) concurrency limiting for LLM dispatch.
+
+Every LLM call acquires a slot from its deployment's limiter. The limit grows
+additively (about +1 per round of successful calls) while latency stays near its
+baseline, and is cut multiplicatively on throttling, server errors or latency
+spikes - the same scheme TCP uses for its congestion window. Baselines are kept
+per operation, since a 500-token term extraction or a packed batch is not a
+spike next to a short translation. The right
+concurrency is discovered at run time instead of guessed with --batch-size.
+"""
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit for one deployment"""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = None,
+        minimum: int = None,
+        maximum: int = None
+    ):
+        self.name = name
+        self.min_limit = minimum or settings.llm_aimd_min_concurrency
+        self.max_limit = maximum or settings.llm_aimd_max_concurrency
+        self.limit = float(initial or settings.llm_aimd_initial_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self._condition = asyncio.Condition()
+
+        # Baseline latency per operation (slow EWMA of healthy calls) used to detect spikes
+        self.baseline_latencies: Dict[str, float] = {}
+        self._last_decrease = 0.0
+        self.stats = {"successes": 0, "congestion_events": 0, "waits": 0}
+
+    @property
+    def current_limit(self) -> int:
+        """Current whole-number concurrency limit"""
+        return max(self.min_limit, int(self.limit))
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot for the duration of a call"""
+        async with self._condition:
+            if self.in_flight >= self.current_limit:
+                self.stats["waits"] += 1
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.in_flight < self.current_limit)
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float, operation: str = "llm") -> None:
+        """Record a successful call; grows the limit unless latency spiked against the operation's baseline"""
+        self.stats["successes"] += 1
+        baseline = self.baseline_latencies.get(operation)
+        if baseline is not None and latency > baseline * settings.llm_aimd_latency_factor:
+            self.on_congestion(f"{operation} latency spike {latency:.2f}s (baseline {baseline:.2f}s)")
+            return
+
+        self.baseline_latencies[operation] = latency if baseline is None else 0.9 * baseline + 0.1 * latency
+        # Additive increase: +1 per limit's worth of successes
+        self.limit = min(self.max_limit, self.limit + settings.llm_aimd_increase / max(self.limit, 1.0))
+
+    def on_congestion(self, reason: str = "throttled") -> None:
+        """Record throttling/overload; cuts the limit at most once per (slowest operation's) baseline round trip"""
+        now = time.monotonic()
+        cooldown = max(self.baseline_latencies.values(), default=1.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.stats["congestion_events"] += 1
+        previous = self.current_limit
+        self.limit = max(float(self.min_limit), self.limit * settings.llm_aimd_decrease)
+        logger.info(f"📉 Concurrency for {self.name}: {previous} -> {self.current_limit} ({reason})")
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "baseline_latency_ms": {
+                operation: latency * 1000 for operation, latency in self.baseline_latencies.items()
+            }
+        }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_limiter(deployment: str) -> AdaptiveConcurrencyLimiter:
+    """Get the limiter for a deployment, creating it on first use"""
+    limiter = _limiters.get(deployment)
+    if limiter is None:
+        limiter = _limiters[deployment] = AdaptiveConcurrencyLimiter(deployment)
+    return limiter
+
+
+def get_limiter_stats() -> Dict[str, dict]:
+    """Current limit and counters of every deployment's limiter"""
+    return {name: limiter.get_stats() for name, limiter in _limiters.items()}
+
+
+def suggested_batch_size() -> int:
+    """
+    How many rows to keep in flight so the LLM limiters stay busy.
+
+    Rows also spend time in memory/glossary lookups, so twice the largest
+    current limit is kept in flight.
+    """
+    if not settings.llm_adaptive_concurrency:
+        return settings.llm_aimd_initial_concurrency
+    limits = [limiter.current_limit for limiter in _limiters.values()]
+    return 2 * max(limits) if limits else 2 * settings.llm_aimd_initial_concurrency
@@ -0,0 +1,271 @@
+"""
+Load balancing, failover and hedged requests across Azure OpenAI deployments.
+
+AZURE_OPENAI_DEPLOYMENTS lists several deployments (e.g. the same model in
+different regions) as JSON:
+
+    [{"deployment": "gpt-4", "endpoint": "https://weu.openai.azure.com", "weight": 2},
+     {"deployment": "gpt-4", "endpoint": "https://eus.openai.azure.com", "api_key": "..."}]
+
+Without it the pool holds the single AZURE_OPENAI_ENDPOINT/DEPLOYMENT_NAME
+deployment and behaves exactly like a plain client.
+
+- Routing: the deployment with the lowest (outstanding + 1) * latency / weight,
+  skipping deployments whose circuit is open.
+- Failover: while other deployments remain, a throttled or failing deployment
+  is not retried; the call moves to the next deployment instead.
+- Hedging (AZURE_HEDGE_ENABLED): when a call is still running after the pool's
+  p95 latency, a duplicate is sent to another deployment and the first answer
+  wins. AZURE_HEDGE_BUDGET caps hedges as a fraction of calls.
+"""
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Set
+from urllib.parse import urlparse
+from pydantic import BaseModel
+from openai import AsyncAzureOpenAI
+from ..core.config import settings
+from .resilience import CircuitOpenError, get_dispatcher, is_retryable
+
+logger = logging.getLogger(__name__)
+
+# A deployment unused for this long is scored with the pool's typical latency again
+IDLE_RESET_SECONDS = 30.0
+
+
+class AzureDeploymentConfig(BaseModel):
+    """One entry of AZURE_OPENAI_DEPLOYMENTS"""
+    deployment: str
+    endpoint: str
+    api_key: Optional[str] = None
+    api_version: Optional[str] = None
+    weight: float = 1.0
+
+
+class PooledDeployment:
+    """A deployment with its client and live routing statistics"""
+
+    def __init__(self, config: AzureDeploymentConfig, client: AsyncAzureOpenAI, key: str):
+        self.name = config.deployment
+        self.endpoint = config.endpoint
+        self.weight = max(config.weight, 0.01)
+        self.client = client
+        self.key = key
+        self.outstanding = 0
+        self.latency_ewma: Optional[float] = None
+        self.last_success = 0.0
+        self.stats = {"calls": 0, "failures": 0}
+
+    def score(self, default_latency: float) -> float:
+        """Lower is better: outstanding work scaled by typical latency and weight"""
+        latency = self.latency_ewma
+        if latency is None or time.monotonic() - self.last_success > IDLE_RESET_SECONDS:
+            # Unknown or stale latency: assume typical so the deployment gets probed again
+            latency = default_latency
+        return (self.outstanding + 1) * latency / self.weight
+
+    def record_latency(self, latency: float) -> None:
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+        self.last_success = time.monotonic()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "endpoint": self.endpoint,
+            "weight": self.weight,
+            "outstanding": self.outstanding,
+            "latency_ewma_ms": self.latency_ewma * 1000 if self.latency_ewma else None
+        }
+
+
+def load_deployment_configs() -> List[AzureDeploymentConfig]:
+    """Deployments from AZURE_OPENAI_DEPLOYMENTS, or the single configured deployment"""
+    if settings.azure_openai_deployments:
+        return [AzureDeploymentConfig(**entry) for entry in json.loads(settings.azure_openai_deployments)]
+    return [AzureDeploymentConfig(
+        deployment=settings.azure_openai_deployment_name,
+        endpoint=settings.azure_openai_endpoint or ""
+    )]
+
+
+class AzureDeploymentPool:
+    """Routes Azure OpenAI calls across deployments with failover and optional hedging"""
+
+    def __init__(self, configs: List[AzureDeploymentConfig], http_client=None):
+        self.deployments: List[PooledDeployment] = []
+        for config in configs:
+            client = AsyncAzureOpenAI(
+                api_key=config.api_key or settings.azure_openai_api_key,
+                azure_endpoint=config.endpoint,
+                api_version=config.api_version or settings.azure_openai_api_version,
+                http_client=http_client,
+                max_retries=0  # retries are handled by the resilience layer
+            )
+            # Single deployment keeps the plain client's key so breakers/limits/overrides are unchanged
+            key = f"AzureOpenAIClient:{config.deployment}"
+            if len(configs) > 1:
+                key += f"@{urlparse(config.endpoint).hostname or config.endpoint}"
+            self.deployments.append(PooledDeployment(config, client, key))
+
+        self._latencies: Deque[float] = deque(maxlen=500)
+        self.stats = {"calls": 0, "failovers": 0, "hedges": 0, "hedge_wins": 0}
+        if len(self.deployments) > 1:
+            logger.info(f"⚖️ Azure deployment pool: {', '.join(d.key for d in self.deployments)}")
+
+    def _is_available(self, deployment: PooledDeployment) -> bool:
+        breaker = get_dispatcher().get_breaker(deployment.key)
+        return breaker.state != "open" or time.monotonic() - breaker.opened_at >= breaker.reset_timeout
+
+    def pick(self, exclude: Set[str] = None) -> Optional[PooledDeployment]:
+        """Best available deployment not in exclude (by key)"""
+        candidates = [
+            d for d in self.deployments
+            if d.key not in (exclude or set()) and self._is_available(d)
+        ]
+        if not candidates:
+            return None
+        default_latency = self._median_latency()
+        return min(candidates, key=lambda d: d.score(default_latency))
+
+    def _median_latency(self) -> float:
+        if not self._latencies:
+            return 1.0
+        ordered = sorted(self._latencies)
+        return ordered[len(ordered) // 2]
+
+    def p95_latency(self) -> Optional[float]:
+        """Pool-wide p95 latency of recent successful calls, once enough samples exist"""
+        if len(self._latencies) < settings.azure_hedge_min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _hedge_allowed(self) -> bool:
+        return settings.azure_hedge_enabled and self.stats["hedges"] < settings.azure_hedge_budget * self.stats["calls"]
+
+    async def _call_one(
+        self,
+        deployment: PooledDeployment,
+        fn: Callable[[PooledDeployment], Awaitable[Any]],
+        operation: str,
+        estimated_tokens: int,
+        max_attempts: Optional[int]
+    ) -> Any:
+        deployment.outstanding += 1
+        deployment.stats["calls"] += 1
+        started = time.monotonic()
+        try:
+            result = await get_dispatcher().call(
+                deployment.key, lambda: fn(deployment), operation, estimated_tokens, max_attempts
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            deployment.stats["failures"] += 1
+            raise
+        finally:
+            deployment.outstanding -= 1
+        latency = time.monotonic() - started
+        deployment.record_latency(latency)
+        self._latencies.append(latency)
+        return result
+
+    async def _call_hedged(
+        self,
+        primary: PooledDeployment,
+        fn: Callable[[PooledDeployment], Awaitable[Any]],
+        operation: str,
+        estimated_tokens: int,
+        max_attempts: Optional[int],
+        tried: Set[str]
+    ) -> Any:
+        """Call primary; if it is slower than p95, race a duplicate on another deployment"""
+        hedge_after = self.p95_latency() if settings.azure_hedge_enabled else None
+        if hedge_after is None:
+            return await self._call_one(primary, fn, operation, estimated_tokens, max_attempts)
+
+        tasks = {asyncio.ensure_future(self._call_one(primary, fn, operation, estimated_tokens, max_attempts))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            secondary = None if done or not self._hedge_allowed() else self.pick(exclude=tried)
+            if secondary is None:
+                return await next(iter(tasks))
+
+            tried.add(secondary.key)
+            self.stats["hedges"] += 1
+            logger.debug(f"🏇 Hedging {operation}: {primary.key} slower than p95 ({hedge_after:.2f}s), also trying {secondary.key}")
+            hedge = asyncio.ensure_future(self._call_one(secondary, fn, operation, estimated_tokens, 1))
+            tasks.add(hedge)
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            # Wait for the losers to unwind, so a cancelled half-open probe has released its breaker
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    async def call(
+        self,
+        fn: Callable[[PooledDeployment], Awaitable[Any]],
+        operation: str = "llm",
+        estimated_tokens: int = 0
+    ) -> Any:
+        """
+        Run one call on the best deployment, failing over to others on transient errors.
+
+        Args:
+            fn: Coroutine factory taking the chosen deployment (use deployment.client and deployment.name)
+            operation: Name used in logs
+            estimated_tokens: Rate-limit charge, see LLMDispatcher.call
+
+        Returns:
+            The first successful result
+        """
+        self.stats["calls"] += 1
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+
+        while True:
+            deployment = self.pick(exclude=tried)
+            if deployment is None:
+                if last_error is not None:
+                    raise last_error
+                # Every circuit is open - let the dispatcher shed the call with CircuitOpenError
+                deployment = self.deployments[0]
+            tried.add(deployment.key)
+
+            # Fail fast while another deployment can take over; the last one gets full retries
+            others_left = self.pick(exclude=tried) is not None
+            try:
+                return await self._call_hedged(
+                    deployment, fn, operation, estimated_tokens, 1 if others_left else None, tried
+                )
+            except Exception as e:
+                if not others_left or not (is_retryable(e) or isinstance(e, CircuitOpenError)):
+                    raise
+                last_error = e
+                self.stats["failovers"] += 1
+                logger.warning(f"🔀 {operation} failed on {deployment.key} ({type(e).__name__}) - failing over")
+
+    def get_stats(self) -> dict:
+        """Routing, failover and hedging counters with per-deployment state"""
+        p95 = self.p95_latency()
+        return {
+            **self.stats,
+            "p95_latency_ms": p95 * 1000 if p95 else None,
+            "deployments": {d.key: d.get_stats() for d in self.deployments}
+        }
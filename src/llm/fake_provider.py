@@ -0,0 +1,380 @@
+"""
+Deterministic stand-in LLM provider for load and benchmark testing.
+
+Measures the system's own overhead separately from a real model's:
+
+- FakeLLMClient (LLM_PROVIDER=fake) answers translate/extract_terms in-process
+  with deterministic output ("<lang>: <text>" with glossary terms substituted),
+  simulated log-normal latency, token usage, and injected 5xx/429 errors. Every
+  call still goes through the dispatcher, so retries, breakers, concurrency and
+  rate limits behave as with a real provider.
+- ReplayLLMClient (LLM_PROVIDER=replay) answers from a JSONL recording of
+  {"text", "target_language", "translation"} lines (e.g. exported reference
+  translations), falling back to the fake output for unknown segments.
+- The module also runs as an HTTP server speaking the OpenAI chat-completions
+  wire format (plain and Azure deployment paths, streaming included), so the
+  real OpenAI/Azure client code paths can be exercised offline:
+
+    python -m src.llm.fake_provider --port 8089 --latency-ms 300 --throttle-rate 0.02
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8089 AZURE_OPENAI_API_KEY=fake ...
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from ..core.config import settings
+from ..glossary.models import GlossaryMatch
+from ..memory.models import TranslationMatch
+from .client import LLMClient
+from .prompt_builder import PromptBuilder
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "which", "when", "where", "into",
+    "used", "use", "new", "current", "defined", "each", "other", "than", "then", "are", "is"
+}
+
+
+class FakeLLMError(Exception):
+    """Injected provider error carrying an HTTP status (and Retry-After for 429s)"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Injected fake LLM error (status {status_code})")
+        self.status_code = status_code
+        self.headers = {"retry-after": f"{retry_after:.2f}"} if retry_after is not None else {}
+
+
+class FakeModel:
+    """Deterministic outputs plus simulated latency, usage and errors"""
+
+    def __init__(
+        self,
+        latency_ms: float = None,
+        latency_sigma: float = None,
+        ms_per_token: float = None,
+        error_rate: float = None,
+        throttle_rate: float = None,
+        seed: int = None
+    ):
+        self.latency_ms = settings.fake_llm_latency_ms if latency_ms is None else latency_ms
+        self.latency_sigma = settings.fake_llm_latency_sigma if latency_sigma is None else latency_sigma
+        self.ms_per_token = settings.fake_llm_ms_per_token if ms_per_token is None else ms_per_token
+        self.error_rate = settings.fake_llm_error_rate if error_rate is None else error_rate
+        self.throttle_rate = settings.fake_llm_throttle_rate if throttle_rate is None else throttle_rate
+        self.random = random.Random(settings.fake_llm_seed if seed is None else seed)
+        self.stats = {"calls": 0, "errors": 0, "throttled": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def latency(self, output_tokens: int = 0) -> float:
+        """Seconds for one call: log-normal around latency_ms plus time per output token"""
+        base = self.latency_ms * self.random.lognormvariate(0.0, self.latency_sigma) if self.latency_ms else 0.0
+        return (base + self.ms_per_token * output_tokens) / 1000.0
+
+    async def simulate(self, output_tokens: int = 0) -> None:
+        """Wait like a real call would, then maybe fail with an injected 429/500"""
+        self.stats["calls"] += 1
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            self.stats["throttled"] += 1
+            await asyncio.sleep(self.latency() / 10)
+            raise FakeLLMError(429, retry_after=self.random.uniform(0.05, 0.5))
+        await asyncio.sleep(self.latency(output_tokens))
+        if roll < self.throttle_rate + self.error_rate:
+            self.stats["errors"] += 1
+            raise FakeLLMError(500)
+
+    def usage(self, prompt: str, completion: str) -> Dict[str, int]:
+        """OpenAI-style usage block, also accumulated in stats"""
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(completion)
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["completion_tokens"] += completion_tokens
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+    @staticmethod
+    def translate_text(text: str, target_language: str, glossary: Dict[str, str] = None) -> str:
+        """Deterministic 'translation': glossary terms substituted, prefixed with the language code"""
+        translated = text
+        for term, preferred in sorted((glossary or {}).items(), key=lambda kv: -len(kv[0])):
+            if preferred:
+                translated = re.sub(r'\b' + re.escape(term) + r'\b', preferred, translated, flags=re.IGNORECASE)
+        return f"{target_language}: {translated}"
+
+    @staticmethod
+    def extract_terms(text: str, translation: Optional[str] = None) -> List[Dict[str, str]]:
+        """Deterministic term candidates: up to 3 runs of 1-3 content words"""
+        terms = []
+        run = []
+        for word in re.findall(r"[A-Za-z][A-Za-z0-9\-]*", text) + [""]:
+            if word and len(word) > 3 and word.lower() not in _STOPWORDS:
+                run.append(word)
+                if len(run) < 3:
+                    continue
+            if run:
+                term = " ".join(run).lower()
+                entry = {"term": term}
+                if translation and term in translation.lower():
+                    entry["translation"] = term
+                if entry not in terms:
+                    terms.append(entry)
+                run = []
+        return terms[:3]
+
+    def complete(self, messages: List[Dict[str, Any]]) -> str:
+        """Answer a chat request by recognising which of the system's prompts it is"""
+        system = " ".join(m.get("content") or "" for m in messages if m.get("role") == "system")
+        prompt = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+
+        original = re.search(r"Original text: '(.*?)'\s*\n", prompt, re.DOTALL)
+        if original:
+            # Grammar correction: return the text unchanged
+            return original.group(1)
+
+        if "Items:\n" in prompt:
+            items = json.loads(prompt.split("Items:\n", 1)[1])
+            if "extract technical terms" in prompt:
+                return json.dumps({"results": {
+                    item["id"]: self.extract_terms(item.get("source", ""), item.get("translation"))
+                    for item in items
+                }}, ensure_ascii=False)
+            language = re.search(r"to (\w+)\.", prompt)
+            return json.dumps({"translations": {
+                item["id"]: self.translate_text(item["text"], language.group(1) if language else "xx", item.get("glossary"))
+                for item in items
+            }}, ensure_ascii=False)
+
+        multi = re.search(r"into each of these languages: ([\w, ]+)\.", prompt)
+        if multi:
+            text = prompt.split("Text to translate:", 1)[-1].strip()
+            hints = re.search(r"Per-language hints.*?:\n(\{.*\})\n", prompt, re.DOTALL)
+            hints = json.loads(hints.group(1)) if hints else {}
+            return json.dumps({"translations": {
+                lang.strip(): self.translate_text(text, lang.strip(), hints.get(lang.strip(), {}).get("glossary"))
+                for lang in multi.group(1).split(",")
+            }}, ensure_ascii=False)
+
+        if "terminology extraction" in prompt:
+            source = re.search(r"English: '(.*?)'", prompt, re.DOTALL)
+            translation = re.search(r"Translation: \w+: '(.*?)'", prompt, re.DOTALL)
+            return json.dumps(self.extract_terms(
+                source.group(1) if source else "",
+                translation.group(1) if translation else None
+            ), ensure_ascii=False)
+
+        glossary = dict(re.findall(r"^- (.+?) → (.+)$", prompt, re.MULTILINE))
+        text_match = re.search(r"Text to translate: (.*)$", prompt, re.DOTALL)
+        language = re.search(r"from \w+ to (\w+)", prompt) or re.search(r"from \w+ to (\w+)", system)
+        mcp = re.search(r"Translate this text to (\w+): (.*)$", prompt, re.DOTALL)
+        if mcp:
+            return self.translate_text(mcp.group(2).strip(), mcp.group(1), glossary)
+        if text_match:
+            return self.translate_text(text_match.group(1).strip(), language.group(1) if language else "xx", glossary)
+        return prompt.strip().splitlines()[-1] if prompt.strip() else ""
+
+
+class FakeLLMClient(LLMClient):
+    """In-process fake provider (LLM_PROVIDER=fake)"""
+
+    def __init__(self, model: FakeModel = None):
+        self.model = "fake"
+        self.fake = model or FakeModel()
+        self.prompt_builder = PromptBuilder(model=None)
+
+    async def _complete(self, prompt: str, completion: str, operation: str) -> str:
+        """Simulate one provider call through the dispatcher"""
+        async def call():
+            await self.fake.simulate(count_tokens(completion))
+            return {"text": completion, "usage": self.fake.usage(prompt, completion)}
+
+        result = await self._dispatch(call, operation, self._estimate_tokens(prompt, completion))
+        return result["text"]
+
+    def _translation_for(self, text: str, target_language: str, glossary_matches: List[GlossaryMatch]) -> str:
+        glossary = {m.term: m.prefered_translation for m in glossary_matches or []}
+        return self.fake.translate_text(text, target_language, glossary)
+
+    async def translate(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> str:
+        """Deterministic translation after simulated latency"""
+        built = self._build_prompt(
+            text, target_language, source_language, glossary_matches or [], memory_matches or [], domain
+        )
+        if source_language == target_language:
+            # Grammar correction pass: return the text unchanged
+            original = re.search(r"Original text: '(.*?)'\s*\n", text, re.DOTALL)
+            completion = original.group(1) if original else text
+        else:
+            completion = self._translation_for(text, target_language, glossary_matches)
+        return await self._complete(built.prompt, completion, "translate")
+
+    async def translate_stream(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str = "en",
+        glossary_matches: List[GlossaryMatch] = None,
+        memory_matches: List[TranslationMatch] = None,
+        domain: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield the deterministic translation word by word, paced by ms_per_token"""
+        built = self._build_prompt(
+            text, target_language, source_language, glossary_matches or [], memory_matches or [], domain
+        )
+        completion = self._translation_for(text, target_language, glossary_matches)
+        # Time to first token is the base latency; errors are injected before the stream opens
+        await self._dispatch(lambda: self.fake.simulate(0), "translate_stream")
+        self.fake.usage(built.prompt, completion)
+        for word in re.findall(r"\S+\s*", completion):
+            await asyncio.sleep(self.fake.ms_per_token * max(1, count_tokens(word)) / 1000.0)
+            yield word
+
+    async def extract_terms(
+        self,
+        text: str,
+        translation: Optional[str] = None,
+        target_language: str = "fr"
+    ) -> str:
+        """Deterministic term candidates as a JSON array"""
+        prompt = self._build_extraction_prompt(text, translation, target_language)
+        completion = json.dumps(self.fake.extract_terms(text, translation), ensure_ascii=False)
+        return await self._complete(prompt, completion, "extract_terms")
+
+    def get_stats(self) -> dict:
+        return dict(self.fake.stats)
+
+
+class ReplayLLMClient(FakeLLMClient):
+    """Fake provider answering from recorded translations (LLM_PROVIDER=replay)"""
+
+    def __init__(self, replay_path: str = None, model: FakeModel = None):
+        super().__init__(model)
+        self.model = "replay"
+        self.recordings: Dict[Tuple[str, str], str] = {}
+        self.replay_stats = {"hits": 0, "misses": 0}
+        path = replay_path or settings.fake_llm_replay_path
+        if path:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.recordings[(record["text"].strip(), record["target_language"])] = record["translation"]
+            logger.info(f"📼 Loaded {len(self.recordings)} recorded translations from {path}")
+
+    def _translation_for(self, text: str, target_language: str, glossary_matches: List[GlossaryMatch]) -> str:
+        recorded = self.recordings.get((text.strip(), target_language))
+        if recorded is None:
+            self.replay_stats["misses"] += 1
+            return super()._translation_for(text, target_language, glossary_matches)
+        self.replay_stats["hits"] += 1
+        return recorded
+
+    def get_stats(self) -> dict:
+        return {**super().get_stats(), **self.replay_stats}
+
+
+def create_app(model: FakeModel = None):
+    """
+    Build an aiohttp app serving OpenAI-compatible chat completions.
+
+    Routes:
+        POST /v1/chat/completions                               OpenAI
+        POST /openai/deployments/{deployment}/chat/completions  Azure OpenAI
+        GET  /stats                                             Injected errors and token counts
+    """
+    from aiohttp import web
+
+    model = model or FakeModel()
+
+    async def chat_completions(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        messages = body.get("messages", [])
+        completion = model.complete(messages)
+        prompt = "\n".join(m.get("content") or "" for m in messages)
+        try:
+            await model.simulate(0 if body.get("stream") else count_tokens(completion))
+        except FakeLLMError as e:
+            return web.json_response(
+                {"error": {"message": str(e), "type": "fake_error", "code": str(e.status_code)}},
+                status=e.status_code,
+                headers=e.headers
+            )
+
+        model_name = body.get("model") or request.match_info.get("deployment", "fake")
+        created = int(time.time())
+        usage = model.usage(prompt, completion)
+
+        if not body.get("stream"):
+            return web.json_response({
+                "id": f"chatcmpl-fake-{model.stats['calls']}",
+                "object": "chat.completion",
+                "created": created,
+                "model": model_name,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": completion},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        chunk_base = {"id": f"chatcmpl-fake-{model.stats['calls']}", "object": "chat.completion.chunk", "created": created, "model": model_name}
+        for word in re.findall(r"\S+\s*", completion):
+            await asyncio.sleep(model.ms_per_token * max(1, count_tokens(word)) / 1000.0)
+            chunk = {**chunk_base, "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        final = {**chunk_base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        await response.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(model.stats)
+
+    app = web.Application()
+    app["model"] = model
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_post("/openai/deployments/{deployment}/chat/completions", chat_completions)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def main():
+    from aiohttp import web
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible fake LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=settings.fake_llm_latency_ms, help="Median latency per call")
+    parser.add_argument("--latency-sigma", type=float, default=settings.fake_llm_latency_sigma, help="Log-normal spread of latency")
+    parser.add_argument("--ms-per-token", type=float, default=settings.fake_llm_ms_per_token, help="Extra latency per output token")
+    parser.add_argument("--error-rate", type=float, default=settings.fake_llm_error_rate, help="Fraction of calls failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=settings.fake_llm_throttle_rate, help="Fraction of calls failing with 429")
+    parser.add_argument("--seed", type=int, default=settings.fake_llm_seed)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    model = FakeModel(args.latency_ms, args.latency_sigma, args.ms_per_token, args.error_rate, args.throttle_rate, args.seed)
+    logger.info(f"🧪 Fake OpenAI-compatible LLM listening on http://{args.host}:{args.port}")
+    web.run_app(create_app(model), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Stand-in for a local Ollama-compatible model server.
+
+Serves deterministic "translations" so LocalModelClient (pooled session, streaming
+and the batch endpoint) can be exercised without a GPU or network access:
+
+    python -m src.llm.local_stub_server --port 11434 --latency 0.2
+
+Endpoints:
+    POST /api/generate     Ollama generate, streamed (one JSON object per line) or not
+    GET  /api/tags         Ollama model list
+    POST /v1/completions   OpenAI-style completions accepting a list of prompts
+"""
+import re
+import json
+import asyncio
+import logging
+import argparse
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+_TEXT_PATTERN = re.compile(r"Text to translate:\s*(.*)\s*$", re.DOTALL)
+_LANGUAGE_PATTERN = re.compile(r"from \w+ to (\w+)")
+
+
+def fake_completion(prompt: str) -> str:
+    """Deterministic response for a prompt: '[<lang>] <text>' for translations, '[]' otherwise"""
+    text_match = _TEXT_PATTERN.search(prompt)
+    if not text_match:
+        return "[]"
+    language_match = _LANGUAGE_PATTERN.search(prompt)
+    language = language_match.group(1) if language_match else "xx"
+    return f"[{language}] {text_match.group(1).strip()}"
+
+
+def create_app(latency: float = 0.0, model: str = "llama2") -> web.Application:
+    """
+    Build the stub server application.
+
+    Args:
+        latency: Seconds to wait before answering each request (per prompt for batches)
+        model: Model name reported by /api/tags
+    """
+    stats = {"requests": 0, "prompts": 0}
+
+    async def generate(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        stats["requests"] += 1
+        stats["prompts"] += 1
+        await asyncio.sleep(latency)
+        completion = fake_completion(body.get("prompt", ""))
+
+        if not body.get("stream", True):
+            return web.json_response({"model": body.get("model"), "response": completion, "done": True})
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for word in re.findall(r"\S+\s*", completion):
+            await response.write((json.dumps({"response": word, "done": False}) + "\n").encode("utf-8"))
+        await response.write((json.dumps({"response": "", "done": True}) + "\n").encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def tags(request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"name": model}]})
+
+    async def completions(request: web.Request) -> web.Response:
+        body = await request.json()
+        prompts = body.get("prompt", "")
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        stats["requests"] += 1
+        stats["prompts"] += len(prompts)
+        await asyncio.sleep(latency)
+        return web.json_response({
+            "object": "text_completion",
+            "model": body.get("model"),
+            "choices": [
+                {"index": i, "text": fake_completion(prompt), "finish_reason": "stop"}
+                for i, prompt in enumerate(prompts)
+            ]
+        })
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_post("/api/generate", generate)
+    app.router.add_get("/api/tags", tags)
+    app.router.add_post("/v1/completions", completions)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local model stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of simulated generation time per request")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"🧪 Local model stub listening on http://{args.host}:{args.port}")
+    web.run_app(create_app(args.latency), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
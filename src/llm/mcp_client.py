@@ -13,6 +13,9 @@ import logging
 # Change from synchronous to async client
 from openai import AsyncAzureOpenAI  # Change this import
 from ..core.config import settings
+from ..core.tracing import span
+from .registry import get_registry
+from .prompt_builder import PromptBuilder, BuiltPrompt
 logger = logging.getLogger(__name__)
 
 
@@ -40,12 +43,10 @@ class MCPLLMClient(LLMClient):
         from openai import AzureOpenAI
         from ..core.config import settings
         
-        self.client = AsyncAzureOpenAI(  # Change to async client
-            api_key=settings.azure_openai_api_key,
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_version=settings.azure_openai_api_version
-        )
+        # Calls are routed across the shared Azure deployment pool
+        self.client = get_registry().get_azure_pool().deployments[0].client
         self.deployment_name = settings.azure_openai_deployment_name
+        self.prompt_builder = PromptBuilder(model=self.deployment_name)
     
     def _get_mcp_tools(self) -> List[Dict[str, Any]]:
         """Define MCP tools for the LLM to use"""
@@ -173,32 +174,22 @@ class MCPLLMClient(LLMClient):
                 text = arguments["text"]
                 target_lang = arguments["target_language"]
                 
-                # Step 1: Extract terms using existing Azure client
-                from .client import AzureOpenAIClient
-                import asyncio
-                
-                azure_client = AzureOpenAIClient()
-                json_response = await azure_client.extract_terms(text, None, target_lang)
-                
-                # Parse extracted terms
-                extracted_terms = json.loads(json_response)
+                # Recognize known glossary terms locally (the LLM extractor only runs in discover mode)
+                extraction = await self.glossary_manager.extract_terms(text, None, target_lang)
                 
-                if not extracted_terms:
+                if not extraction.matches:
                     return json.dumps({"found": False, "message": "No technical terms found"})
-                # Step 2: Search glossary for each extracted term
-                glossary_results = []
-                all_entries = self.glossary_manager.get_entries(target_lang)
-                for term_obj in extracted_terms:
-                    term = term_obj.get("term")
-                    if term:
-                        matches = [e for e in all_entries if e.term.lower() == term.lower()]
-                        if matches:
-                            glossary_results.append({
-                                "term": term,
-                                "translation": matches[0].preferred_translation,
-                                "confidence": 1.0,
-                                "notes": matches[0].notes
-                            })
+                # Keep only terms that have a glossary translation
+                glossary_results = [
+                    {
+                        "term": match.term,
+                        "translation": match.prefered_translation,
+                        "confidence": match.confidence,
+                        "notes": match.notes
+                    }
+                    for match in extraction.matches
+                    if match.prefered_translation
+                ]
                 
                 if glossary_results:
                     return json.dumps({
@@ -210,7 +201,7 @@ class MCPLLMClient(LLMClient):
                     return json.dumps({
                         "found": False,
                         "message": "Terms extracted but no glossary matches found",
-                        "extracted_terms": [t.get("term") for t in extracted_terms]
+                        "extracted_terms": extraction.terms_found
                     })
             
             elif tool_name == "search_literal_dictionary":
@@ -306,7 +297,7 @@ class MCPLLMClient(LLMClient):
         import json
         from pathlib import Path
         
-        config_file = Path(__file__).parent.parent.parent / "config" / "grammar_rules.json"
+        config_file = Path(settings.grammar_rules_path or Path(__file__).parent.parent.parent / "config" / "grammar_rules.json")
         
         if not config_file.exists():
             return ""
@@ -316,6 +307,15 @@ class MCPLLMClient(LLMClient):
                 all_rules = json.load(f)
             
             rules = all_rules.get(target_language, [])
+            # Languages with local repair rules keep their prompt rules under "prompt_rules"
+            if isinstance(rules, dict):
+                rules = rules.get("prompt_rules", [])
+
+            # Keep rules in priority (file) order within the grammar token budget
+            kept = self.prompt_builder.fit_lines([f"- {rule}" for rule in rules], settings.prompt_grammar_token_budget)
+            if len(kept) < len(rules):
+                logger.debug(f"✂️ Grammar rules trimmed to {len(kept)}/{len(rules)} for {target_language}")
+            rules = [rule[2:] for rule in kept]
             
             if rules:
                 formatted_rules = "\n\nLANGUAGE-SPECIFIC GRAMMAR RULES:\n" + "\n".join(f"- {rule}" for rule in rules)
@@ -325,6 +325,14 @@ class MCPLLMClient(LLMClient):
             logger.warning(f"Failed to load grammar rules: {e}")
         
         return ""
+    def _estimate_messages_tokens(self, messages: List[Any], max_tokens: int) -> int:
+        """Rate-limit charge for a chat call: text of every message (tool results included) plus max_tokens"""
+        texts = [
+            m["content"] for m in messages
+            if isinstance(m, dict) and isinstance(m.get("content"), str)
+        ]
+        return self._estimate_tokens(*texts, max_tokens=max_tokens)
+
     async def _retry_translation(self, text: str, bad_translation: str, target_language: str, source_language: str) -> str:
         """Retry translation with a stricter prompt when validation fails."""
         logger.warning(f"⚠️  Translation looks incomplete: '{text}' -> '{bad_translation}'. Retrying...")
@@ -340,12 +348,12 @@ class MCPLLMClient(LLMClient):
             }
         ]
         
-        response = await self.client.chat.completions.create(
-            model=self.deployment_name,
+        response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+            model=deployment.name,
             messages=retry_messages,
             temperature=0.1,
-            max_tokens=1000
-        )
+            max_tokens=self.prompt_builder.max_output_tokens(text)
+        ), "retry_translation", self._estimate_messages_tokens(retry_messages, self.prompt_builder.max_output_tokens(text)))
         
         retried = response.choices[0].message.content.strip()
         logger.info(f"🔄 Retry translation: '{text}' -> '{retried}'")
@@ -391,15 +399,25 @@ class MCPLLMClient(LLMClient):
             }
         ]
         
+        # Tool-calling turns repeat the source text in their arguments, so keep some headroom
+        max_tokens = self.prompt_builder.max_output_tokens(text, minimum=256)
+        prompt_text = "\n".join(m["content"] for m in messages)
+        self.prompt_builder.record(BuiltPrompt(
+            prompt=prompt_text,
+            input_tokens=self.prompt_builder.count(prompt_text),
+            max_tokens=max_tokens
+        ))
+        
         # Make initial call with tools
-        response = await self.client.chat.completions.create(
-            model=self.deployment_name,
-            messages=messages,
-            tools=self._get_mcp_tools(),
-            tool_choice="auto",
-            temperature=0.3,
-            max_tokens=1000
-        )
+        with span("mcp_turn", iteration=0):
+            response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+                model=deployment.name,
+                messages=messages,
+                tools=self._get_mcp_tools(),
+                tool_choice="auto",
+                temperature=0.3,
+                max_tokens=max_tokens
+            ), "translate", self._estimate_messages_tokens(messages, max_tokens))
         
         # Handle tool calls
         max_iterations = 5
@@ -414,7 +432,8 @@ class MCPLLMClient(LLMClient):
                 
                 # Validate translation completeness
                 if not self._validate_translation(text, final_translation):
-                    final_translation = await self._retry_translation(text, final_translation, target_language, source_language)
+                    with span("mcp_retry_translation"):
+                        final_translation = await self._retry_translation(text, final_translation, target_language, source_language)
                 
                 return {
                     "translation": final_translation,
@@ -435,7 +454,8 @@ class MCPLLMClient(LLMClient):
                 logger.info(f"🔧 MCP Tool Call: {function_name}({function_args})")
                 
                 # Execute the tool
-                function_response = await self._execute_tool(function_name, function_args)
+                with span(f"mcp_tool.{function_name}", iteration=iteration):
+                    function_response = await self._execute_tool(function_name, function_args)
                 
                 logger.info(f"📊 MCP Tool Response: {function_response}")
                 response_data = json.loads(function_response)
@@ -489,14 +509,15 @@ class MCPLLMClient(LLMClient):
                 })
             
             # Get next response
-            response = await self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=messages,
-                tools=self._get_mcp_tools(),
-                tool_choice="auto",
-                temperature=0.3,
-                max_tokens=1000
-            )
+            with span("mcp_turn", iteration=iteration + 1):
+                response = await self._dispatch_pooled(lambda deployment: deployment.client.chat.completions.create(
+                    model=deployment.name,
+                    messages=messages,
+                    tools=self._get_mcp_tools(),
+                    tool_choice="auto",
+                    temperature=0.3,
+                    max_tokens=max_tokens
+                ), "translate_tool_turn", self._estimate_messages_tokens(messages, max_tokens))
             
             iteration += 1
         
@@ -505,7 +526,8 @@ class MCPLLMClient(LLMClient):
         
         # Validate translation completeness
         if not self._validate_translation(text, final_translation):
-            final_translation = await self._retry_translation(text, final_translation, target_language, source_language)
+            with span("mcp_retry_translation"):
+                final_translation = await self._retry_translation(text, final_translation, target_language, source_language)
         
         # Return dict with metadata for MCP
         return {
@@ -524,6 +546,15 @@ class MCPLLMClient(LLMClient):
         """Extract terms - delegate to existing Azure client for now"""
         # For term extraction, we can reuse the existing implementation
         # or implement MCP-based extraction later
-        from .client import AzureOpenAIClient
-        azure_client = AzureOpenAIClient()
-        return await azure_client.extract_terms(text, translation, target_language)
\ No newline at end of file
+        from .client import EXTRACTION_PROMPT_VERSION
+        from ..glossary.extraction_cache import get_extraction_cache, describe_model
+        azure_client = get_registry().get_client(provider="azure")
+        terms = await get_extraction_cache().get_or_extract(
+            text,
+            translation,
+            target_language,
+            extract=lambda: azure_client.extract_terms(text, translation, target_language),
+            prompt_version=EXTRACTION_PROMPT_VERSION,
+            model=describe_model(azure_client)
+        )
+        return json.dumps(terms, ensure_ascii=False)
\ No newline at end of file
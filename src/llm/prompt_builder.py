@@ -0,0 +1,181 @@
+"""
+Token-budgeted prompt assembly.
+
+Glossary and memory context is ranked by value (glossary terms that literally
+occur in the source first, then memory matches by similarity) and added until
+the configured input token budget is spent. The output budget (max_tokens) is
+derived from the source length instead of a flat 1000.
+"""
+import re
+import logging
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from ..core.config import settings
+from ..glossary.models import GlossaryMatch
+from ..memory.models import TranslationMatch
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class BuiltPrompt(BaseModel):
+    """A prompt with its token accounting"""
+    prompt: str
+    input_tokens: int = 0
+    max_tokens: int = 0
+    glossary_used: int = 0
+    glossary_dropped: int = 0
+    memory_used: int = 0
+    memory_dropped: int = 0
+
+
+class PromptBuilder:
+    """Builds translation prompts within an input token budget"""
+
+    def __init__(self, model: Optional[str] = None, input_budget: int = None):
+        self.model = model
+        self.input_budget = input_budget or settings.prompt_input_token_budget
+        self.stats = {"requests": 0, "input_tokens": 0, "max_tokens": 0, "context_dropped": 0}
+
+    def count(self, text: str) -> int:
+        """Count tokens for this builder's model"""
+        return count_tokens(text, self.model)
+
+    def max_output_tokens(self, text: str, minimum: int = None) -> int:
+        """Output budget for translating text, proportional to its token count"""
+        estimate = int(self.count(text) * settings.prompt_output_token_ratio) + 16
+        floor = max(minimum or 0, settings.prompt_min_output_tokens)
+        return max(floor, min(estimate, settings.prompt_max_output_tokens))
+
+    @staticmethod
+    def rank_glossary(glossary_matches: List[GlossaryMatch], text: str) -> List[GlossaryMatch]:
+        """Exact glossary hits (term occurs in the source) first, then by confidence"""
+        def is_exact(match: GlossaryMatch) -> bool:
+            return bool(re.search(r'\b' + re.escape(match.term) + r'\b', text, re.IGNORECASE))
+        return sorted(glossary_matches, key=lambda m: (not is_exact(m), -m.confidence))
+
+    @staticmethod
+    def rank_memory(memory_matches: List[TranslationMatch]) -> List[TranslationMatch]:
+        """Highest-similarity memory matches first"""
+        return sorted(memory_matches, key=lambda m: m.similarity_score, reverse=True)
+
+    def fit_lines(self, lines: List[str], budget: int) -> List[str]:
+        """Keep lines in order while they fit within a token budget"""
+        kept = []
+        used = 0
+        for line in lines:
+            tokens = self.count(line) + 1
+            if used + tokens > budget:
+                break
+            kept.append(line)
+            used += tokens
+        return kept
+
+    def build(
+        self,
+        text: str,
+        target_language: str,
+        source_language: str,
+        glossary_matches: List[GlossaryMatch],
+        memory_matches: List[TranslationMatch],
+        domain: Optional[str] = None
+    ) -> BuiltPrompt:
+        """
+        Build an MCP-style translation prompt within the input budget.
+
+        Args:
+            text: Text to translate
+            target_language: Target language code
+            source_language: Source language code
+            glossary_matches: Glossary context
+            memory_matches: Translation memory context
+            domain: Optional domain context
+
+        Returns:
+            BuiltPrompt with the prompt text and its token counts
+        """
+        header = [f"Translate the following text from {source_language} to {target_language}:"]
+        if domain:
+            header.append(f"Domain: {domain}")
+
+        footer = [
+            "\nTranslation Instructions:",
+            "- Maintain the original meaning and tone",
+            "- Use the provided glossary terms exactly as specified",
+            "- Follow the style shown in the translation memory examples",
+            "- IMPORTANT: Return ONLY the translated text without ANY explanation, introduction, or additional commentary",
+            f"\nText to translate: {text}"
+        ]
+
+        # Instructions and source text are always sent; context fills what is left
+        remaining = self.input_budget - self.count("\n".join(header + footer))
+
+        glossary_lines = []
+        glossary_used = 0
+        ranked_glossary = [m for m in self.rank_glossary(glossary_matches, text) if m.prefered_translation]
+        for match in ranked_glossary:
+            line = f"- {match.term} → {match.prefered_translation}"
+            with_note = f"{line}\n  Note: {match.notes}" if match.notes else line
+            tokens = self.count(with_note) + 1
+            if tokens > remaining and with_note != line:
+                # Keep the term even when its note does not fit
+                with_note, tokens = line, self.count(line) + 1
+            if tokens > remaining:
+                break
+            glossary_lines.append(with_note)
+            glossary_used += 1
+            remaining -= tokens
+
+        memory_lines = []
+        memory_used = 0
+        for match in self.rank_memory(memory_matches):
+            entry = f"- Source: {match.source_text}\n  Translation: {match.target_text}\n  Confidence: {match.confidence}"
+            tokens = self.count(entry) + 1
+            if tokens > remaining:
+                break
+            memory_lines.append(entry)
+            memory_used += 1
+            remaining -= tokens
+
+        prompt_parts = list(header)
+        if glossary_lines:
+            prompt_parts.append("\nGlossary Terms:")
+            prompt_parts.extend(glossary_lines)
+        if memory_lines:
+            prompt_parts.append("\nTranslation Memory Matches:")
+            prompt_parts.extend(memory_lines)
+        prompt_parts.extend(footer)
+        prompt = "\n".join(prompt_parts)
+
+        built = BuiltPrompt(
+            prompt=prompt,
+            input_tokens=self.count(prompt),
+            max_tokens=self.max_output_tokens(text),
+            glossary_used=glossary_used,
+            glossary_dropped=len(ranked_glossary) - glossary_used,
+            memory_used=memory_used,
+            memory_dropped=len(memory_matches) - memory_used
+        )
+        self.record(built)
+        return built
+
+    def record(self, built: BuiltPrompt) -> None:
+        """Log and accumulate the token counts of one request"""
+        self.stats["requests"] += 1
+        self.stats["input_tokens"] += built.input_tokens
+        self.stats["max_tokens"] += built.max_tokens
+        self.stats["context_dropped"] += built.glossary_dropped + built.memory_dropped
+        logger.info(
+            f"🧮 Prompt: {built.input_tokens} input tokens (budget {self.input_budget}), "
+            f"max_tokens={built.max_tokens}, glossary {built.glossary_used}/{built.glossary_used + built.glossary_dropped}, "
+            f"memory {built.memory_used}/{built.memory_used + built.memory_dropped}"
+        )
+
+    def get_stats(self) -> dict:
+        """Get average prompt sizes"""
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "avg_input_tokens": self.stats["input_tokens"] / requests if requests else 0.0,
+            "avg_max_tokens": self.stats["max_tokens"] / requests if requests else 0.0
+        }
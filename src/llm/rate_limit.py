@@ -0,0 +1,239 @@
+"""
+Requests-per-minute and tokens-per-minute limiting shared by every LLM caller.
+
+Azure deployments are metered on both RPM and TPM. Every dispatched call takes
+one request and its estimated tokens (prompt + max_tokens) from the deployment's
+token buckets before it is sent, waiting for capacity instead of failing with
+429s. Once the response arrives the estimate is reconciled with the provider's
+reported usage.
+
+Buckets live in memory by default. With LLM_RATE_LIMIT_DB set they are kept in
+a small SQLite file so several processes (CLI runs, the API, the glossary
+builder) share one budget per deployment; its updates wait on a cross-process
+lock, so they run in a worker thread instead of on the event loop.
+"""
+import time
+import sqlite3
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_usage(result: Any) -> Optional[Tuple[int, int]]:
+    """(input, output) tokens reported by a provider response (OpenAI, Anthropic, Ollama/completions JSON), if any"""
+    usage = result.get("usage") if isinstance(result, dict) else getattr(result, "usage", None)
+    if usage is None:
+        if isinstance(result, dict) and "eval_count" in result:
+            return int(result.get("prompt_eval_count", 0)), int(result["eval_count"])
+        return None
+
+    def field(name):
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        return value if isinstance(value, int) else None
+
+    input_tokens = field("input_tokens") or field("prompt_tokens")
+    output_tokens = field("output_tokens") or field("completion_tokens")
+    if input_tokens is None and output_tokens is None:
+        total = field("total_tokens")
+        # Only a total is known; count it as input
+        return (total, 0) if total is not None else None
+    return input_tokens or 0, output_tokens or 0
+
+
+def get_usage_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported by a provider response, if any"""
+    usage = get_usage(result)
+    return sum(usage) if usage is not None else None
+
+
+class MemoryBucketStore:
+    """Token bucket levels held in this process"""
+
+    blocking = False
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, key: str, capacity: float, rate: float, amount: float) -> float:
+        """
+        Take amount from a bucket if available.
+
+        Returns:
+            0 if taken, otherwise seconds until the amount will be available
+        """
+        now = time.time()
+        level, updated = self._buckets.get(key, (capacity, now))
+        level = min(capacity, level + (now - updated) * rate)
+        if level >= amount:
+            self._buckets[key] = (level - amount, now)
+            return 0.0
+        self._buckets[key] = (level, now)
+        return (amount - level) / rate
+
+    def adjust(self, key: str, capacity: float, rate: float, delta: float) -> None:
+        """Add (refund) or remove (debt) tokens without waiting"""
+        now = time.time()
+        level, updated = self._buckets.get(key, (capacity, now))
+        level = min(capacity, level + (now - updated) * rate)
+        self._buckets[key] = (min(capacity, level + delta), now)
+
+
+class SQLiteBucketStore:
+    """Token bucket levels shared between processes through a SQLite file"""
+
+    # Every update may wait up to the connect timeout for another process's write lock
+    blocking = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path, timeout=10) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    key TEXT PRIMARY KEY,
+                    level REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+    def _update(self, key: str, capacity: float, rate: float, change) -> float:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        try:
+            # IMMEDIATE takes the write lock up front so the read-modify-write is atomic across processes
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT level, updated FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            level, updated = row if row else (capacity, now)
+            level = min(capacity, level + (now - updated) * rate)
+            level, wait = change(level)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_buckets (key, level, updated) VALUES (?, ?, ?)",
+                (key, level, now)
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def take(self, key: str, capacity: float, rate: float, amount: float) -> float:
+        def change(level):
+            if level >= amount:
+                return level - amount, 0.0
+            return level, (amount - level) / rate
+        return self._update(key, capacity, rate, change)
+
+    def adjust(self, key: str, capacity: float, rate: float, delta: float) -> None:
+        self._update(key, capacity, rate, lambda level: (min(capacity, level + delta), 0.0))
+
+
+class DeploymentRateLimiter:
+    """RPM and TPM token buckets for one deployment"""
+
+    def __init__(self, name: str, rpm: int, tpm: int, store):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store
+        self.stats = {"requests": 0, "waits": 0, "wait_seconds": 0.0, "estimated_tokens": 0, "actual_tokens": 0}
+
+    async def _take(self, bucket: str, capacity: float, amount: float) -> float:
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.take, f"{self.name}:{bucket}", capacity, capacity / 60.0, amount)
+        return self.store.take(f"{self.name}:{bucket}", capacity, capacity / 60.0, amount)
+
+    async def _adjust(self, bucket: str, capacity: float, delta: float) -> None:
+        if self.store.blocking:
+            await asyncio.to_thread(self.store.adjust, f"{self.name}:{bucket}", capacity, capacity / 60.0, delta)
+        else:
+            self.store.adjust(f"{self.name}:{bucket}", capacity, capacity / 60.0, delta)
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """Wait until one request and estimated_tokens fit within the deployment's limits"""
+        # A request larger than the whole minute budget is charged the full bucket
+        tokens = min(estimated_tokens, self.tpm) if self.tpm else 0
+        waited = 0.0
+        while True:
+            wait = 0.0
+            if self.rpm:
+                wait = await self._take("rpm", self.rpm, 1)
+            if not wait and tokens:
+                wait = await self._take("tpm", self.tpm, tokens)
+                if wait and self.rpm:
+                    # Return the request slot while waiting for token capacity
+                    await self._adjust("rpm", self.rpm, 1)
+            if not wait:
+                break
+            waited += wait
+            await asyncio.sleep(wait)
+
+        self.stats["requests"] += 1
+        self.stats["estimated_tokens"] += estimated_tokens
+        if waited:
+            self.stats["waits"] += 1
+            self.stats["wait_seconds"] += waited
+            logger.debug(f"🪣 Waited {waited:.2f}s for rate-limit capacity on {self.name}")
+
+    async def reconcile(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the TPM bucket once the provider has reported the real token usage"""
+        if actual_tokens is None:
+            return
+        self.stats["actual_tokens"] += actual_tokens
+        if self.tpm:
+            charged = min(estimated_tokens, self.tpm)
+            await self._adjust("tpm", self.tpm, charged - actual_tokens)
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "rpm": self.rpm, "tpm": self.tpm}
+
+
+def parse_rate_limit_overrides(value: str) -> Dict[str, Tuple[int, int]]:
+    """Parse 'deployment=rpm/tpm,...' (0 means unlimited)"""
+    overrides = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, _, limits = entry.partition("=")
+        rpm, _, tpm = limits.partition("/")
+        overrides[name.strip()] = (int(rpm or 0), int(tpm or 0))
+    return overrides
+
+
+_store = None
+_limiters: Dict[str, Optional[DeploymentRateLimiter]] = {}
+
+
+def get_rate_limiter(deployment: str) -> Optional[DeploymentRateLimiter]:
+    """
+    Get the rate limiter for a deployment, or None when it has no RPM/TPM limit.
+
+    Overrides in LLM_RATE_LIMIT_OVERRIDES match either the full deployment key
+    (e.g. 'AzureOpenAIClient:gpt-4') or the deployment/model name ('gpt-4').
+    """
+    global _store
+    if deployment in _limiters:
+        return _limiters[deployment]
+
+    overrides = parse_rate_limit_overrides(settings.llm_rate_limit_overrides)
+    rpm, tpm = overrides.get(
+        deployment,
+        overrides.get(deployment.split(":", 1)[-1], (settings.llm_rate_limit_rpm, settings.llm_rate_limit_tpm))
+    )
+    if not rpm and not tpm:
+        _limiters[deployment] = None
+        return None
+
+    if _store is None:
+        _store = SQLiteBucketStore(settings.llm_rate_limit_db) if settings.llm_rate_limit_db else MemoryBucketStore()
+    limiter = _limiters[deployment] = DeploymentRateLimiter(deployment, rpm, tpm, _store)
+    logger.info(f"🪣 Rate limit for {deployment}: {rpm or '∞'} RPM, {tpm or '∞'} TPM")
+    return limiter
+
+
+def get_rate_limit_stats() -> Dict[str, dict]:
+    """Counters of every rate-limited deployment"""
+    return {name: limiter.get_stats() for name, limiter in _limiters.items() if limiter}
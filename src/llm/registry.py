@@ -0,0 +1,125 @@
+"""
+Process-wide registry of long-lived LLM clients and shared HTTP connection pools.
+
+Creating an SDK client per call pays a TLS handshake per segment and loses
+keep-alive. The registry hands out one client per provider/deployment and one
+tuned httpx pool (sync and async) shared by every caller, and closes them all
+on shutdown.
+"""
+import logging
+import importlib.util
+from typing import Dict, Optional, Tuple
+import httpx
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClientRegistry:
+    """Hands out shared LLM clients keyed by provider/deployment"""
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], object] = {}
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._sync_http_client: Optional[httpx.Client] = None
+        self._azure_pool = None
+
+    def _pool_options(self) -> dict:
+        """httpx options shared by the sync and async pools"""
+        http2 = settings.llm_http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("⚠️ HTTP/2 requested but the 'h2' package is not installed - using HTTP/1.1")
+            http2 = False
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry
+            ),
+            "timeout": httpx.Timeout(settings.llm_request_timeout, connect=settings.llm_connect_timeout),
+            "http2": http2
+        }
+
+    def get_async_http_client(self) -> httpx.AsyncClient:
+        """Get the shared async connection pool"""
+        if self._async_http_client is None or self._async_http_client.is_closed:
+            self._async_http_client = httpx.AsyncClient(**self._pool_options())
+        return self._async_http_client
+
+    def get_sync_http_client(self) -> httpx.Client:
+        """Get the shared sync connection pool"""
+        if self._sync_http_client is None or self._sync_http_client.is_closed:
+            self._sync_http_client = httpx.Client(**self._pool_options())
+        return self._sync_http_client
+
+    def get_azure_pool(self):
+        """Get the shared Azure OpenAI deployment pool (one deployment unless AZURE_OPENAI_DEPLOYMENTS is set)"""
+        from .deployment_pool import AzureDeploymentPool, load_deployment_configs
+
+        if self._azure_pool is None:
+            self._azure_pool = AzureDeploymentPool(load_deployment_configs(), http_client=self.get_async_http_client())
+        return self._azure_pool
+
+    @staticmethod
+    def _deployment_for(provider: str) -> str:
+        """Name of the deployment/model a provider's client talks to"""
+        if provider == "azure":
+            return settings.azure_openai_deployment_name
+        if provider == "local":
+            return settings.local_model_name
+        if provider in ("fake", "replay"):
+            return provider
+        return settings.model_name
+
+    def get_client(self, provider: str = None):
+        """
+        Get the shared LLM client for a provider, creating it on first use.
+
+        Args:
+            provider: Provider name (default: settings.llm_provider)
+
+        Returns:
+            Long-lived LLMClient instance
+        """
+        from .client import LLMFactory
+
+        provider = provider or settings.llm_provider
+        key = (provider, self._deployment_for(provider))
+        client = self._clients.get(key)
+        if client is None:
+            client = LLMFactory.create_client(provider=provider, backend="azure")
+            self._clients[key] = client
+            logger.debug(f"🔌 Registered shared LLM client: {key[0]}/{key[1]}")
+        return client
+
+    async def aclose(self) -> None:
+        """Close every registered client and the shared connection pools"""
+        for key, client in list(self._clients.items()):
+            close = getattr(client, "aclose", None)
+            if close:
+                try:
+                    await close()
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to close LLM client {key}: {e}")
+        self._clients.clear()
+        self._azure_pool = None
+
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+        if self._sync_http_client is not None:
+            self._sync_http_client.close()
+            self._sync_http_client = None
+        logger.debug("🔌 LLM client registry closed")
+
+
+_registry: Optional[LLMClientRegistry] = None
+
+
+def get_registry() -> LLMClientRegistry:
+    """Get the process-wide LLM client registry"""
+    global _registry
+    if _registry is None:
+        _registry = LLMClientRegistry()
+    return _registry
@@ -0,0 +1,400 @@
+"""
+Shared retry, backoff and circuit-breaker layer for every LLM call.
+
+Every SDK/HTTP call made by the LLM clients goes through LLMDispatcher.call:
+
+- 429 and 5xx responses, timeouts and connection errors are retried with
+  exponential backoff and full jitter, honouring Retry-After when the server
+  sends it, within a bounded total retry time per request.
+- Each deployment has a circuit breaker. After repeated failures it opens and
+  fails calls immediately (CircuitOpenError) instead of piling up timeouts,
+  then lets a single probe through once the reset timeout has passed.
+- Each attempt holds a slot of the deployment's adaptive concurrency limiter
+  (see concurrency.py), which is told about latency, throttling and errors.
+- Each attempt first waits for RPM/TPM capacity (see rate_limit.py) and the
+  estimated tokens are reconciled with the response's usage afterwards.
+- Each call's token usage is recorded in the usage ledger (see
+  usage_ledger.py), including failed and cancelled calls at their estimate.
+
+The SDK clients are created with max_retries=0 so retries happen only here.
+"""
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from ..core.config import settings
+from ..core.metrics import get_metrics
+from ..core.tracing import span
+from .concurrency import get_limiter, get_limiter_stats
+from .rate_limit import get_rate_limiter, get_rate_limit_stats, get_usage
+from .usage_ledger import get_usage_ledger
+
+logger = logging.getLogger(__name__)
+
+LLM_CALLS = get_metrics().counter("llm_calls_total", "LLM calls by final outcome", ["deployment", "operation", "outcome"])
+LLM_CALL_SECONDS = get_metrics().histogram("llm_call_duration_seconds", "LLM call duration including retries", ["deployment"])
+LLM_ERRORS = get_metrics().counter("llm_errors_total", "Failed LLM attempts by status code or error type", ["deployment", "status"])
+LLM_RETRIES = get_metrics().counter("llm_retries_total", "LLM attempts retried after a transient error", ["deployment"])
+LLM_TOKENS = get_metrics().counter("llm_tokens_total", "Tokens reported by providers", ["deployment", "kind"])
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a deployment's circuit breaker is open and calls are being shed"""
+
+    def __init__(self, deployment: str, retry_in: float):
+        super().__init__(f"Circuit open for LLM deployment '{deployment}' (retry in {retry_in:.1f}s)")
+        self.deployment = deployment
+        self.retry_in = retry_in
+
+
+def get_status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of an SDK/HTTP error (openai, anthropic, httpx, aiohttp), if any"""
+    for attr in ("status_code", "status"):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int):
+            return status
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def get_retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds to wait from the error's Retry-After / retry-after-ms headers, if present"""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an error is transient (throttling, server error, timeout or connection failure)"""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = get_status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    # SDK connection/timeout errors carry no status code
+    name = type(exc).__name__
+    return any(marker in name for marker in ("Timeout", "Connection", "ServerDisconnected"))
+
+
+def is_billable(exc: BaseException) -> bool:
+    """Whether a failed attempt probably consumed tokens (server errors and timeouts, not throttling or bad requests)"""
+    status = get_status_code(exc)
+    return status is None or status >= 500
+
+
+def record_usage(
+    deployment: str,
+    operation: str,
+    input_tokens: int,
+    output_tokens: int,
+    attempts: int,
+    estimated: bool,
+    outcome: str = "success",
+    counts_as_call: bool = True
+) -> None:
+    """Write one call to the usage ledger, when it is enabled"""
+    ledger = get_usage_ledger()
+    if ledger:
+        ledger.record(
+            deployment, operation, input_tokens, output_tokens, attempts,
+            estimated=estimated, outcome=outcome, counts_as_call=counts_as_call
+        )
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one deployment"""
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.llm_circuit_failure_threshold
+        self.reset_timeout = reset_timeout or settings.llm_circuit_reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must be shed"""
+        if self.state == "closed":
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == "open" and elapsed >= self.reset_timeout:
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open" and not self._probe_in_flight:
+            # Let exactly one probe through
+            self._probe_in_flight = True
+            return
+        raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - elapsed))
+
+    def release_probe(self) -> None:
+        """Give up a half-open probe without a verdict (the call was cancelled), so the next call can probe"""
+        if self.state == "half_open":
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info(f"✅ Circuit closed for {self.name}")
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"🔌 Circuit opened for {self.name} after {self.failures} failure(s)")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def get_stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class LLMDispatcher:
+    """Runs LLM calls with retries, backoff and per-deployment circuit breakers"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "shed": 0}
+
+    def get_breaker(self, deployment: str) -> CircuitBreaker:
+        breaker = self._breakers.get(deployment)
+        if breaker is None:
+            breaker = self._breakers[deployment] = CircuitBreaker(deployment)
+        return breaker
+
+    @staticmethod
+    def backoff_delay(attempt: int) -> float:
+        """Exponential backoff with full jitter for a 1-based retry attempt"""
+        ceiling = min(settings.llm_retry_max_delay, settings.llm_retry_base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    async def call(
+        self,
+        deployment: str,
+        fn: Callable[[], Awaitable[T]],
+        operation: str = "llm",
+        estimated_tokens: int = 0,
+        max_attempts: Optional[int] = None
+    ) -> T:
+        """
+        Run one LLM call with retries.
+
+        Args:
+            deployment: Deployment/model identifier, one circuit breaker per value
+            fn: Coroutine factory making the call (invoked once per attempt)
+            operation: Name used in logs (e.g. 'translate', 'extract_terms')
+            estimated_tokens: Prompt + max output tokens charged against the TPM limit
+            max_attempts: Override of LLM_RETRY_MAX_ATTEMPTS (e.g. 1 when another deployment can take over)
+
+        Returns:
+            The call's result
+
+        Raises:
+            CircuitOpenError: If the deployment's circuit is open
+            Exception: The last error once retries are exhausted or for non-retryable errors
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with span("llm_call", deployment=deployment, operation=operation):
+                result = await self._call_with_retries(deployment, fn, operation, estimated_tokens, max_attempts)
+            outcome = "success"
+            return result
+        except CircuitOpenError:
+            outcome = "shed"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            LLM_CALLS.inc(deployment=deployment, operation=operation, outcome=outcome)
+            LLM_CALL_SECONDS.observe(time.perf_counter() - started, deployment=deployment)
+
+    async def _call_with_retries(
+        self,
+        deployment: str,
+        fn: Callable[[], Awaitable[T]],
+        operation: str,
+        estimated_tokens: int,
+        max_attempts: Optional[int]
+    ) -> T:
+        breaker = self.get_breaker(deployment)
+        limiter = get_limiter(deployment) if settings.llm_adaptive_concurrency else None
+        rate_limiter = get_rate_limiter(deployment)
+        deadline = time.monotonic() + settings.llm_retry_total_timeout
+        attempt = 0
+        # Attempts sent to the provider, and those among them that failed or were cancelled but were likely billed
+        sent = 0
+        wasted = 0
+        max_attempts = max_attempts or settings.llm_retry_max_attempts
+        self.stats["calls"] += 1
+
+        try:
+            while True:
+                try:
+                    breaker.before_call()
+                except CircuitOpenError:
+                    self.stats["shed"] += 1
+                    raise
+
+                if rate_limiter:
+                    try:
+                        with span("llm_rate_limit_wait"):
+                            await rate_limiter.acquire(estimated_tokens)
+                    except BaseException:
+                        breaker.release_probe()
+                        raise
+
+                started = time.monotonic()
+                in_call = False
+                try:
+                    if limiter:
+                        async with limiter.slot():
+                            started = time.monotonic()
+                            sent, in_call = sent + 1, True
+                            result = await fn()
+                    else:
+                        sent, in_call = sent + 1, True
+                        result = await fn()
+                except Exception as e:
+                    retryable = is_retryable(e)
+                    LLM_ERRORS.inc(deployment=deployment, status=get_status_code(e) or type(e).__name__)
+                    if is_billable(e):
+                        wasted += 1
+                    if rate_limiter and get_status_code(e) == 429:
+                        # Throttled requests are not billed against TPM
+                        await rate_limiter.reconcile(estimated_tokens, 0)
+                    if retryable:
+                        breaker.record_failure()
+                        if limiter:
+                            limiter.on_congestion(f"{type(e).__name__} status={get_status_code(e)}")
+                    else:
+                        # The deployment answered; the request itself was bad
+                        breaker.record_success()
+
+                    attempt += 1
+                    delay = get_retry_after(e) if retryable else None
+                    if delay is None:
+                        delay = self.backoff_delay(attempt)
+
+                    if (
+                        not retryable
+                        or attempt >= max_attempts
+                        or time.monotonic() + delay > deadline
+                    ):
+                        self.stats["failures"] += 1
+                        raise
+
+                    self.stats["retries"] += 1
+                    LLM_RETRIES.inc(deployment=deployment)
+                    logger.warning(
+                        f"⏳ {operation} on {deployment} failed ({type(e).__name__}: status={get_status_code(e)}), "
+                        f"retry {attempt}/{max_attempts - 1} in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                except BaseException:
+                    # Cancelled (a losing hedge, a speculative call overtaken by memory): no verdict on the
+                    # deployment, but a half-open probe must not stay claimed or every later call is shed
+                    breaker.release_probe()
+                    if in_call:
+                        wasted += 1
+                    raise
+
+                breaker.record_success()
+                if limiter:
+                    limiter.on_success(time.monotonic() - started, operation)
+                usage = get_usage(result)
+                if usage is not None:
+                    LLM_TOKENS.inc(usage[0], deployment=deployment, kind="input")
+                    LLM_TOKENS.inc(usage[1], deployment=deployment, kind="output")
+                if rate_limiter:
+                    await rate_limiter.reconcile(estimated_tokens, sum(usage) if usage is not None else None)
+                # Streams and some local servers report no usage; fall back to the pre-call estimate
+                input_tokens, output_tokens = usage if usage is not None else (estimated_tokens, 0)
+                record_usage(deployment, operation, input_tokens, output_tokens, attempt + 1, usage is None)
+                if wasted:
+                    # Failed attempts before the success: their spend, without counting another call
+                    record_usage(deployment, operation, estimated_tokens * wasted, 0, 0, True, "error", counts_as_call=False)
+                return result
+        except Exception:
+            if sent:
+                record_usage(deployment, operation, estimated_tokens * wasted, 0, attempt, True, "error")
+            raise
+        except BaseException:
+            if sent:
+                record_usage(deployment, operation, estimated_tokens * wasted, 0, sent, True, "cancelled")
+            raise
+
+    def get_stats(self) -> dict:
+        """Get retry counters, circuit states, concurrency and rate limits per deployment"""
+        return {
+            **self.stats,
+            "circuits": {name: breaker.get_stats() for name, breaker in self._breakers.items()},
+            "concurrency": get_limiter_stats(),
+            "rate_limits": get_rate_limit_stats()
+        }
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Get the process-wide LLM dispatcher"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = LLMDispatcher()
+    return _dispatcher
+
+
+def _collect_llm_metrics(registry) -> None:
+    """Scrape-time gauges for concurrency, rate limiting and circuit state"""
+    limit = registry.gauge("llm_concurrency_limit", "Current adaptive concurrency limit", ["deployment"])
+    in_flight = registry.gauge("llm_in_flight", "LLM calls holding a concurrency slot", ["deployment"])
+    waiting = registry.gauge("llm_queue_waiting", "LLM calls queued for a concurrency slot", ["deployment"])
+    rate_waits = registry.gauge("llm_rate_limit_wait_seconds", "Total time spent waiting for RPM/TPM capacity", ["deployment"])
+    circuit_open = registry.gauge("llm_circuit_open", "1 when the deployment's circuit breaker is not closed", ["deployment"])
+    for gauge in (limit, in_flight, waiting, rate_waits, circuit_open):
+        gauge.clear()
+    for name, stats in get_limiter_stats().items():
+        limit.set(stats["limit"], deployment=name)
+        in_flight.set(stats["in_flight"], deployment=name)
+        waiting.set(stats["waiting"], deployment=name)
+    for name, stats in get_rate_limit_stats().items():
+        rate_waits.set(stats["wait_seconds"], deployment=name)
+    if _dispatcher is not None:
+        for name, breaker in _dispatcher._breakers.items():
+            circuit_open.set(breaker.state != "closed", deployment=name)
+
+
+get_metrics().register_collector("llm", _collect_llm_metrics)
@@ -0,0 +1,41 @@
+"""
+Token counting helpers backed by tiktoken.
+
+Falls back to a ~4 characters per token estimate when tiktoken or its
+encoding files are unavailable (e.g. air-gapped runs).
+"""
+import logging
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: Optional[str] = None):
+    """Get the tiktoken encoding for a model, or None if tiktoken cannot be used"""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("⚠️ tiktoken not installed - estimating token counts from text length")
+        return None
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+        except KeyError:
+            # Unknown model names (e.g. Azure deployment names) use the GPT-4 encoding
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load tiktoken encoding ({e}) - estimating token counts from text length")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count the tokens in text for a model"""
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,390 @@
+"""
+Token and cost ledger for every LLM call.
+
+LLMDispatcher records one row per call: the prompt and completion tokens the
+provider reported, the deployment, the number of attempts, the outcome and the
+context the call was made in. Failed and cancelled calls (exhausted retries,
+losing hedges, cancelled speculative calls) are recorded too, charged with the
+pre-call estimate for every attempt that reached the provider, so wasted spend
+shows up. Callers describe the context with usage_scope(), which nests and
+follows asyncio tasks:
+
+    with usage_scope(file="BUFR4/BUFRCREX_TableB_en_01.csv", language="es"):
+        ...                                     # every LLM call in here is attributed
+    with usage_scope(purpose="grammar_correction"):
+        ...                                     # overrides the dispatcher's operation name
+    with usage_scope(language="fr,es,ru"):
+        ...                                     # multi-target calls: tokens split evenly per language
+    with split_usage_scope([current_usage_scope() for each caller]):
+        ...                                     # one call serving several callers, split evenly
+
+Rows are buffered in memory and flushed to SQLite (USAGE_LEDGER_PATH) in small
+batches, so recording stays off the request's critical path. Costs are computed
+when summarising, from the per-1K-token prices in LLM_PRICING, so price
+changes apply to old rows too.
+
+    python -m src.llm.usage_ledger --run <run_id> --by file,language
+"""
+import os
+import json
+import time
+import atexit
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GROUP_COLUMNS = ("run_id", "file", "language", "purpose", "deployment", "outcome")
+
+# One id per process unless the CLI/API sets another with set_run_id()
+_run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+_scope: ContextVar[Dict[str, str]] = ContextVar("usage_scope", default={})
+# Scopes of the callers sharing the current call (a packed request serving several rows)
+_split: ContextVar[Optional[List[Dict[str, str]]]] = ContextVar("usage_split", default=None)
+
+
+def get_run_id() -> str:
+    """Run id attached to every ledger row of this process"""
+    return _run_id
+
+
+def set_run_id(run_id: str) -> None:
+    """Attribute the rest of this process's LLM calls to run_id"""
+    global _run_id
+    _run_id = run_id
+
+
+@contextmanager
+def usage_scope(**fields: Optional[str]) -> Iterator[None]:
+    """Attribute the enclosed LLM calls to a file, language and/or purpose (None values are ignored)"""
+    token = _scope.set({**_scope.get(), **{key: str(value) for key, value in fields.items() if value is not None}})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def current_usage_scope() -> Dict[str, str]:
+    """The fields usage_scope() has set here, e.g. to attribute work done later on this caller's behalf"""
+    return dict(_scope.get())
+
+
+@contextmanager
+def split_usage_scope(scopes: List[Dict[str, str]]) -> Iterator[None]:
+    """Split the enclosed LLM calls evenly across several callers' scopes (see current_usage_scope)"""
+    token = _split.set(list(scopes) or None)
+    try:
+        yield
+    finally:
+        _split.reset(token)
+
+
+def parse_pricing(value: str) -> Dict[str, Tuple[float, float]]:
+    """Parse LLM_PRICING: JSON {"model": [input_per_1k, output_per_1k], ...}"""
+    if not value:
+        return {}
+    try:
+        return {name: (float(prices[0]), float(prices[1])) for name, prices in json.loads(value).items()}
+    except (ValueError, TypeError, IndexError, AttributeError) as e:
+        logger.warning(f"⚠️ Ignoring invalid LLM_PRICING ({e})")
+        return {}
+
+
+def estimate_cost(deployment: str, input_tokens: int, output_tokens: int, pricing: Dict[str, Tuple[float, float]]) -> Optional[float]:
+    """
+    Cost of some tokens on a deployment, or None when it has no price.
+
+    Prices match either the full deployment key (e.g. 'AzureOpenAIClient:gpt-4')
+    or the deployment/model name ('gpt-4').
+    """
+    prices = pricing.get(deployment, pricing.get(deployment.split(":", 1)[-1]))
+    if prices is None:
+        return None
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1000
+
+
+class UsageLedger:
+    """LLM usage rows in a SQLite file"""
+
+    def __init__(self, db_path: str, flush_every: int = 50):
+        self.db_path = db_path
+        self.flush_every = flush_every
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path, timeout=10) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL NOT NULL,
+                    run_id TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    purpose TEXT NOT NULL,
+                    deployment TEXT NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    estimated INTEGER NOT NULL,
+                    outcome TEXT NOT NULL DEFAULT 'success',
+                    call_share REAL NOT NULL DEFAULT 1.0
+                )
+            """)
+            # Ledgers created before outcomes and multi-language splits were recorded
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(llm_usage)")}
+            if "outcome" not in existing:
+                conn.execute("ALTER TABLE llm_usage ADD COLUMN outcome TEXT NOT NULL DEFAULT 'success'")
+            if "call_share" not in existing:
+                conn.execute("ALTER TABLE llm_usage ADD COLUMN call_share REAL NOT NULL DEFAULT 1.0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_usage_run ON llm_usage(run_id)")
+
+    def record(
+        self,
+        deployment: str,
+        operation: str,
+        input_tokens: int,
+        output_tokens: int,
+        attempts: int = 1,
+        estimated: bool = False,
+        outcome: str = "success",
+        counts_as_call: bool = True
+    ) -> None:
+        """
+        Buffer one call, attributed to the current usage_scope().
+
+        Inside split_usage_scope() the call is split evenly across the given scopes. A
+        comma-separated scope language (a multi-target call) is recorded as one row per
+        language, with that scope's share of the tokens and the call split evenly
+        between them.
+
+        Args:
+            deployment: Deployment/model identifier
+            operation: Dispatcher operation, used as the purpose unless the scope sets one
+            input_tokens: Prompt tokens
+            output_tokens: Completion tokens
+            attempts: Attempts the call took
+            estimated: True when the provider reported no usage and the tokens are the pre-call estimate
+            outcome: 'success', 'error' (failed after retries) or 'cancelled'
+            counts_as_call: False for extra spend of a call already recorded (its failed retries)
+        """
+        scopes = _split.get() or [_scope.get()]
+        targets = []
+        for scope in scopes:
+            languages = [language for language in scope.get("language", "").split(",") if language] or [""]
+            targets.extend((scope, language, 1.0 / len(scopes) / len(languages)) for language in languages)
+
+        now = time.time()
+        rows = []
+        for index, (scope, language, weight) in enumerate(targets):
+            # Integer tokens: the first row takes the remainder; attempts are counted once
+            row_input, row_output = int(input_tokens * weight), int(output_tokens * weight)
+            if index == 0:
+                row_input = input_tokens - sum(int(input_tokens * w) for *_, w in targets[1:])
+                row_output = output_tokens - sum(int(output_tokens * w) for *_, w in targets[1:])
+            rows.append((
+                now, _run_id, scope.get("file", ""), language, scope.get("purpose", operation), deployment,
+                row_input, row_output, attempts if index == 0 else 0, int(estimated), outcome,
+                weight if counts_as_call else 0.0
+            ))
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) < self.flush_every:
+                return
+            rows, self._pending = self._pending, []
+        self._write(rows)
+
+    def flush(self) -> None:
+        """Write buffered rows"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._write(rows)
+
+    def _write(self, rows: List[tuple]) -> None:
+        try:
+            with sqlite3.connect(self.db_path, timeout=10) as conn:
+                conn.executemany("""
+                    INSERT INTO llm_usage (timestamp, run_id, file, language, purpose, deployment,
+                                           input_tokens, output_tokens, attempts, estimated, outcome, call_share)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Could not write {len(rows)} usage row(s): {e}")
+
+    def summary(
+        self,
+        run_id: Optional[str] = None,
+        group_by: Sequence[str] = ("file", "language", "purpose"),
+        since: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Calls, tokens and cost grouped by columns of GROUP_COLUMNS.
+
+        Args:
+            run_id: Only this run (all runs when None)
+            group_by: Columns to group by; deployment is always added for pricing
+            since: Only rows recorded after this Unix timestamp
+
+        Returns:
+            Dictionary with totals and one entry per group, most tokens first
+        """
+        self.flush()
+        unknown = [column for column in group_by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot group usage by {', '.join(unknown)} (choose from {', '.join(GROUP_COLUMNS)})")
+        columns = list(dict.fromkeys([*group_by, "deployment"]))
+
+        conditions, params = [], []
+        if run_id:
+            conditions.append("run_id = ?")
+            params.append(run_id)
+        if since:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with sqlite3.connect(self.db_path, timeout=10) as conn:
+            rows = conn.execute(f"""
+                SELECT {', '.join(columns)}, SUM(call_share), SUM(input_tokens), SUM(output_tokens),
+                       SUM(attempts), SUM(estimated * call_share),
+                       SUM(CASE WHEN outcome = 'error' THEN call_share ELSE 0 END),
+                       SUM(CASE WHEN outcome = 'cancelled' THEN call_share ELSE 0 END)
+                FROM llm_usage {where}
+                GROUP BY {', '.join(columns)}
+            """, params).fetchall()
+
+        pricing = parse_pricing(settings.llm_pricing)
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            values = dict(zip(columns, row))
+            calls, input_tokens, output_tokens, attempts, estimated, failed, cancelled = row[len(columns):]
+            key = tuple(values[column] for column in group_by)
+            group = groups.setdefault(key, {
+                **{column: values[column] for column in group_by},
+                "calls": 0, "attempts": 0, "estimated_calls": 0, "failed_calls": 0, "cancelled_calls": 0,
+                "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "unpriced_tokens": 0
+            })
+            # Calls split across languages count fractionally
+            group["calls"] += calls
+            group["attempts"] += attempts
+            group["estimated_calls"] += estimated
+            group["failed_calls"] += failed
+            group["cancelled_calls"] += cancelled
+            group["input_tokens"] += input_tokens
+            group["output_tokens"] += output_tokens
+            cost = estimate_cost(values["deployment"], input_tokens, output_tokens, pricing)
+            if cost is None:
+                group["unpriced_tokens"] += input_tokens + output_tokens
+            else:
+                group["cost"] += cost
+
+        ordered = sorted(groups.values(), key=lambda g: -(g["input_tokens"] + g["output_tokens"]))
+        totals = {
+            field: round(sum(group[field] for group in ordered), 6)
+            for field in (
+                "calls", "attempts", "estimated_calls", "failed_calls", "cancelled_calls",
+                "input_tokens", "output_tokens", "cost", "unpriced_tokens"
+            )
+        }
+        for group in ordered:
+            for field in ("calls", "estimated_calls", "failed_calls", "cancelled_calls"):
+                group[field] = round(group[field], 6)
+        return {"run_id": run_id, "group_by": list(group_by), "totals": totals, "groups": ordered}
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs with their call and token counts"""
+        self.flush()
+        with sqlite3.connect(self.db_path, timeout=10) as conn:
+            rows = conn.execute("""
+                SELECT run_id, MIN(timestamp), ROUND(SUM(call_share), 6), SUM(input_tokens), SUM(output_tokens)
+                FROM llm_usage GROUP BY run_id ORDER BY MIN(timestamp) DESC LIMIT ?
+            """, (limit,)).fetchall()
+        return [
+            {"run_id": run, "started": started, "calls": calls, "input_tokens": input_tokens, "output_tokens": output_tokens}
+            for run, started, calls, input_tokens, output_tokens in rows
+        ]
+
+
+_ledger: Optional[UsageLedger] = None
+
+
+def get_usage_ledger() -> Optional[UsageLedger]:
+    """Get the process-wide usage ledger, or None when USAGE_LEDGER_ENABLED is off"""
+    global _ledger
+    if not settings.usage_ledger_enabled:
+        return None
+    if _ledger is None or _ledger.db_path != settings.usage_ledger_path:
+        if _ledger is not None:
+            _ledger.flush()
+        _ledger = UsageLedger(settings.usage_ledger_path)
+        atexit.register(_ledger.flush)
+    return _ledger
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Plain-text table of a summary() result"""
+    group_by = summary["group_by"]
+    widths = [max([len(column)] + [len(str(group[column])) for group in summary["groups"]]) for column in group_by]
+    header = "  ".join(column.ljust(width) for column, width in zip(group_by, widths))
+    lines = [f"{header}  {'calls':>7} {'input':>10} {'output':>10} {'cost':>10}"]
+    for group in summary["groups"]:
+        label = "  ".join(str(group[column] or "-").ljust(width) for column, width in zip(group_by, widths))
+        cost = f"{group['cost']:.4f}" if not group["unpriced_tokens"] else f"{group['cost']:.4f}*"
+        lines.append(f"{label}  {group['calls']:>7g} {group['input_tokens']:>10} {group['output_tokens']:>10} {cost:>10}")
+    totals = summary["totals"]
+    label = "TOTAL".ljust(len(header))
+    lines.append(f"{label}  {totals['calls']:>7g} {totals['input_tokens']:>10} {totals['output_tokens']:>10} {totals['cost']:>10.4f}")
+    if totals["unpriced_tokens"]:
+        lines.append(f"* {totals['unpriced_tokens']} tokens on deployments without a price in LLM_PRICING")
+    if totals["estimated_calls"]:
+        lines.append(f"{totals['estimated_calls']:g} call(s) reported no usage (e.g. streams); their tokens are pre-call estimates")
+    if totals["failed_calls"] or totals["cancelled_calls"]:
+        lines.append(
+            f"{totals['failed_calls']:g} failed and {totals['cancelled_calls']:g} cancelled call(s) are included "
+            "at their estimated prompt + output tokens"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise LLM token usage and cost")
+    parser.add_argument("--run", help="Run id (default: the most recent run; 'all' for every run)")
+    parser.add_argument("--by", default="file,language,purpose", help=f"Comma-separated grouping columns from {', '.join(GROUP_COLUMNS)}")
+    parser.add_argument("--runs", action="store_true", help="List recent runs instead")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args()
+
+    ledger = UsageLedger(settings.usage_ledger_path)
+    if args.runs:
+        runs = ledger.runs()
+        if args.json:
+            print(json.dumps(runs, indent=2))
+        for run in [] if args.json else runs:
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started"]))
+            print(f"{run['run_id']:<32} {started}  {run['calls']:>7g} calls {run['input_tokens']:>10} in {run['output_tokens']:>10} out")
+        return
+
+    run_id = args.run
+    if run_id is None:
+        recent = ledger.runs(limit=1)
+        run_id = recent[0]["run_id"] if recent else None
+    elif run_id == "all":
+        run_id = None
+    summary = ledger.summary(run_id, [column.strip() for column in args.by.split(",") if column.strip()])
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"💰 LLM usage for run {run_id or 'all'}")
+        print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
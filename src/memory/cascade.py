@@ -0,0 +1,315 @@
+"""
+Cascaded translation memory lookup.
+
+Tries the memory tiers in cost order (literal -> normalized -> fuzzy -> semantic)
+and stops at the first tier whose best match clears that tier's threshold.
+Anything that falls through every tier is left to the LLM by the orchestrator.
+
+"at 2 m" and "at 3 m" are near-identical to edit distance and embeddings, so the
+fuzzy and semantic tiers never offer a match whose numbers or units differ from
+the query's - its translation would be reused with the wrong quantity.
+"""
+import re
+import time
+import logging
+import threading
+import unicodedata
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from .models import TranslationMatch, SearchResult
+from ..core.config import settings
+from ..core.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+TIER_LOOKUPS = get_metrics().counter("memory_tier_lookups_total", "Cascade tier attempts", ["tier", "result"])
+
+
+def parse_tier_order(value: str) -> List[str]:
+    """Parse a comma-separated tier list, e.g. 'literal,normalized,fuzzy,semantic,llm'"""
+    return [tier.strip().lower() for tier in (value or "").split(",") if tier.strip()]
+
+
+def parse_tier_thresholds(value: str) -> Dict[str, float]:
+    """Parse 'tier=threshold' pairs, e.g. 'literal=1.0,fuzzy=0.92'"""
+    thresholds = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        tier, threshold = item.split("=", 1)
+        try:
+            thresholds[tier.strip().lower()] = float(threshold)
+        except ValueError:
+            logger.warning(f"⚠️ Ignoring invalid cascade threshold: '{item}'")
+    return thresholds
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for formatting-insensitive comparison.
+    Lowercases, folds unicode, treats hyphens as spaces, drops wrapping
+    parentheses/brackets and trailing punctuation, and collapses whitespace.
+    """
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    normalized = re.sub(r"[\-‐-―_/]", " ", normalized)
+    normalized = re.sub(r"[()\[\]{}\"'`]", "", normalized)
+    normalized = normalized.strip().rstrip(".,;:")
+    return " ".join(normalized.split())
+
+
+def quantities(text: str) -> List[str]:
+    """Numbers in the text with the unit word right after each, e.g. ['2 m', '10 %'] for 'at 2 m (10 %)'"""
+    return [
+        f"{number.replace(',', '.')} {unit}".strip()
+        for number, unit in re.findall(r"(\d+(?:[.,]\d+)*)\s*([^\W\d_]+|[%°‰])?", normalize_text(text))
+    ]
+
+
+class CascadeLookup:
+    """Runs memory tiers cheapest-first with early exit and per-tier statistics"""
+
+    LOOKUP_TIERS = ("literal", "normalized", "fuzzy", "semantic")
+    TERMINAL_TIER = "llm"
+    # Tiers whose matches can differ from the query in numbers or units
+    APPROXIMATE_TIERS = ("fuzzy", "semantic")
+
+    def __init__(
+        self,
+        literal_search,
+        rag_search,
+        tm_manager=None,
+        tier_order: Optional[List[str]] = None,
+        thresholds: Optional[Dict[str, float]] = None
+    ):
+        self.literal_search = literal_search
+        self.rag_search = rag_search
+        self.tm_manager = tm_manager or getattr(rag_search, "tm_manager", None)
+
+        self.tier_order = tier_order or parse_tier_order(settings.cascade_tiers)
+        unknown = [t for t in self.tier_order if t not in self.LOOKUP_TIERS + (self.TERMINAL_TIER,)]
+        if unknown:
+            raise ValueError(f"Unknown cascade tier(s): {', '.join(unknown)}")
+
+        self.thresholds = parse_tier_thresholds(settings.cascade_thresholds)
+        self.thresholds.update(thresholds or {})
+
+        # Normalized index over the literal dictionaries: {(normalized_text, source_lang, target_lang): match}
+        self._normalized_index: Dict[Tuple[str, str, str], TranslationMatch] = {}
+        self._normalized_signature = None
+        # Rebuilt in full only when the dictionaries are (re)loaded; runtime additions (one per LLM
+        # translation) are queued on the event loop and applied by the next lookup's worker thread
+        self._pending_additions: Deque[Tuple[tuple, str, Dict[str, Any]]] = deque()
+        self._index_lock = threading.Lock()
+        self.literal_search.add_listener(self._queue_addition)
+
+        self.stats = {
+            tier: {"attempts": 0, "hits": 0, "total_time": 0.0}
+            for tier in self.tier_order
+        }
+
+    def lookup(
+        self,
+        query: str,
+        target_language: str,
+        source_language: str = "en"
+    ) -> SearchResult:
+        """
+        Look up a translation by walking the configured tiers in order.
+
+        Args:
+            query: Source text to look up
+            target_language: Target language code
+            source_language: Source language code (default: en)
+
+        Returns:
+            SearchResult from the first tier above its threshold (with ``tier`` set),
+            otherwise the best below-threshold candidates as context (``tier`` is None)
+        """
+        candidates: List[TranslationMatch] = []
+
+        for tier in self.tier_order:
+            if tier == self.TERMINAL_TIER:
+                break
+
+            start = time.perf_counter()
+            try:
+                result = getattr(self, f"_search_{tier}")(query, target_language, source_language)
+            except Exception as e:
+                logger.warning(f"⚠️ Cascade tier '{tier}' failed: {e}")
+                result = SearchResult()
+            elapsed = time.perf_counter() - start
+
+            eligible = result.matches
+            if tier in self.APPROXIMATE_TIERS and eligible:
+                # Other quantities can't be reused, but stay as LLM context below
+                query_quantities = quantities(query)
+                eligible = [m for m in eligible if quantities(m.source_text) == query_quantities]
+
+            best = max(eligible, key=lambda m: m.similarity_score) if eligible else None
+            hit = best is not None and best.similarity_score >= self.thresholds.get(tier, 1.0)
+            self.record(tier, elapsed, hit)
+
+            if hit:
+                logger.info(f"🪜 Cascade hit at '{tier}' tier (score {best.similarity_score:.2f}, {elapsed * 1000:.1f}ms)")
+                result.matches = eligible
+                result.tier = tier
+                return result
+
+            candidates.extend(result.matches)
+
+        # Nothing cleared its threshold - hand the best candidates to the LLM as context
+        unique = {}
+        for match in sorted(candidates, key=lambda m: m.similarity_score, reverse=True):
+            unique.setdefault((match.source_text, match.target_text), match)
+        matches = list(unique.values())[:settings.top_k_matches]
+
+        return SearchResult(
+            matches=matches,
+            total_matches=len(matches),
+            semantic_matches=len(matches)
+        )
+
+    def record(self, tier: str, elapsed: float, hit: bool = True) -> None:
+        """Record one attempt at a tier (the orchestrator records the terminal 'llm' tier)"""
+        tier_stats = self.stats.setdefault(tier, {"attempts": 0, "hits": 0, "total_time": 0.0})
+        tier_stats["attempts"] += 1
+        tier_stats["total_time"] += elapsed
+        if hit:
+            tier_stats["hits"] += 1
+        TIER_LOOKUPS.inc(tier=tier, result="hit" if hit else "miss")
+
+    def get_stats(self) -> dict:
+        """Get per-tier hit rates and average latency"""
+        tiers = {}
+        for tier, tier_stats in self.stats.items():
+            attempts = tier_stats["attempts"]
+            tiers[tier] = {
+                "attempts": attempts,
+                "hits": tier_stats["hits"],
+                "hit_rate": tier_stats["hits"] / attempts if attempts else 0.0,
+                "avg_latency_ms": (tier_stats["total_time"] / attempts * 1000) if attempts else 0.0,
+                "threshold": self.thresholds.get(tier)
+            }
+        return {"tier_order": self.tier_order, "tiers": tiers}
+
+    def _search_literal(self, query: str, target_language: str, source_language: str) -> SearchResult:
+        """Exact match in the file-specific dictionary, then the global dictionary"""
+        result = self.literal_search.search_literal(query, target_language, source_language)
+        if result.matches:
+            return result
+        return self.literal_search.search_global_literal(query, target_language, source_language)
+
+    def _search_normalized(self, query: str, target_language: str, source_language: str) -> SearchResult:
+        """Formatting-insensitive match against the literal dictionaries and the TM table"""
+        self._refresh_normalized_index()
+
+        match = self._normalized_index.get((normalize_text(query), source_language, target_language))
+        if match:
+            return SearchResult(
+                matches=[match.model_copy(update={"source_text": query})],
+                total_matches=1,
+                exact_matches=1
+            )
+
+        if self.tm_manager:
+            tm_matches = self.tm_manager.search_exact(query.strip(), target_language, source_language)
+            if tm_matches:
+                return SearchResult(
+                    matches=tm_matches[:1],
+                    total_matches=1,
+                    exact_matches=1
+                )
+
+        return SearchResult()
+
+    def _search_fuzzy(self, query: str, target_language: str, source_language: str) -> SearchResult:
+        """Edit-distance match against the normalized dictionary keys"""
+        from fuzzywuzzy import fuzz
+
+        self._refresh_normalized_index()
+        normalized_query = normalize_text(query)
+        if not normalized_query:
+            return SearchResult()
+        query_quantities = quantities(normalized_query)
+
+        # Only compare against keys of similar length - anything else cannot score high enough
+        min_len = len(normalized_query) * 0.7
+        max_len = len(normalized_query) / 0.7
+
+        best_key, best_score = None, 0
+        # A snapshot: runtime additions may be applied by another lookup thread meanwhile
+        for key in list(self._normalized_index):
+            text, src_lang, tgt_lang = key
+            if src_lang != source_language or tgt_lang != target_language:
+                continue
+            if not min_len <= len(text) <= max_len:
+                continue
+            if quantities(text) != query_quantities:
+                continue
+            score = fuzz.ratio(normalized_query, text)
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if not best_key:
+            return SearchResult()
+
+        match = self._normalized_index[best_key]
+        return SearchResult(
+            matches=[match.model_copy(update={"similarity_score": best_score / 100.0})],
+            total_matches=1,
+            semantic_matches=1
+        )
+
+    def _search_semantic(self, query: str, target_language: str, source_language: str) -> SearchResult:
+        """Embedding similarity search via RAG"""
+        return self.rag_search.search_similar(query, target_language, source_language)
+
+    def _queue_addition(self, key: tuple, target_text: str, metadata: Dict[str, Any]) -> None:
+        """LiteralDictionarySearch listener: queue a runtime addition for the normalized index"""
+        self._pending_additions.append((key, target_text, metadata))
+
+    def _refresh_normalized_index(self) -> None:
+        """Rebuild the normalized index after a dictionary (re)load, then apply queued runtime additions"""
+        with self._index_lock:
+            if self.literal_search.version != self._normalized_signature:
+                self._rebuild_normalized_index()
+            while self._pending_additions:
+                (_, source_lower, target_lang), target_text, metadata = self._pending_additions.popleft()
+                self._normalized_index[(normalize_text(source_lower), "en", target_lang)] = TranslationMatch(
+                    source_text=source_lower,
+                    target_text=target_text,
+                    similarity_score=0.99,
+                    confidence=1.0,
+                    metadata=metadata
+                )
+
+    def _rebuild_normalized_index(self) -> None:
+        """Index every literal dictionary entry; O(entries), so only after a (re)load"""
+        signature = self.literal_search.version
+        # Earlier runtime additions are in the dictionaries copied below, or were dropped by the reload
+        self._pending_additions.clear()
+        index = {}
+        # Copy the items first: lookups run in worker threads while translations are added on the event loop
+        for (source_lower, source_lang, target_lang), (target_text, count) in list(self.literal_search.global_dictionary.items()):
+            index[(normalize_text(source_lower), source_lang, target_lang)] = TranslationMatch(
+                source_text=source_lower,
+                target_text=target_text,
+                similarity_score=0.99,
+                confidence=1.0,
+                metadata={"dictionary_type": "global", "occurrence_count": count}
+            )
+
+        # File-specific entries win over global ones for the same normalized text
+        for key, target_text in list(self.literal_search.dictionary.items()):
+            _, source_lower, target_lang = key
+            index[(normalize_text(source_lower), "en", target_lang)] = TranslationMatch(
+                source_text=source_lower,
+                target_text=target_text,
+                similarity_score=0.99,
+                confidence=1.0,
+                metadata=self.literal_search.metadata.get(key, {})
+            )
+
+        self._normalized_index = index
+        self._normalized_signature = signature
+        logger.debug(f"🔁 Rebuilt normalized cascade index: {len(index)} entries")
@@ -1,7 +1,7 @@
 import csv
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from .models import TranslationMatch, SearchResult
 import json
 logger = logging.getLogger(__name__)
@@ -22,6 +22,9 @@ class LiteralDictionarySearch:
         
         # New global dictionary with occurrence counting
         self.global_dictionary = {}  # {(source_text.lower(), source_lang, target_lang): [target_text, occurrence_count]}
+        self.version = 0  # Bumped when the dictionaries are (re)built so derived indexes know to rebuild
+        # Called with (key, target_text, metadata) for each runtime addition, so derived indexes update in place
+        self._listeners: List[Callable[[tuple, str, Dict], None]] = []
         
     def build_from_single_file(
         self,
@@ -50,6 +53,7 @@ class LiteralDictionarySearch:
         
         # Read both files and build dictionary
         self._extract_translations(source_file, translated_file, target_language)
+        self.version += 1
         
         logger.info(f"📖 Built literal dictionary: {len(self.dictionary)} entries for {target_language}")
         # Save dictionary to JSON for debugging
@@ -124,6 +128,8 @@ class LiteralDictionarySearch:
             # Extract translations and add to global dictionary
             pairs_count = self._extract_to_global_dictionary(source_file, target_file, source_language, target_language)
             total_pairs_processed += pairs_count
+        
+        self.version += 1
             
         logger.info(f"📖 Built global dictionary: {len(self.global_dictionary)} unique entries for {source_language}->{target_language}")
         logger.info(f"📊 Processed {total_pairs_processed} translation pairs from {len(target_files)} files")
@@ -263,6 +269,7 @@ class LiteralDictionarySearch:
                         
                         # Store metadata
                         self.metadata[key] = {
+                            'source': 'reference',
                             'filename': source_file.name,
                             'row_id': row_id,
                             'row': row_idx + 2,  # +2 for header and 1-indexed
@@ -577,6 +584,10 @@ class LiteralDictionarySearch:
             "global_language_pairs": list(set((src_lang, target_lang) for _, src_lang, target_lang in self.global_dictionary.keys()))
         }
     
+    def add_listener(self, listener: Callable[[tuple, str, Dict], None]) -> None:
+        """Register a callback for runtime additions (add_translation), which do not bump version"""
+        self._listeners.append(listener)
+    
     def add_translation(
         self,
         source_text: str,
@@ -606,8 +617,9 @@ class LiteralDictionarySearch:
         # Add to dictionary
         self.dictionary[key] = target_text
         
-        # Add metadata if provided
-        if metadata:
-            self.metadata[key] = metadata
+        # Replace metadata too, so a runtime entry never inherits a reference entry's provenance
+        self.metadata[key] = metadata or {}
+        for listener in self._listeners:
+            listener(key, target_text, self.metadata[key])
         
         logger.debug(f"➕ Added to dictionary: '{source_text}' -> '{target_text}' (file: {filename})")
\ No newline at end of file
@@ -28,3 +28,4 @@ class SearchResult(BaseModel):
     total_matches: int = 0
     exact_matches: int = 0
     semantic_matches: int = 0
+    tier: Optional[str] = Field(None, description="Cascade tier that produced an accepted match")
@@ -4,10 +4,12 @@ from typing import List, Optional
 from sentence_transformers import SentenceTransformer
 import faiss
 import os
+import threading
 from pathlib import Path
 from .models import TranslationMatch, SearchResult, TranslationMemoryEntry
 from .tm_manager import TranslationMemoryManager
 from ..core.config import settings
+from ..core.tracing import span
 
 
 class RAGSearch:
@@ -17,6 +19,9 @@ class RAGSearch:
         self.index = None
         self.texts = []
         self.embeddings = []
+        # Lookups run in worker threads while TM writes run in a background thread;
+        # FAISS indexes are not safe to search and add to at the same time
+        self._lock = threading.RLock()
         self._load_or_create_index()
     
     def _load_or_create_index(self):
@@ -88,35 +93,32 @@ class RAGSearch:
         top_k = top_k or settings.top_k_matches
         
         # Encode query
-        query_embedding = self.model.encode([query])
-        query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
+        with span("rag_encode"):
+            query_embedding = self.model.encode([query])
+            query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
         
         # Search FAISS index
-        scores, indices = self.index.search(
-            query_embedding.astype('float32'),
-            min(top_k, self.index.ntotal)
-        )
+        with span("rag_faiss_search"), self._lock:
+            scores, indices = self.index.search(
+                query_embedding.astype('float32'),
+                min(top_k, self.index.ntotal)
+            )
+            hits = [(float(score), self.texts[idx]) for score, idx in zip(scores[0], indices[0]) if idx != -1]
         
         matches = []
         exact_matches = 0
         semantic_matches = 0
         
-        for score, idx in zip(scores[0], indices[0]):
-            if idx == -1:  # FAISS returns -1 for invalid indices
-                continue
-            
-            similarity_score = float(score)
-            
+        for similarity_score, source_text in hits:
             # Skip if below threshold
             if similarity_score < settings.similarity_threshold:
                 continue
             
-            source_text = self.texts[idx]
-            
             # Get exact matches from TM
-            exact_tm_matches = self.tm_manager.search_exact(
-                source_text, target_language, source_language
-            )
+            with span("rag_tm_lookup"):
+                exact_tm_matches = self.tm_manager.search_exact(
+                    source_text, target_language, source_language
+                )
             
             if exact_tm_matches:
                 for tm_match in exact_tm_matches:
@@ -143,21 +145,26 @@ class RAGSearch:
     def add_and_update_index(self, entry: TranslationMemoryEntry):
         """Add new entry to TM and update FAISS index"""
         # Add to translation memory
-        entry_id = self.tm_manager.add_entry(entry)
+        with span("rag_tm_insert"):
+            entry_id = self.tm_manager.add_entry(entry)
         
         # Update FAISS index
         if self.index is None:
-            self._create_index()
+            with span("rag_index_build"), self._lock:
+                self._create_index()
         else:
             # Add new embedding
-            new_embedding = self.model.encode([entry.source_text])
-            new_embedding = new_embedding / np.linalg.norm(new_embedding, axis=1, keepdims=True)
+            with span("rag_encode"):
+                new_embedding = self.model.encode([entry.source_text])
+                new_embedding = new_embedding / np.linalg.norm(new_embedding, axis=1, keepdims=True)
             
-            self.texts.append(entry.source_text)
-            self.index.add(new_embedding.astype('float32'))
-            
-            # Save updated index
-            self._save_index()
+            with self._lock:
+                self.texts.append(entry.source_text)
+                self.index.add(new_embedding.astype('float32'))
+                
+                # Save updated index
+                with span("rag_index_save"):
+                    self._save_index()
     
     def get_stats(self) -> dict:
         """Get RAG search statistics"""
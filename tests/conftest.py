@@ -0,0 +1,30 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.config import settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(monkeypatch, tmp_path):
+    """Keep tests from writing the usage ledger or sharing rate-limit state on disk"""
+    monkeypatch.setattr(settings, "usage_ledger_enabled", False)
+    monkeypatch.setattr(settings, "usage_ledger_path", str(tmp_path / "llm_usage.db"))
+    monkeypatch.setattr(settings, "llm_rate_limit_db", None)
+    monkeypatch.setattr(settings, "llm_retry_base_delay", 0.01)
+    yield settings
+
+
+@pytest.fixture
+def open_breaker():
+    """Open a deployment's breaker with its reset timeout already elapsed, so the next call is a probe"""
+    def open_(dispatcher, deployment: str):
+        breaker = dispatcher.get_breaker(deployment)
+        breaker.state = "open"
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+        return breaker
+    return open_
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from src.llm.client import AnthropicClient, OpenAIClient
+from src.llm.registry import get_registry
+
+DELAY = 0.3
+CONCURRENT = 8
+
+
+def openai_response(request: httpx.Request) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": json.loads(request.content)["model"],
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "Vitesse du vent"},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13}
+    }
+
+
+def anthropic_response(request: httpx.Request) -> dict:
+    return {
+        "id": "msg_test",
+        "type": "message",
+        "role": "assistant",
+        "model": json.loads(request.content)["model"],
+        "content": [{"type": "text", "text": "Vitesse du vent"}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 3}
+    }
+
+
+@pytest.fixture
+def slow_api(monkeypatch):
+    """Route the shared async pool to a mock API that answers every request after DELAY seconds"""
+    in_flight = {"now": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            await asyncio.sleep(DELAY)
+        finally:
+            in_flight["now"] -= 1
+        body = anthropic_response(request) if request.url.path.endswith("/messages") else openai_response(request)
+        return httpx.Response(200, json=body)
+
+    monkeypatch.setattr(get_registry(), "_async_http_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return in_flight
+
+
+@pytest.mark.parametrize("client_class, model", [
+    (OpenAIClient, "gpt-concurrency-test"),
+    (AnthropicClient, "claude-concurrency-test"),
+])
+def test_concurrent_translations_overlap(slow_api, client_class, model):
+    client = client_class(api_key="test")
+    client.model = model  # own breaker and concurrency limiter
+
+    async def scenario():
+        # One-off setup (e.g. loading the token encoding) is not what this measures
+        await client.translate("Warm-up", "fr")
+        slow_api["peak"] = 0
+
+        started = time.monotonic()
+        translations = await asyncio.gather(*[
+            client.translate(f"Wind speed {i}", "fr") for i in range(CONCURRENT)
+        ])
+        return translations, time.monotonic() - started
+
+    translations, elapsed = asyncio.run(scenario())
+
+    assert translations == ["Vitesse du vent"] * CONCURRENT
+    assert slow_api["peak"] == CONCURRENT
+    # Serialized calls would take CONCURRENT * DELAY
+    assert elapsed < 2 * DELAY, elapsed
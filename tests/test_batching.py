@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from src.core.tracing import current_trace, start_trace
+from src.llm.batching import TranslationMicroBatcher
+from src.llm.resilience import get_dispatcher
+from src.llm.usage_ledger import UsageLedger, usage_scope
+
+
+class Usage:
+    prompt_tokens = 100
+    completion_tokens = 40
+
+
+class Response:
+    usage = Usage()
+
+
+class PackedClient:
+    """Translates packed batches through the dispatcher, optionally never answering"""
+
+    def __init__(self, deployment: str, hang: bool = False):
+        self.deployment = deployment
+        self.hang = hang
+        self.traces = []
+
+    async def translate_batch(self, items, target_language, source_language="en", domain=None):
+        self.traces.append(current_trace())
+
+        async def call():
+            if self.hang:
+                await asyncio.sleep(60)
+            return Response()
+
+        await get_dispatcher().call(self.deployment, call, "translate_batch")
+        return {item_id: text.upper() for item_id, text, *_ in items}
+
+
+@pytest.fixture
+def ledger(isolated_settings, monkeypatch, tmp_path):
+    ledger = UsageLedger(str(tmp_path / "usage.db"))
+    monkeypatch.setattr(isolated_settings, "usage_ledger_enabled", True)
+    monkeypatch.setattr("src.llm.resilience.get_usage_ledger", lambda: ledger)
+    return ledger
+
+
+def test_packed_call_is_split_across_its_callers(ledger):
+    client = PackedClient("test:packed-split")
+    batcher = TranslationMicroBatcher(client, max_items=2, max_wait_ms=1000)
+
+    async def translate(file, text):
+        with start_trace("translate", force=True), usage_scope(file=file, language="fr"):
+            return await batcher.translate(text, "fr")
+
+    async def scenario():
+        return await asyncio.gather(translate("a.csv", "wind"), translate("b.csv", "rain"))
+
+    assert asyncio.run(scenario()) == ["WIND", "RAIN"]
+    assert batcher._tasks == set()
+    # The batch belongs to no single caller's trace
+    assert client.traces == [None]
+
+    ledger.flush()
+    summary = ledger.summary(group_by=["file"])
+    by_file = {group["file"]: group for group in summary["groups"]}
+    assert by_file["a.csv"]["calls"] == pytest.approx(0.5)
+    assert by_file["b.csv"]["calls"] == pytest.approx(0.5)
+    assert by_file["a.csv"]["input_tokens"] + by_file["b.csv"]["input_tokens"] == 100
+    assert by_file["b.csv"]["output_tokens"] == 20
+    assert summary["totals"]["calls"] == pytest.approx(1.0)
+
+
+def test_cancelled_batch_cancels_its_callers(isolated_settings):
+    batcher = TranslationMicroBatcher(PackedClient("test:packed-cancelled", hang=True), max_items=2, max_wait_ms=1000)
+
+    async def scenario():
+        callers = [asyncio.ensure_future(batcher.translate(text, "fr")) for text in ("wind", "rain")]
+        await asyncio.sleep(0.05)
+        (task,) = batcher._tasks
+        task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=1)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert batcher._tasks == set()
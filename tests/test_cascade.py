@@ -0,0 +1,99 @@
+from src.memory.cascade import CascadeLookup, quantities
+from src.memory.literal_search import LiteralDictionarySearch
+from src.memory.models import SearchResult, TranslationMatch
+
+
+class SemanticSearch:
+    """Returns fixed embedding matches"""
+
+    def __init__(self, *matches: TranslationMatch):
+        self.matches = list(matches)
+
+    def search_similar(self, query, target_language, source_language="en"):
+        return SearchResult(matches=self.matches, total_matches=len(self.matches), semantic_matches=len(self.matches))
+
+
+def cascade(*translations, rag_search=None, tiers=("literal", "normalized", "fuzzy")):
+    literal_search = LiteralDictionarySearch()
+    for source, target in translations:
+        literal_search.add_translation(source, target, "fr")
+    return CascadeLookup(literal_search, rag_search, tier_order=list(tiers), thresholds={"fuzzy": 0.92, "semantic": 0.9})
+
+
+def test_quantities_keep_units():
+    assert quantities("Wind speed at 2 m (10 %)") == ["2 m", "10 %"]
+    assert quantities("Pressure 1,5 hPa") == ["1.5 hpa"]
+    assert quantities("Wind speed") == []
+
+
+def test_fuzzy_tier_reuses_formatting_variants():
+    lookup = cascade(("Wind speed at 2 m above ground", "Vitesse du vent à 2 m du sol"))
+
+    result = lookup.lookup("Wind-speed at 2 m above the ground", "fr")
+
+    assert result.tier == "fuzzy"
+    assert result.matches[0].target_text == "Vitesse du vent à 2 m du sol"
+
+
+def test_fuzzy_tier_refuses_other_numbers_or_units():
+    lookup = cascade(("Wind speed at 2 m above ground", "Vitesse du vent à 2 m du sol"))
+
+    for query in ("Wind speed at 3 m above ground", "Wind speed at 2 km above ground"):
+        result = lookup.lookup(query, "fr")
+        assert result.tier is None
+        assert result.matches == []
+
+
+def test_fuzzy_tier_prefers_the_entry_with_the_same_numbers():
+    lookup = cascade(
+        ("Wind speed at 10 m above ground", "Vitesse du vent à 10 m du sol"),
+        ("Wind speeds at 100 m above ground", "Vitesses du vent à 100 m du sol"),
+    )
+
+    result = lookup.lookup("Wind speed at 100 m above ground", "fr")
+
+    assert result.tier == "fuzzy"
+    assert result.matches[0].target_text == "Vitesses du vent à 100 m du sol"
+
+
+def test_semantic_tier_refuses_other_numbers():
+    near_miss = TranslationMatch(
+        source_text="Temperature at 2 m", target_text="Température à 2 m", similarity_score=0.97, confidence=0.97
+    )
+    lookup = cascade(rag_search=SemanticSearch(near_miss), tiers=("literal", "semantic"))
+
+    result = lookup.lookup("Temperature at 10 m", "fr")
+
+    # Not reused, but still context for the LLM
+    assert result.tier is None
+    assert result.matches == [near_miss]
+
+
+def test_runtime_additions_update_the_index_without_a_rebuild(monkeypatch):
+    lookup = cascade(("Wind speed", "Vitesse du vent"))
+    assert lookup.lookup("Wind-speed", "fr").tier == "normalized"
+
+    rebuilds = []
+    rebuild = lookup._rebuild_normalized_index
+    monkeypatch.setattr(lookup, "_rebuild_normalized_index", lambda: rebuilds.append(1) or rebuild())
+
+    lookup.literal_search.add_translation("Air temperature", "Température de l'air", "fr")
+    result = lookup.lookup("Air-temperature.", "fr")
+
+    assert result.tier == "normalized"
+    assert result.matches[0].target_text == "Température de l'air"
+    assert rebuilds == []
+
+
+def test_reload_rebuilds_the_index():
+    lookup = cascade(("Wind speed", "Vitesse du vent"))
+    assert lookup.lookup("Wind-speed", "fr").tier == "normalized"
+
+    lookup.literal_search.add_translation("Air temperature", "Température de l'air", "fr")
+    lookup.literal_search.dictionary.clear()
+    lookup.literal_search.global_dictionary[("dew point", "en", "fr")] = ["Point de rosée", 2]
+    lookup.literal_search.version += 1
+
+    assert lookup.lookup("Dew-point", "fr").tier == "normalized"
+    assert lookup.lookup("Wind-speed", "fr").tier is None
+    assert lookup.lookup("Air-temperature", "fr").tier is None
@@ -0,0 +1,29 @@
+from src.llm.concurrency import AdaptiveConcurrencyLimiter
+
+
+def warmed_limiter(name: str) -> AdaptiveConcurrencyLimiter:
+    limiter = AdaptiveConcurrencyLimiter(name, initial=8)
+    for _ in range(5):
+        limiter.on_success(0.5, "translate")
+    return limiter
+
+
+def test_slower_operation_does_not_read_as_a_spike():
+    limiter = warmed_limiter("gpt-mixed-operations")
+    limit = limiter.limit
+
+    limiter.on_success(6.0, "extract_terms")
+    limiter.on_success(6.0, "extract_terms")
+
+    assert limiter.stats["congestion_events"] == 0
+    assert limiter.limit > limit
+
+
+def test_spike_within_an_operation_cuts_the_limit():
+    limiter = warmed_limiter("gpt-translate-spike")
+    limiter.on_success(6.0, "extract_terms")
+
+    limiter.on_success(6.0, "translate")
+
+    assert limiter.stats["congestion_events"] == 1
+    assert limiter.current_limit == 4
@@ -0,0 +1,40 @@
+import asyncio
+
+from src.llm.deployment_pool import AzureDeploymentConfig, AzureDeploymentPool
+from src.llm.resilience import get_dispatcher
+
+
+def make_pool(*hosts: str) -> AzureDeploymentPool:
+    return AzureDeploymentPool([
+        AzureDeploymentConfig(deployment="gpt-test", endpoint=f"https://{host}.example.com", api_key="test")
+        for host in hosts
+    ])
+
+
+def test_cancelled_hedge_loser_leaves_its_breaker_usable(isolated_settings, monkeypatch, open_breaker):
+    monkeypatch.setattr(isolated_settings, "azure_hedge_enabled", True)
+    monkeypatch.setattr(isolated_settings, "azure_hedge_budget", 1.0)
+    monkeypatch.setattr(isolated_settings, "azure_hedge_min_samples", 1)
+
+    async def scenario():
+        pool = make_pool("hedge-slow", "hedge-fast")
+        pool._latencies.extend([0.01] * 10)
+        slow, fast = pool.deployments
+        # The slow deployment is half-open, so the call routed to it is its probe
+        breaker = open_breaker(get_dispatcher(), slow.key)
+
+        async def fn(deployment):
+            if deployment is slow:
+                await asyncio.sleep(10)
+            return deployment.key
+
+        assert await pool.call(fn, "translate") == fast.key
+        assert pool.stats["hedge_wins"] == 1
+
+        async def succeed():
+            return "ok"
+
+        assert await get_dispatcher().call(slow.key, succeed) == "ok"
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from src.core.enrichment import DEFAULT_POLICY_PATH, EnrichmentPolicy
+from src.memory.models import SearchResult, TranslationMatch
+
+
+def exact_hit(metadata: dict) -> SearchResult:
+    match = TranslationMatch(
+        source_text="Wind speed", target_text="Vitesse du vent", similarity_score=1.0, confidence=1.0, metadata=metadata
+    )
+    return SearchResult(matches=[match], total_matches=1, exact_matches=1, tier="exact")
+
+
+@pytest.mark.parametrize("metadata, rule", [
+    ({"source": "reference"}, "trusted_exact"),
+    ({"dictionary_type": "global"}, "high_confidence"),
+    ({"dictionary_type": "global", "source": "llm"}, "high_confidence"),
+    ({}, "high_confidence"),
+])
+def test_only_reference_matches_are_trusted_by_default(metadata, rule):
+    decision = EnrichmentPolicy(str(DEFAULT_POLICY_PATH)).decide("literal", exact_hit(metadata))
+
+    assert decision.rule == rule
+
+
+def test_global_dictionary_trust_is_opt_in(tmp_path):
+    config = json.loads(DEFAULT_POLICY_PATH.read_text(encoding="utf-8"))
+    config["trust_global_dictionary"] = True
+    path = tmp_path / "enrichment_policy.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+
+    decision = EnrichmentPolicy(str(path)).decide("literal", exact_hit({"dictionary_type": "global"}))
+
+    assert decision.rule == "trusted_exact"
+    assert decision.skipped == ["glossary", "term_discovery", "glossary_apply", "grammar_correction"]
@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.glossary import manager as manager_module
+from src.glossary.manager import GlossaryManager
+from src.glossary.models import GlossaryEntry
+
+
+@pytest.fixture
+def glossary(isolated_settings, monkeypatch, tmp_path):
+    monkeypatch.setattr(isolated_settings, "glossary_generation_check_ms", 60000.0)
+    return GlossaryManager(str(tmp_path / "glossary.db"))
+
+
+def recognized(glossary, text):
+    return glossary.recognize_terms(text, target_language="fr").terms_found
+
+
+def test_recognition_does_not_open_the_database_per_segment(glossary, monkeypatch):
+    assert recognized(glossary, "Deploy the database") == ["database"]
+    connects = []
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(manager_module.sqlite3, "connect", lambda *args, **kwargs: connects.append(args) or real_connect(*args, **kwargs))
+
+    for _ in range(100):
+        assert recognized(glossary, "Deploy the database") == ["database"]
+
+    assert connects == []
+
+
+def test_own_writes_are_recognized_immediately(glossary):
+    assert recognized(glossary, "Mean wind speed") == []
+
+    glossary.add_entry(GlossaryEntry(term="wind speed", preferred_translation="vitesse du vent"))
+
+    assert recognized(glossary, "Mean wind speed") == ["wind speed"]
+
+
+def test_writes_from_other_processes_are_seen_after_the_check_interval(glossary, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "glossary_generation_check_ms", 50.0)
+    assert recognized(glossary, "Mean wind speed") == []
+
+    other = sqlite3.connect(glossary.db_path)
+    other.execute(
+        "INSERT INTO glossary (term, preferred_translation, target_language) VALUES (?, ?, ?)",
+        ("wind speed", "vitesse du vent", "fr")
+    )
+    other.commit()
+    other.close()
+
+    assert recognized(glossary, "Mean wind speed") == []
+    time.sleep(0.06)
+    assert recognized(glossary, "Mean wind speed") == ["wind speed"]
@@ -0,0 +1,69 @@
+import pytest
+
+from src.core.grammar_repair import DEFAULT_RULES_PATH, GrammarRepairer, parse_gender
+
+THRESHOLD = 0.8
+
+
+@pytest.fixture(scope="module")
+def repairer():
+    return GrammarRepairer(str(DEFAULT_RULES_PATH))
+
+
+def replacement(to, rendering, notes=None):
+    return {"to": to, "rendering": rendering, "notes": notes}
+
+
+# (language, text after substitution, replacement, expected text, trusted without the LLM pass)
+CASES = [
+    # fr: gender from the glossary notes
+    ("fr", "Mesure de la niveau élevée", replacement("niveau", "hauteur", "nm"), "Mesure du niveau élevé", True),
+    ("fr", "Le humidité est doux", replacement("humidité", "taux", "gender: f"), "L'humidité est doux", True),
+    ("fr", "Valeur du altitude", replacement("altitude", "niveau", "féminin"), "Valeur de l'altitude", True),
+    ("fr", "La indicateur", replacement("indicateur", "mesure", "nm"), "L'indicateur", True),
+    ("fr", "Ce état", replacement("état", "statut", "masculin"), "Cet état", True),
+    ("fr", "valeur du brise moyen", replacement("brise", "vent", "gender: f"), "valeur de la brise moyenne", True),
+    # fr: the article changed but the next word could not be made to agree
+    ("fr", "valeur du brise pendant", replacement("brise", "vent", "gender: f"), "valeur de la brise pendant", False),
+    # fr: gender only guessed from the ending, or unknown
+    ("fr", "valeur du brise", replacement("brise", "vent"), "valeur de la brise", False),
+    ("fr", "Le machin", replacement("machin", "truc"), "Le machin", False),
+    # es
+    ("es", "Agua u hielo", replacement("hielo", "nieve", "nm"), "Agua o hielo", True),
+    ("es", "datos y información", replacement("información", "datos", "nf"), "datos e información", True),
+    ("es", "la mapa climática", replacement("mapa", "carta"), "la mapa climática", False),
+    ("es", "el mapa climático", replacement("mapa", "plano", "nm"), "el mapa climático", True),
+    # ru: agreement is beyond the rules once the gender changes
+    ("ru", "Высокая ветер", replacement("ветер", "скорость"), "Высокая ветер", False),
+    ("ru", "Данные о озере", replacement("озере", "море", "gender: n"), "Данные об озере", True),
+    # ar: definiteness carried over from the replaced rendering
+    ("ar", "قياس حرارة", replacement("حرارة", "الضغط"), "قياس الحرارة", True),
+]
+
+
+@pytest.mark.parametrize("language, text, term, expected, trusted", CASES)
+def test_repair(repairer, language, text, term, expected, trusted):
+    result = repairer.repair(text, [term], language)
+
+    assert result.text == expected
+    assert (result.confidence >= THRESHOLD) is trusted, result.confidence
+
+
+def test_language_without_rules_falls_back(repairer):
+    result = repairer.repair("Der Wind", [replacement("Wind", "Luft")], "de")
+
+    assert result.text == "Der Wind"
+    assert result.confidence == 0.0
+
+
+@pytest.mark.parametrize("notes, gender", [
+    ("nf, plural only", "f"),
+    ("n. f.", "f"),
+    ("Gender=M", "m"),
+    ("(nm) WMO usage", "m"),
+    ("neuter", "n"),
+    ("Preferred by NOAA", None),
+    (None, None),
+])
+def test_parse_gender(notes, gender):
+    assert parse_gender(notes) == gender
@@ -0,0 +1,203 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm.client import AzureOpenAIClient
+from src.llm.resilience import CircuitOpenError
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def choice(content, finish_reason="stop"):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(finish_reason=finish_reason, message=SimpleNamespace(content=content))]
+    )
+
+
+class ScriptedAzureClient(AzureOpenAIClient):
+    """Azure client whose packed requests are answered by a script, and whose single-item calls are recorded"""
+
+    def __init__(self, answer):
+        self.deployment_name = "gpt-4o"
+        self.answer = answer
+        self.packed = []
+        self.single = []
+
+    async def _dispatch_pooled(self, call, operation="translate", estimated_tokens=0):
+        request = call(SimpleNamespace(name=self.deployment_name, client=self))
+        prompt = request["messages"][1]["content"]
+        ids = [item["id"] for item in json.loads(prompt.rsplit("Items:", 1)[1])] if "Items:" in prompt else []
+        self.packed.append(ids)
+        return self.answer(ids)
+
+    @property
+    def chat(self):
+        return SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: kwargs))
+
+    async def extract_terms(self, text, translation=None, target_language="fr"):
+        self.single.append(text)
+        return json.dumps([{"term": text}])
+
+    async def translate(self, text, target_language, source_language="en", glossary_matches=None,
+                        memory_matches=None, domain=None):
+        self.single.append(text)
+        return f"[{target_language}] {text}"
+
+
+def extraction_items(count):
+    return [(str(i), f"wind speed {i}", None) for i in range(count)]
+
+
+def translation_items(count):
+    return [(str(i), f"wind speed {i}", [], []) for i in range(count)]
+
+
+@pytest.mark.parametrize("error", [StatusError(429), StatusError(503), CircuitOpenError("gpt-4o", 5.0)])
+def test_packed_extraction_raises_errors_that_would_fail_every_item(error):
+    def answer(ids):
+        raise error
+
+    client = ScriptedAzureClient(answer)
+
+    with pytest.raises(type(error)):
+        asyncio.run(client.extract_terms_batch(extraction_items(4), "fr"))
+    assert client.single == []
+
+
+def test_rejected_packed_extraction_falls_back_per_item():
+    def answer(ids):
+        raise StatusError(400)
+
+    client = ScriptedAzureClient(answer)
+
+    results = asyncio.run(client.extract_terms_batch(extraction_items(2), "fr"))
+
+    assert client.single == ["wind speed 0", "wind speed 1"]
+    assert results["1"] == [{"term": "wind speed 1"}]
+
+
+def test_filtered_packed_extraction_is_split():
+    def answer(ids):
+        if "1" in ids:
+            return choice(None, finish_reason="content_filter")
+        return choice(json.dumps({"results": {i: [{"term": "wind"}] for i in ids}}))
+
+    client = ScriptedAzureClient(answer)
+
+    results = asyncio.run(client.extract_terms_batch(extraction_items(4), "fr"))
+
+    assert client.packed == [["0", "1", "2", "3"], ["0", "1"], ["0"], ["1"], ["2", "3"]]
+    assert client.single == ["wind speed 1"]
+    assert set(results) == {"0", "1", "2", "3"}
+
+
+@pytest.mark.parametrize("error", [StatusError(429), CircuitOpenError("gpt-4o", 5.0)])
+def test_packed_translation_raises_errors_that_would_fail_every_item(error):
+    def answer(ids):
+        raise error
+
+    client = ScriptedAzureClient(answer)
+
+    with pytest.raises(type(error)):
+        asyncio.run(client.translate_batch(translation_items(4), "fr"))
+    assert client.single == []
+
+
+def test_filtered_packed_translation_is_split():
+    def answer(ids):
+        if len(ids) > 1:
+            return choice(None, finish_reason="content_filter")
+        return choice(json.dumps({"translations": {ids[0]: f"vitesse du vent {ids[0]}"}}))
+
+    client = ScriptedAzureClient(answer)
+
+    results = asyncio.run(client.translate_batch(translation_items(2), "fr"))
+
+    assert client.packed == [["0", "1"], ["0"], ["1"]]
+    assert results == {"0": "vitesse du vent 0", "1": "vitesse du vent 1"}
+
+
+def test_multi_target_translation_raises_throttling():
+    def answer(ids):
+        raise StatusError(429)
+
+    client = ScriptedAzureClient(answer)
+
+    with pytest.raises(StatusError):
+        asyncio.run(client.translate_multi("wind speed", {"fr": ([], []), "de": ([], [])}))
+    assert client.single == []
+
+
+def test_filtered_multi_target_translation_falls_back_per_language():
+    client = ScriptedAzureClient(lambda ids: choice(None, finish_reason="content_filter"))
+
+    results = asyncio.run(client.translate_multi("wind speed", {"fr": ([], []), "de": ([], [])}))
+
+    assert results == {"fr": "[fr] wind speed", "de": "[de] wind speed"}
+
+
+@pytest.mark.parametrize("broken", [
+    choice('{"translations": {"0": "vitesse', finish_reason="length"),
+    choice('{"translations": {"0": "vitesse du vent 0", "1": '),
+    choice('["vitesse du vent 0"]'),
+    choice('{"translations": ["vitesse du vent 0"]}'),
+])
+def test_unusable_packed_translation_is_split_in_half(broken):
+    def answer(ids):
+        if len(ids) == 4:
+            return broken
+        return choice(json.dumps({"translations": {i: f"vitesse du vent {i}" for i in ids}}))
+
+    client = ScriptedAzureClient(answer)
+
+    results = asyncio.run(client.translate_batch(translation_items(4), "fr"))
+
+    assert client.packed == [["0", "1", "2", "3"], ["0", "1"], ["2", "3"]]
+    assert client.single == []
+    assert results == {str(i): f"vitesse du vent {i}" for i in range(4)}
+
+
+def test_unusable_single_item_falls_back_to_translate():
+    client = ScriptedAzureClient(lambda ids: choice("not json"))
+
+    results = asyncio.run(client.translate_batch(translation_items(2), "fr"))
+
+    assert client.packed == [["0", "1"], ["0"], ["1"]]
+    assert results == {"0": "[fr] wind speed 0", "1": "[fr] wind speed 1"}
+
+
+def test_only_missing_or_invalid_translations_are_retried():
+    client = ScriptedAzureClient(lambda ids: choice(json.dumps({"translations": {
+        "0": "vitesse du vent 0",
+        "2": "",
+        "3": '{"id": "3", "text": "vitesse"}',
+        "4": "vitesse du vent 4\nvitesse du vent 5",
+    }})))
+
+    results = asyncio.run(client.translate_batch(translation_items(5), "fr"))
+
+    assert client.packed == [["0", "1", "2", "3", "4"]]
+    assert client.single == ["wind speed 1", "wind speed 2", "wind speed 3", "wind speed 4"]
+    assert results["0"] == "vitesse du vent 0"
+    assert results["3"] == "[fr] wind speed 3"
+
+
+def test_only_missing_extractions_are_retried():
+    client = ScriptedAzureClient(lambda ids: choice(json.dumps({"results": {
+        "0": [{"term": "wind speed"}, {"translation": "sans terme"}],
+        "1": [],
+        "2": "wind speed",
+    }})))
+
+    results = asyncio.run(client.extract_terms_batch(extraction_items(4), "fr"))
+
+    assert client.packed == [["0", "1", "2", "3"]]
+    assert client.single == ["wind speed 2", "wind speed 3"]
+    assert results["0"] == [{"term": "wind speed"}]
+    assert results["1"] == []
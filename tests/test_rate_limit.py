@@ -0,0 +1,50 @@
+import asyncio
+import sqlite3
+import time
+
+from src.llm.rate_limit import DeploymentRateLimiter, SQLiteBucketStore
+
+
+def test_sqlite_store_waits_for_its_lock_off_the_event_loop(tmp_path):
+    db_path = str(tmp_path / "buckets.db")
+    limiter = DeploymentRateLimiter("gpt-locked", 600, 100000, SQLiteBucketStore(db_path))
+
+    # Another process holding the write lock
+    other = sqlite3.connect(db_path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def scenario():
+        acquire = asyncio.ensure_future(limiter.acquire(500))
+        started = time.monotonic()
+        await asyncio.sleep(0.2)
+        slept = time.monotonic() - started
+        assert not acquire.done()
+
+        other.execute("COMMIT")
+        await asyncio.wait_for(acquire, timeout=5)
+        return slept
+
+    try:
+        slept = asyncio.run(scenario())
+    finally:
+        other.close()
+
+    # The loop kept running while acquire waited for the lock
+    assert slept < 1.0, slept
+    assert limiter.stats["requests"] == 1
+
+
+def test_reconcile_refunds_unused_tokens(tmp_path):
+    store = SQLiteBucketStore(str(tmp_path / "buckets.db"))
+    limiter = DeploymentRateLimiter("gpt-refund", 0, 1000, store)
+
+    async def scenario():
+        await limiter.acquire(800)
+        await limiter.reconcile(800, 100)
+        # 700 tokens refunded: a second 800-token call fits without waiting
+        await asyncio.wait_for(limiter.acquire(800), timeout=1)
+
+    asyncio.run(scenario())
+
+    assert limiter.stats["waits"] == 0
+    assert limiter.stats["actual_tokens"] == 100
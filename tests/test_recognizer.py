@@ -0,0 +1,70 @@
+import pytest
+
+from src.glossary.models import GlossaryEntry
+from src.glossary.recognizer import GlossaryTermRecognizer, normalize_with_offsets
+
+
+def entry(term, preferred, translation=None):
+    return GlossaryEntry(term=term, preferred_translation=preferred, target_language="fr", translation=translation)
+
+
+@pytest.fixture(scope="module")
+def recognizer():
+    return GlossaryTermRecognizer([
+        entry("data", "données"),
+        entry("data present bit-map", "table binaire de présence"),
+        entry("bit map", "table binaire"),
+        entry("present", "présent"),
+        entry("wind speed", "vitesse du vent", "vitesse de vent"),
+        entry("speed", "vitesse"),
+        entry("he", "il"),
+        entry("she", "elle"),
+        entry("hers", "le sien"),
+    ])
+
+
+# (text, recognized (term, original text) pairs)
+CASES = [
+    # longest match wins over the shorter terms it contains
+    ("The DATA present bit-map is here", [("data present bit-map", "DATA present bit-map")]),
+    ("data present bit", [("data", "data"), ("present", "present")]),
+    # whitespace, hyphens, underscores and slashes are interchangeable, and runs collapse
+    ("The DATA  present bit map", [("data present bit-map", "DATA  present bit map")]),
+    ("Data_present / bit-map.", [("data present bit-map", "Data_present / bit-map")]),
+    ("Wind-speed and speed", [("wind speed", "Wind-speed"), ("speed", "speed")]),
+    ("wind\nspeed", [("wind speed", "wind\nspeed")]),
+    # whole words only
+    ("ushers", []),
+    ("datapresent", []),
+    ("windspeed", []),
+    ("she hers", [("she", "she"), ("hers", "hers")]),
+    ("he, she.", [("he", "he"), ("she", "she")]),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_find(recognizer, text, expected):
+    assert [(found.term, text[start:end]) for found, start, end in recognizer.find(text)] == expected
+
+
+def test_match_reports_the_rendering_used_in_the_translation(recognizer):
+    result = recognizer.match("Mean wind speed", "Moyenne de la vitesse de vent")
+
+    assert result.terms_found == ["wind speed"]
+    assert result.matches[0].prefered_translation == "vitesse du vent"
+    assert result.matches[0].original_translation == "vitesse de vent"
+
+
+def test_duplicate_terms_after_normalization_are_kept_once():
+    recognizer = GlossaryTermRecognizer([entry("bit map", "table binaire"), entry("Bit-Map", "bitmap")])
+
+    assert len(recognizer) == 1
+    assert recognizer.find("bit_map")[0][0].preferred_translation == "table binaire"
+
+
+def test_normalized_offsets_point_into_the_original_text():
+    normalized, offsets = normalize_with_offsets("  Wind -- Speed ")
+
+    assert normalized == "wind speed"
+    assert offsets[0] == 2
+    assert offsets[5] == 10
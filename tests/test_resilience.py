@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.llm.resilience import CircuitOpenError, LLMDispatcher
+
+
+async def succeed():
+    return "ok"
+
+
+def test_half_open_admits_a_single_probe(open_breaker):
+    async def scenario():
+        dispatcher = LLMDispatcher()
+        breaker = open_breaker(dispatcher, "test:single-probe")
+        probe = asyncio.create_task(dispatcher.call("test:single-probe", lambda: asyncio.sleep(0.05, "probe")))
+        await asyncio.sleep(0.01)
+        with pytest.raises(CircuitOpenError):
+            await dispatcher.call("test:single-probe", succeed)
+        assert await probe == "probe"
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_probe_releases_the_breaker(open_breaker):
+    async def scenario():
+        dispatcher = LLMDispatcher()
+        breaker = open_breaker(dispatcher, "test:cancelled-probe")
+        probe = asyncio.create_task(dispatcher.call("test:cancelled-probe", lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half_open"
+
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        # The next call becomes the probe instead of being shed forever
+        assert await dispatcher.call("test:cancelled-probe", succeed) == "ok"
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_retryable_failures_open_the_breaker():
+    class ServerError(Exception):
+        status_code = 503
+
+    async def fail():
+        raise ServerError()
+
+    async def scenario():
+        dispatcher = LLMDispatcher()
+        breaker = dispatcher.get_breaker("test:failures")
+        breaker.failure_threshold = 2
+        with pytest.raises(ServerError):
+            await dispatcher.call("test:failures", fail, max_attempts=2)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await dispatcher.call("test:failures", succeed)
+
+    asyncio.run(scenario())
@@ -0,0 +1,159 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from src.api.models import TranslationRequest  # noqa: E402
+from src.core import translator  # noqa: E402
+from src.glossary.models import GlossaryExtractionResult  # noqa: E402
+from src.memory.models import SearchResult, TranslationMatch  # noqa: E402
+
+
+class EmptyRAGSearch:
+    """Semantic memory with no entries"""
+    tm_manager = None
+
+    def __init__(self, *args, **kwargs):
+        self.stored = []
+
+    def search_similar(self, query, target_language, source_language="en", *args, **kwargs):
+        return SearchResult()
+
+    def add_and_update_index(self, entry):
+        self.stored.append(entry)
+
+    def get_stats(self):
+        return {"index_size": 0}
+
+
+@pytest.fixture
+def orchestrator(isolated_settings, monkeypatch, tmp_path):
+    """An orchestrator on the fake LLM provider, with an empty semantic memory and a throwaway glossary"""
+    monkeypatch.setattr(isolated_settings, "llm_provider", "fake")
+    monkeypatch.setattr(isolated_settings, "fake_llm_latency_ms", 1.0)
+    monkeypatch.setattr(isolated_settings, "database_url", f"sqlite:///{tmp_path / 'translation.db'}")
+    monkeypatch.setattr(isolated_settings, "background_tm_writes", False)
+    monkeypatch.setattr(isolated_settings, "packed_translation", False)
+    monkeypatch.setattr(isolated_settings, "speculative_llm_enabled", False)
+    monkeypatch.setattr(translator, "RAGSearch", EmptyRAGSearch)
+    return translator.TranslationOrchestrator(llm_backend="azure", memory_mode="cascade")
+
+
+def test_cascade_candidate_below_its_tier_threshold_goes_to_the_llm(orchestrator):
+    orchestrator.cascade.thresholds["fuzzy"] = 0.97
+    orchestrator.literal_search.add_translation("Wind speed at 2 m above ground", "Vitesse du vent à 2 m du sol", "fr")
+    request = TranslationRequest(
+        text="Wind speed at 2 m above the ground", target_language="fr", use_glossary=False, memory_search_mode="cascade"
+    )
+
+    response = asyncio.run(orchestrator.translate(request))
+
+    # A 0.9+ fuzzy candidate the tier rejected is context, not the translation
+    assert 0.9 < response.memory_matches[0]["similarity_score"] < 0.97
+    assert response.translation != "Vitesse du vent à 2 m du sol"
+    assert response.model_used == "fake"
+    tiers = orchestrator.cascade.get_stats()["tiers"]
+    assert tiers["fuzzy"]["hits"] == 0
+    assert tiers["llm"]["attempts"] == 1
+
+
+def test_stream_abandoned_mid_translation_closes_its_trace(orchestrator, monkeypatch):
+    from src.core import tracing
+
+    monkeypatch.setattr(orchestrator.llm_client.fake, "ms_per_token", 50.0)
+    observed = []
+    monkeypatch.setattr(tracing, "observe_stage", lambda name, seconds: observed.append(name))
+    request = TranslationRequest(text="Wind speed at ten metres above ground", target_language="fr", use_glossary=False)
+
+    async def scenario():
+        stream = orchestrator.translate_stream(request)
+        event, _ = await stream.__anext__()
+        assert event == "context"
+        # A disconnected client's generator is closed later, in another context (the asyncgen finalizer)
+        await asyncio.create_task(stream.aclose())
+        return {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+
+    leftover = asyncio.run(scenario())
+
+    assert leftover == set()
+    assert "translate_stream" in observed
+
+
+def test_stream_emits_context_tokens_and_done(orchestrator):
+    request = TranslationRequest(text="Wind speed", target_language="fr", use_glossary=False)
+
+    async def scenario():
+        return [event async for event in orchestrator.translate_stream(request)]
+
+    events = asyncio.run(scenario())
+
+    assert events[0][0] == "context"
+    assert events[-1][0] == "done"
+    tokens = "".join(data["text"] for event, data in events if event == "token")
+    assert events[-1][1]["translation"] == tokens.strip()
+
+
+def slow_context(orchestrator, monkeypatch, memory_result, delay=0.3):
+    """Make the memory lookup and glossary extraction each take `delay` seconds, recording extraction calls"""
+    extractions = []
+
+    def search_memory(request, search_mode):
+        time.sleep(delay)
+        return memory_result
+
+    async def extract_terms(text, translation="", target_language="fr", discover=None):
+        extractions.append(translation)
+        await asyncio.sleep(delay)
+        return GlossaryExtractionResult(terms_found=[f"extraction {len(extractions)}"])
+
+    monkeypatch.setattr(orchestrator, "_search_memory", search_memory)
+    monkeypatch.setattr(orchestrator.glossary_manager, "extract_terms", extract_terms)
+    return extractions
+
+
+def test_gather_context_overlaps_memory_lookup_and_term_recognition(orchestrator, monkeypatch):
+    extractions = slow_context(orchestrator, monkeypatch, SearchResult())
+    request = TranslationRequest(text="Wind speed", target_language="fr")
+
+    started = time.monotonic()
+    memory_result, glossary_result = asyncio.run(orchestrator._gather_context(request))
+    elapsed = time.monotonic() - started
+
+    # Serialized steps would take 0.6s
+    assert elapsed < 0.5, elapsed
+    # A miss reuses the terms recognized while the lookup ran
+    assert extractions == [""]
+    assert glossary_result.terms_found == ["extraction 1"]
+    assert memory_result.matches == []
+
+
+def test_gather_context_redoes_extraction_with_a_reused_memory_translation(orchestrator, monkeypatch):
+    hit = TranslationMatch(source_text="Wind speed", target_text="Vitesse du vent", similarity_score=0.95, confidence=0.95)
+    extractions = slow_context(orchestrator, monkeypatch, SearchResult(matches=[hit], total_matches=1))
+    request = TranslationRequest(text="Wind speed", target_language="fr")
+
+    memory_result, glossary_result = asyncio.run(orchestrator._gather_context(request))
+
+    assert extractions == ["", "Vitesse du vent"]
+    assert glossary_result.terms_found == ["extraction 2"]
+    assert memory_result.matches == [hit]
+
+
+def test_gather_context_failure_leaves_no_task_behind(orchestrator, monkeypatch):
+    slow_context(orchestrator, monkeypatch, SearchResult(), delay=0.1)
+
+    async def failing_extraction(*args, **kwargs):
+        raise RuntimeError("glossary unavailable")
+
+    monkeypatch.setattr(orchestrator.glossary_manager, "extract_terms", failing_extraction)
+    request = TranslationRequest(text="Wind speed", target_language="fr")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await orchestrator._gather_context(request)
+        await asyncio.sleep(0)
+        return {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+
+    assert asyncio.run(scenario()) == set()
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.llm.resilience import LLMDispatcher
+from src.llm.usage_ledger import UsageLedger, get_usage_ledger, usage_scope
+
+
+class Usage:
+    prompt_tokens = 100
+    completion_tokens = 20
+
+
+class Response:
+    usage = Usage()
+
+
+@pytest.fixture
+def ledger(isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, "usage_ledger_enabled", True)
+    return get_usage_ledger()
+
+
+def test_multi_language_calls_are_split_per_language(tmp_path):
+    ledger = UsageLedger(str(tmp_path / "usage.db"))
+    with usage_scope(language="fr,es,ru"):
+        ledger.record("gpt-test", "translate", 100, 31)
+
+    summary = ledger.summary(group_by=["language"])
+    by_language = {group["language"]: group for group in summary["groups"]}
+    assert set(by_language) == {"fr", "es", "ru"}
+    assert sum(group["input_tokens"] for group in by_language.values()) == 100
+    assert sum(group["output_tokens"] for group in by_language.values()) == 31
+    assert by_language["es"]["input_tokens"] == 33
+    assert summary["totals"]["calls"] == pytest.approx(1.0)
+    assert summary["totals"]["attempts"] == 1
+
+
+def test_failed_and_cancelled_calls_are_recorded(ledger, isolated_settings, monkeypatch):
+    class Timeout(Exception):
+        pass
+
+    async def time_out():
+        raise Timeout()
+
+    async def scenario():
+        dispatcher = LLMDispatcher()
+        with pytest.raises(Timeout):
+            await dispatcher.call("test:ledger-failed", time_out, "translate", estimated_tokens=50, max_attempts=2)
+
+        cancelled = asyncio.create_task(
+            dispatcher.call("test:ledger-cancelled", lambda: asyncio.sleep(10), "translate", estimated_tokens=70)
+        )
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+    asyncio.run(scenario())
+    summary = ledger.summary(group_by=["deployment", "outcome"])
+    rows = {(group["deployment"], group["outcome"]): group for group in summary["groups"]}
+    assert rows[("test:ledger-failed", "error")]["input_tokens"] == 100
+    assert rows[("test:ledger-failed", "error")]["attempts"] == 2
+    assert rows[("test:ledger-cancelled", "cancelled")]["input_tokens"] == 70
+    assert summary["totals"]["failed_calls"] == 1
+    assert summary["totals"]["cancelled_calls"] == 1
+
+
+def test_retried_attempts_add_spend_but_not_calls(ledger):
+    attempts = []
+
+    class ServerError(Exception):
+        status_code = 503
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ServerError()
+        return Response()
+
+    async def scenario():
+        return await LLMDispatcher().call("test:ledger-retried", flaky, "translate", estimated_tokens=40)
+
+    asyncio.run(scenario())
+    totals = ledger.summary(group_by=["deployment"])["totals"]
+    assert totals["calls"] == pytest.approx(1.0)
+    assert totals["input_tokens"] == 100 + 40
+    assert totals["output_tokens"] == 20